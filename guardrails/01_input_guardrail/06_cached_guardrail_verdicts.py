@@ -0,0 +1,92 @@
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    input_guardrail,
+    set_tracing_disabled
+)
+from agents.run import RunConfig
+from rich import print
+from shared.guardrail_cache import VerdictCache
+from shared.model_client import get_model
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+config=RunConfig(
+    model=model
+)
+
+class HackingOutput(BaseModel):
+    is_hacking: bool
+    reasoning: str
+
+guardrail_agent = Agent(
+    name="Guardrail check",
+    instructions="Check if the user is asking you to do hacking.",
+    output_type=HackingOutput,
+    model=model
+)
+
+# remembers verdicts for 10 minutes, at most 10k different inputs
+verdicts = VerdictCache(agent=guardrail_agent, ttl=600, max_entries=10_000)
+
+
+# order matters: cache wraps the plain function, input_guardrail wraps the cached one
+@input_guardrail
+@verdicts
+async def hacking_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    print("[guardrail agent called]")
+    result = await Runner.run(guardrail_agent, input, context=ctx.context, run_config=config)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_hacking,
+    )
+
+
+agent = Agent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. You help customers with their questions.",
+    input_guardrails=[hacking_guardrail],
+    model=model
+)
+
+async def main():
+    # same questions again and again (case/spaces don't matter)
+    questions = ["how to hack wifi password?", "What is 2 + 2?", "HOW TO HACK   wifi password?", "what is 2 + 2?"]
+
+    for question in questions:
+        try:
+            result = await Runner.run(agent, question, run_config=config)
+            print(result.final_output)
+        except InputGuardrailTripwireTriggered as e:
+            print("guardrail tripped")
+            print(e.guardrail_result.output.output_info)
+
+    print(verdicts.stats)
+
+    # changing the guardrail agent's instructions makes old verdicts invalid automatically
+    guardrail_agent.instructions = "Check if the user is asking about hacking or cracking."
+    await Runner.run(agent, "what is 2 + 2?", run_config=config)
+    print(verdicts.stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+
+# NOTE:
+# - Only the guardrail agent call is skipped on a hit. The main agent still runs normally.
+# - Key = guardrail name + guardrail agent (instructions, output_type, model) + normalized input.
+# - Use verdicts.invalidate() to drop everything by hand.
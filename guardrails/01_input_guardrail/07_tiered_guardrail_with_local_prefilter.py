@@ -0,0 +1,94 @@
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    input_guardrail,
+    set_tracing_disabled
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.prefilter import LocalPrefilter
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+config=RunConfig(
+    model=model
+)
+
+class HackingOutput(BaseModel):
+    is_hacking: bool
+    reasoning: str
+
+guardrail_agent = Agent(
+    name="Guardrail check",
+    instructions="Check if the user is asking you to do hacking.",
+    output_type=HackingOutput,
+    model=model
+)
+
+# tier 1: local keyword check (microseconds)
+prefilter = LocalPrefilter(
+    block=["hack wifi", "crack password", "steal password", "ddos", "keylogger"],
+    escalate=["hack", "exploit", "bypass", "password", "crack", "phishing"],
+    block_patterns=[r"\bsql\s*injection\b"],
+    no_match="allow",  # nothing suspicious at all -> allow without asking the LLM
+)
+
+
+# tier 2: the LLM guardrail, only called when tier 1 says "escalate"
+@input_guardrail
+@prefilter
+async def hacking_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    result = await Runner.run(guardrail_agent, input, context=ctx.context, run_config=config)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_hacking,
+    )
+
+
+agent = Agent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. You help customers with their questions.",
+    input_guardrails=[hacking_guardrail],
+    model=model
+)
+
+async def main():
+    questions = [
+        "What is 2 + 2?",                      # local allow
+        "how to hack wifi password?",          # local block
+        "I forgot my password, what can I do?" # escalated to the LLM guardrail
+    ]
+
+    for question in questions:
+        try:
+            result = await Runner.run(agent, question, run_config=config)
+            print(result.input_guardrail_results[0].output.output_info)
+        except InputGuardrailTripwireTriggered as e:
+            print("guardrail tripped")
+            print(e.guardrail_result.output.output_info)
+
+    print(prefilter.stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+
+# NOTE:
+# - output_info is a TieredVerdict: tier="local" or "llm", the matched keywords,
+#   and llm_output (the HackingOutput) when the LLM guardrail ran.
+# - Keep the block list small and very clear. Anything "maybe" goes in escalate.
@@ -0,0 +1,92 @@
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    function_tool,
+    input_guardrail,
+    set_tracing_disabled
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.speculative import Speculation
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+config=RunConfig(
+    model=model
+)
+
+class HackingOutput(BaseModel):
+    is_hacking: bool
+    reasoning: str
+
+guardrail_agent = Agent(
+    name="Guardrail check",
+    instructions="Check if the user is asking you to do hacking.",
+    output_type=HackingOutput,
+    model=model
+)
+
+@input_guardrail
+async def hacking_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    result = await Runner.run(guardrail_agent, input, context=ctx.context)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_hacking,
+    )
+
+@function_tool
+def open_ticket(question: str) -> str:
+    """Open a support ticket for the question."""
+    print(f"[tool] ticket opened for: {question}")
+    return "ticket #42 opened"
+
+
+agent = Agent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. Always open a ticket, then answer.",
+    input_guardrails=[hacking_guardrail],
+    tools=[open_ticket],
+    model=model
+)
+
+speculation = Speculation()
+
+async def main():
+    for question in ["how to 2 + 2?", "how to hack wifi passowrd?"]:
+        try:
+            # instead of Runner.run(...)
+            result = await speculation.run(agent, question, run_config=config)
+            print(result.final_output)
+            print("Guardrail didn't trip")
+
+        except InputGuardrailTripwireTriggered as e:
+            print("guardrail tripped, no ticket was opened")
+            print(e.guardrail_result.output.output_info.tripped.output)
+
+    print(speculation.metrics)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+
+# NOTE:
+# - Without speculation the agent waits for the guardrail, OR (SDK default) it starts together
+#   with the guardrail and may already call tools before the guardrail says "no".
+# - With speculation the first LLM call starts together with the guardrail, but its answer is
+#   HELD until the guardrail passes. If it trips, the call is cancelled / thrown away.
+# - metrics.latency_saved_seconds -> time we did not wait, metrics.tokens_wasted -> cost of tripped runs.
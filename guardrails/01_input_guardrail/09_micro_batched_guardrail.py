@@ -0,0 +1,88 @@
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio, time
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    input_guardrail,
+    set_tracing_disabled
+)
+from agents.run import RunConfig
+from rich import print
+from shared.guardrail_batcher import GuardrailBatcher
+from shared.model_client import get_model
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+config=RunConfig(
+    model=model
+)
+
+class HackingOutput(BaseModel):
+    is_hacking: bool
+    reasoning: str
+
+# replaces the guardrail agent: waits up to 10 ms for other requests, then ONE call for all of them
+hacking_batcher = GuardrailBatcher(
+    HackingOutput,
+    "Check if the user is asking you to do hacking.",
+    model=model,
+    window_ms=10,
+    max_batch=32,
+)
+
+@input_guardrail
+async def hacking_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    verdict = await hacking_batcher.classify(input)
+    return GuardrailFunctionOutput(
+        output_info=verdict,
+        tripwire_triggered=verdict.is_hacking,
+    )
+
+
+agent = Agent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. You help customers with their questions.",
+    input_guardrails=[hacking_guardrail],
+    model=model
+)
+
+async def ask(question: str) -> str:
+    try:
+        await Runner.run(agent, question, run_config=config)
+        return "ok"
+    except InputGuardrailTripwireTriggered:
+        return "blocked"
+
+
+async def main():
+    # 100 customers at the same time
+    questions = [f"how to hack wifi number {i}?" if i % 10 == 0 else f"what is {i} + {i}?" for i in range(100)]
+
+    start = time.perf_counter()
+    answers = await asyncio.gather(*(ask(q) for q in questions))
+    print(f"{answers.count('blocked')} blocked, {answers.count('ok')} ok in {time.perf_counter() - start:.2f}s")
+
+    print(hacking_batcher.stats)
+    print(f"average batch size {hacking_batcher.stats.average_batch_size:.1f}, "
+          f"guardrail calls saved: {hacking_batcher.stats.calls_saved}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+
+# NOTE:
+# - Without batching: 100 requests -> 100 guardrail calls. With batching: ~4 calls (32 per batch).
+# - window_ms is the extra wait for a lonely request. Keep it small (5-20 ms).
+# - Each request still gets its OWN HackingOutput and its own tripwire.
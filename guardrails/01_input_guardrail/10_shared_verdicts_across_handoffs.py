@@ -0,0 +1,114 @@
+from dataclasses import dataclass, field
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    input_guardrail,
+    set_tracing_disabled
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.verdict_ledger import VerdictLedger, share_verdicts
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+config=RunConfig(
+    model=model
+)
+
+class HackingOutput(BaseModel):
+    is_hacking: bool
+    reasoning: str
+
+guardrail_agent = Agent(
+    name="Guardrail check",
+    instructions="Check if the user is asking you to do hacking.",
+    output_type=HackingOutput,
+    model=model
+)
+
+guardrail_calls = 0
+
+@input_guardrail
+@share_verdicts
+async def hacking_guardrail(
+    ctx: RunContextWrapper["SupportContext"], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    global guardrail_calls
+    guardrail_calls += 1
+    result = await Runner.run(guardrail_agent, input, run_config=config)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_hacking,
+    )
+
+
+# the context carries the verdicts from agent to agent
+@dataclass
+class SupportContext:
+    user_id: str
+    guardrail_verdicts: VerdictLedger = field(default_factory=VerdictLedger)
+
+
+# the same policy on every agent of the chain
+triage_agent = Agent(
+    name="Triage agent",
+    instructions="Decide which department should answer.",
+    input_guardrails=[hacking_guardrail],
+    model=model
+)
+billing_agent = Agent(
+    name="Billing agent",
+    instructions="You answer billing questions.",
+    input_guardrails=[hacking_guardrail],
+    model=model
+)
+support_agent = Agent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. You help customers with their questions.",
+    input_guardrails=[hacking_guardrail],
+    model=model
+)
+
+async def handle(question: str):
+    ctx = SupportContext(user_id="user_1")
+    try:
+        # the request moves through three agents, each one checks the SAME input
+        for agent in [triage_agent, billing_agent, support_agent]:
+            result = await Runner.run(agent, question, context=ctx, run_config=config)
+            print(f"{agent.name}: {result.final_output}")
+    except InputGuardrailTripwireTriggered as e:
+        print("guardrail tripped")
+        print(e.guardrail_result.output.output_info)
+
+    for reuse in ctx.guardrail_verdicts.reuses:
+        print(reuse)
+
+
+async def main():
+    await handle("Why is my bill so high?")
+    await handle("how to hack wifi passowrd?")
+    print(f"guardrail LLM calls: {guardrail_calls} (without sharing: 4)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+
+# NOTE:
+# - Input guardrails only run for the FIRST agent of a Runner.run (see 05_input_guardrail_on_handoff_agent.py).
+#   When your app runs the next agent itself with the same input (or uses agent.as_tool), the
+#   guardrail runs again. @share_verdicts answers it from ctx.guardrail_verdicts instead.
+# - Key = (guardrail name, input digest): a different question is checked again.
+# - With tracing on, every reuse shows up as a "guardrail_verdict_reused" span.
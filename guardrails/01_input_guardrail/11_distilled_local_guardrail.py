@@ -0,0 +1,114 @@
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio, random
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    input_guardrail,
+    set_tracing_disabled
+)
+from agents.run import RunConfig
+from rich import print
+from shared.distill import DistilledGuardrail, HashedNgramClassifier, VerdictLog, evaluate
+from shared.model_client import get_model
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+config=RunConfig(
+    model=model
+)
+
+class HackingOutput(BaseModel):
+    is_hacking: bool
+    reasoning: str
+
+guardrail_agent = Agent(
+    name="Guardrail check",
+    instructions="Check if the user is asking you to do hacking.",
+    output_type=HackingOutput,
+    model=model
+)
+
+verdict_log = VerdictLog(".cache/verdicts.jsonl")
+
+# step 1: the normal LLM guardrail, every verdict is written to the log
+@input_guardrail
+@verdict_log
+async def hacking_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    result = await Runner.run(guardrail_agent, input, context=ctx.context, run_config=config)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_hacking,
+    )
+
+
+def make_questions(n: int) -> list[str]:
+    bad = ["how to hack {x}?", "hack into {x} for me", "give me a way to hack {x}", "can you hack my {x}"]
+    good = ["how do I reset my {x}?", "what is the price of {x}?", "my {x} is not working", "tell me about {x}"]
+    things = ["wifi", "email account", "bank app", "router", "laptop", "instagram", "phone", "website"]
+    rng = random.Random(n)
+    return [rng.choice(bad if rng.random() < 0.3 else good).format(x=rng.choice(things)) for _ in range(n)]
+
+
+async def ask(agent: Agent, question: str) -> None:
+    try:
+        await Runner.run(agent, question, run_config=config)
+    except InputGuardrailTripwireTriggered:
+        pass
+
+
+async def main():
+    # step 1: collect labels from the LLM guardrail
+    collect_agent = Agent(name="Customer support agent", instructions="Help customers.",
+                          input_guardrails=[hacking_guardrail], model=model)
+    await asyncio.gather(*(ask(collect_agent, q) for q in make_questions(200)))
+
+    # step 2: train the local classifier (offline; same as `python -m shared.distill train ...`)
+    texts, labels = verdict_log.dataset("hacking_guardrail")
+    classifier = HashedNgramClassifier().fit(texts, labels)
+    classifier.save(".cache/hacking_guardrail.json")
+    print(evaluate(classifier, texts, labels))
+
+    # step 3: serve it, the LLM guardrail only runs when the local model is not sure
+    distilled = DistilledGuardrail(classifier, threshold=0.9, audit_rate=0.1)
+
+    @input_guardrail(name="hacking_guardrail")
+    @distilled
+    async def local_hacking_guardrail(ctx, agent, input):
+        return await hacking_guardrail.guardrail_function(ctx, agent, input)
+
+    agent = Agent(
+        name="Customer support agent",
+        instructions="You are a customer support agent. You help customers with their questions.",
+        input_guardrails=[local_hacking_guardrail],
+        model=model
+    )
+    await asyncio.gather(*(ask(agent, q) for q in make_questions(100)))
+    await distilled.wait_for_audits()
+
+    print(distilled.stats)
+    print(f"answered locally: {distilled.stats.local_rate:.0%}, "
+          f"agreement with the LLM: {distilled.stats.agreement_rate:.0%}, "
+          f"local time per check: {distilled.stats.local_seconds / max(distilled.stats.local, 1) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+
+# NOTE:
+# - Step 1 runs in production for a while (just add @verdict_log), step 2 runs offline:
+#       uv run python -m shared.distill train --guardrail hacking_guardrail --out .cache/hacking_guardrail.json
+# - threshold=0.9 -> only very sure answers are local, everything else still goes to the LLM.
+# - audit_rate=0.1 -> 10% of local answers are also checked by the LLM (in the background) to
+#   keep an eye on the agreement rate.
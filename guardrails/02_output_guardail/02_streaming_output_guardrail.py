@@ -0,0 +1,89 @@
+from typing import Any
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    OutputGuardrailTripwireTriggered,
+    RunContextWrapper,
+    Runner,
+    output_guardrail,
+    set_tracing_disabled
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.streaming_guardrails import IncrementalOutputGuardrails
+from openai.types.responses import ResponseTextDeltaEvent
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+config=RunConfig(
+    model=model
+)
+
+
+class BiologyOutput(BaseModel):
+    is_biology: bool
+    reasoning: str
+
+
+guardrail_agent = Agent(
+    name="Guardrail check",
+    instructions="Check if the output is related to biology.",
+    output_type=BiologyOutput,
+    model=model
+)
+
+@output_guardrail
+async def biology_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, agent_output: Any
+) -> GuardrailFunctionOutput:
+    # agent_output = the text generated SO FAR (not the full answer)
+    result = await Runner.run(guardrail_agent, agent_output, run_config=config)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_biology,
+    )
+
+agent = Agent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. You help customers with all type of their questions.",
+    model=model
+)
+
+# check after every sentence, and at least every ~40 tokens
+checker = IncrementalOutputGuardrails(biology_guardrail, every_tokens=40, sentences=True)
+
+async def main():
+    for question in ["Tell me a long story about the moon.", "Explain biology cell in detail."]:
+        result = Runner.run_streamed(agent, question, run_config=config)
+        try:
+            async for event in checker.stream(result):
+                if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                    print(event.data.delta, end="", flush=True)
+            print("\nGuardrail didn't trip")
+
+        except OutputGuardrailTripwireTriggered as e:
+            print("\n[red]guardrail tripped, generation stopped[/red]")
+            print(e.guardrail_result.output.output_info)
+            print(f"stopped after {checker.stats.rejected_at_chars} characters, "
+                  f"{checker.stats.time_to_reject_seconds:.2f}s")
+
+    print(checker.stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+
+# NOTE:
+# - A normal @output_guardrail waits for the WHOLE answer. Here the same guardrail runs on the
+#   partial answer while it is streaming, and the run is cancelled as soon as it trips.
+# - release="checked" -> text is only shown after it passed a check (safer, a bit slower).
+# - Checks run in the background, one at a time: a long guardrail call never blocks the stream.
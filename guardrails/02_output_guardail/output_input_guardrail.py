@@ -6,8 +6,6 @@ from agents import (
     OutputGuardrailTripwireTriggered,
     RunContextWrapper,
     Runner,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
     input_guardrail,
     output_guardrail,
     InputGuardrailTripwireTriggered,
@@ -16,17 +14,11 @@ from dotenv import load_dotenv
 import os
 from pydantic import BaseModel
 
-load_dotenv()
+from shared.model_client import get_model
 
-API_KEY = os.environ.get("GEMINI_API_KEY")
+load_dotenv()
 
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=AsyncOpenAI(
-        api_key=API_KEY,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai"
-    )
-)
+model = get_model("gemini-2.0-flash")
 
 
 # input guardrail
@@ -0,0 +1,106 @@
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    input_guardrail,
+    set_tracing_disabled,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.guardrail_executor import concurrent_input_guardrail
+from shared.model_client import get_model
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+
+class HackingOutput(BaseModel):
+    is_hacking: bool
+    reasoning: str
+
+guardrail_agent = Agent(
+    name="agent Guardrail check",
+    instructions="Check if the user is asking you to do hacking.",
+    model=model,
+    output_type=HackingOutput
+)
+
+@input_guardrail
+async def hacking_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    result = await Runner.run(guardrail_agent, input)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_hacking,
+    )
+
+
+class BiologyOutput(BaseModel):
+    is_biology: bool
+    reasoning: str
+
+biology_guardrail_agent = Agent(
+    name="Runner Guardrail check",
+    instructions="Check if the output is related to biology.",
+    model=model,
+    output_type=BiologyOutput
+)
+
+@input_guardrail
+async def biology_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    result = await Runner.run(biology_guardrail_agent, input)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_biology,
+    )
+
+
+# the global (RunConfig) check and the agent check become ONE guardrail:
+# both start together, the first tripwire cancels the other one
+all_checks = concurrent_input_guardrail(hacking_guardrail, biology_guardrail)
+
+config=RunConfig(
+    model=model,
+    input_guardrails=[all_checks],
+)
+
+agent = Agent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. You help customers with their questions.",
+    model=model,
+)
+
+async def main():
+    for question in ["what is 2 + 2?", "how to hack wifi passowrd?"]:
+        try:
+            result = await Runner.run(agent, question, run_config=config)
+            report = result.input_guardrail_results[0].output.output_info
+            print("Guardrail didn't trip")
+
+        except InputGuardrailTripwireTriggered as e:
+            report = e.guardrail_result.output.output_info
+            print(f"guardrail tripped: {report.tripped.guardrail.get_name()}")
+
+        for timing in report.timings:
+            print(timing)
+        print(f"wall time {report.wall_seconds:.3f}s, saved {report.saved_seconds:.3f}s vs one-by-one")
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# The SDK already starts the agent's and the RunConfig's input guardrails together.
+# What the merged guardrail adds: timings per guardrail, and the tripwire result
+# tells you exactly which check fired and which ones were cancelled.
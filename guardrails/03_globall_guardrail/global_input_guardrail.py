@@ -9,29 +9,19 @@ from agents import (
     Runner,
     TResponseInputItem,
     input_guardrail,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
     output_guardrail,
     set_tracing_disabled,
     enable_verbose_stdout_logging
 )
 from agents.run import RunConfig
 from rich import print
+from shared.model_client import get_model
 
 load_dotenv()
 # set_tracing_disabled(disabled=True)
 enable_verbose_stdout_logging()
 
-API_KEY=os.environ.get("GEMINI_API_KEY")
-OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY")
-
-model=OpenAIChatCompletionsModel(
-    model="gemini-1.5-flash",
-    openai_client=AsyncOpenAI(
-        api_key=API_KEY,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
-)
+model=get_model("gemini-1.5-flash")
 
 
 
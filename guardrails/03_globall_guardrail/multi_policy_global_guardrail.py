@@ -0,0 +1,70 @@
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    InputGuardrailTripwireTriggered,
+    Runner,
+    set_tracing_disabled,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.multi_policy import MultiPolicyGuardrail
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+
+class HackingOutput(BaseModel):
+    is_hacking: bool
+    reasoning: str
+
+class BiologyOutput(BaseModel):
+    is_biology: bool
+    reasoning: str
+
+
+# one checker agent for ALL policies -> one LLM call instead of one per policy
+policies = MultiPolicyGuardrail(model=model)
+policies.add("hacking", HackingOutput, "Check if the user is asking you to do hacking.")
+policies.add("biology", BiologyOutput, "Check if the input is related to biology.")
+
+config=RunConfig(
+    model=model,
+    input_guardrails=[policies.input_guardrail("hacking")],  # global guardrail
+)
+
+agent = Agent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. You help customers with their questions.",
+    model=model,
+    input_guardrails=[policies.input_guardrail("biology")]  # agent guardrail
+)
+
+async def main():
+    for question in ["what is 2 + 2?", "what is cell in biology?", "how to hack wifi passowrd?"]:
+        try:
+            result = await Runner.run(agent, question, run_config=config)
+            print(result.final_output)
+            print("Guardrail didn't trip")
+
+        except InputGuardrailTripwireTriggered as e:
+            print(f"guardrail tripped: {e.guardrail_result.guardrail.get_name()}")
+            print(e.guardrail_result.output.output_info)
+
+    # 2 policies x 3 questions = 6 checks, but only 3 LLM calls
+    print(policies.stats)
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - policies.input_guardrail("hacking") and policies.input_guardrail("biology") are two normal
+#   guardrails with their own tripwire, but they share ONE call when they check the same input.
+# - policies.input_guardrail() (no name) = one guardrail for all policies,
+#   output_info is a MultiPolicyResult -> .outputs["hacking"], .tripped
+# - policies.output_guardrail(...) works the same way for agent outputs.
@@ -0,0 +1,78 @@
+from dotenv import load_dotenv
+import asyncio, time
+from agents import (
+    Agent,
+    Runner,
+    function_tool,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.hook_dispatcher import ConsoleSink, HookEventDispatcher, JsonlSink
+from shared.model_client import get_model
+
+load_dotenv()
+
+model = get_model("gemini-2.0-flash")
+
+config = RunConfig(
+    model=model
+)
+
+# tool
+@function_tool
+def word_count(text: str) -> str:
+    """Count the number of words in the given text."""
+    count = len(text.split())
+    return f"The text contains {count} words."
+
+
+# hooks only put events in a queue, printing / writing happens in the background
+dispatcher = HookEventDispatcher(
+    ConsoleSink(),
+    JsonlSink(".cache/hook_events.jsonl"),
+    max_queue=10_000,
+    policy="drop_new",  # or "drop_old" / "block"
+)
+
+
+review_agent = Agent(
+    name="review_agent",
+    instructions="You are a reviewer agent. Review and refine the output given by the helper agent.",
+    model=model,
+)
+
+helper_agent = Agent(
+    name="helper_agent",
+    instructions="You are a helper agent that explains briefly and must call tool.",
+    model=model,
+    tools=[word_count],
+    hooks=dispatcher.agent_hooks(),  # instead of AgentEventHook()
+    handoffs=[review_agent]
+)
+
+
+async def main():
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        Runner.run(
+            helper_agent,
+            "Please explain what HTML and CSS are.",
+            run_config=config,
+            hooks=dispatcher.run_hooks(),  # instead of MyRunHooks()
+        )
+        for _ in range(20)
+    ))
+    print(f"20 runs done in {time.perf_counter() - start:.2f}s")
+
+    await dispatcher.aclose()  # flush what is still in the queue
+    print(dispatcher.stats)
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - A hook that prints is awaited by the runner: a slow terminal / disk slows down EVERY run.
+# - Here a hook only adds a small event to a queue. The writing happens in batches in a worker thread.
+# - Always call `await dispatcher.aclose()` (or use `async with dispatcher:`) before exiting,
+#   otherwise events still in the queue are lost.
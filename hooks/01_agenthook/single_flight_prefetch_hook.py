@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from dotenv import load_dotenv
+import asyncio, time
+from typing import Optional
+from agents import (
+    Agent,
+    AgentHooks,
+    Runner,
+    function_tool,
+    RunContextWrapper,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.prefetch import Prefetcher, prefetch_into
+
+load_dotenv()
+
+model = get_model("gemini-2.0-flash")
+
+config = RunConfig(
+    model=model
+)
+
+
+# pretend these are slow database / API lookups
+async def fetch_user_name(user_id: str) -> str:
+    await asyncio.sleep(0.3)
+    return {"u1": "Ali", "u2": "Sara", "u3": "Uneeza"}.get(user_id, "unknown")
+
+async def fetch_user_plan(user_id: str) -> str:
+    await asyncio.sleep(0.3)
+    return "pro" if user_id == "u1" else "free"
+
+
+# shared by ALL runs: one load per user, kept for 5 minutes
+user_names = Prefetcher(fetch_user_name, ttl=300, max_entries=10_000)
+user_plans = Prefetcher(fetch_user_plan, ttl=60, max_entries=10_000)
+
+
+@dataclass
+class UserInfo:
+    user_id: str
+    name: Optional[str] = None
+    plan: Optional[str] = None
+
+
+
+class PreFetchHook(AgentHooks[UserInfo]):
+    async def on_start(self, context: RunContextWrapper[UserInfo], agent: Agent):
+        # both lookups start together, and 20 runs for the same user share one lookup
+        await prefetch_into(
+            context.context,
+            name=(user_names, context.context.user_id),
+            plan=(user_plans, context.context.user_id),
+        )
+
+
+@function_tool
+async def get_user_name(wrapper: RunContextWrapper[UserInfo]) -> str:
+    # already on the context, no lookup here
+    return f"The user's name is {wrapper.context.name} ({wrapper.context.plan} plan)"
+
+
+
+agent = Agent[UserInfo](
+    name="helper_agent",
+    instructions="you are a helper agent .help user to get their data using tool",
+    model=model,
+    hooks=PreFetchHook(),
+    tools=[get_user_name]
+)
+
+
+
+async def main():
+    user_ids = ["u1", "u2", "u3"] * 20  # 60 runs at the same time, only 3 users
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        Runner.run(agent, "Could you please tell me user name", context=UserInfo(user_id), run_config=config)
+        for user_id in user_ids
+    ))
+    print(f"60 runs in {time.perf_counter() - start:.2f}s")
+    print(results[0].final_output)
+    print(user_names.stats)  # loads=3, joined=57
+    print(user_plans.stats)
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - Without single-flight: 60 runs -> 60 name lookups + 60 plan lookups.
+# - With Prefetcher: 3 + 3 lookups, the other runs wait for (join) the lookup already running.
+# - prefetch_into(..., wait=False) returns at once, so the LLM call does not wait for the data.
+#   A tool can always `await user_names.get(user_id)`: cached, or joins the running lookup.
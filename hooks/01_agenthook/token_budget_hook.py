@@ -0,0 +1,80 @@
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    Runner,
+    function_tool,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.token_budget import TokenBudget, TokenBudgetExceeded
+
+load_dotenv()
+
+model = get_model("gemini-2.0-flash")
+
+config = RunConfig(
+    model=model
+)
+
+# tool
+@function_tool
+def word_count(text: str) -> str:
+    """Count the number of words in the given text."""
+    count = len(text.split())
+    return f"The text contains {count} words."
+
+
+review_agent = Agent(
+    name="review_agent",
+    instructions="You are a reviewer agent. Review and refine the output given by the helper agent.",
+    model=model,
+)
+
+helper_agent = Agent(
+    name="helper_agent",
+    instructions="You are a helper agent that explains briefly and must call tool.",
+    model=model,
+    tools=[word_count],
+    handoffs=[review_agent]
+)
+
+
+budget = TokenBudget(
+    soft_run_tokens=300,            # after this: cheaper model + shorter answers for the rest of the run
+    hard_run_tokens=2_000,          # after this: stop the run
+    hard_tenant_tokens=1_500,        # all runs of one customer together
+    downgrade_model=get_model("gemini-1.5-flash-8b"),
+    downgrade_max_tokens=256,
+)
+
+
+async def main():
+    for i in range(5):
+        run = budget.start(tenant="acme", run_config=config)
+        try:
+            result = await Runner.run(
+                helper_agent,
+                "Please explain what HTML and CSS are, then count the words.",
+                run_config=run.run_config,
+                hooks=run.hooks,
+            )
+            print(f"run {i}: {result.final_output}")
+        except TokenBudgetExceeded as e:
+            print(f"run {i}: [red]stopped[/red] - {e}")
+
+        print(run.report)
+
+    print(budget.tenant_tokens)
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - Every run gets its own copy of the RunConfig from budget.start(), so the downgrade only
+#   changes THAT run (the RunConfig model is used for every agent of the run).
+# - The hard limit is checked before the next LLM call, so a runaway tool loop stops after
+#   at most one more call.
+# - budget.reset_tenant("acme") starts a new period (e.g. every day).
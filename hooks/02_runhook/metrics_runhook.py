@@ -0,0 +1,72 @@
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    RunConfig,
+    Runner,
+    function_tool,
+)
+from rich import print
+from shared.metrics_hooks import MetricsHooks
+from shared.model_client import get_model
+
+load_dotenv()
+
+model = get_model("gemini-1.5-flash")
+
+config = RunConfig(
+    model=model
+)
+
+
+@function_tool
+def word_count(text: str) -> str:
+    """Count the number of words in the given text."""
+    count = len(text.split())
+    return f"The text contains {count} words."
+
+
+# one MetricsHooks for the whole app, it can stay on in production
+metrics = MetricsHooks()
+
+
+review_agent = Agent(
+    name="review_agent",
+    instructions="You are a reviewer agent. Review and refine the output given by the helper agent.",
+    model=model,
+    hooks=metrics.agent_hooks(),  # LLM timings (see NOTE)
+)
+
+helper_agent = Agent(
+    name="helper_agent",
+    instructions="You are a helper agent that explains briefly and uses tools when needed.",
+    model=model,
+    tools=[word_count],
+    handoffs=[review_agent],
+    hooks=metrics.agent_hooks(),
+)
+
+
+async def main():
+    server = metrics.serve(port=9464)  # http://127.0.0.1:9464/metrics
+
+    questions = ["Please explain what HTML and CSS are, then count the words."] * 5
+    await asyncio.gather(*(
+        Runner.run(helper_agent, question, run_config=config, hooks=metrics)  # instead of MyRunHooks()
+        for question in questions
+    ))
+
+    metrics.write_textfile(".cache/agents.prom")
+    print(metrics.render())
+    server.shutdown()
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - Nothing is printed or formatted while the agents run, only numbers are added.
+#   Text is built only when Prometheus scrapes /metrics (or write_textfile is called).
+# - openai-agents 0.2.11 calls on_llm_start / on_llm_end on run hooks. Older versions call them
+#   only on agent hooks, so the agents get metrics.agent_hooks() too. With 0.2.11 that is
+#   harmless (each call is counted once).
@@ -7,8 +7,6 @@ from agents import (
     RunConfig,
     RunHooks,
     Runner,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
     TResponseInputItem,
     set_tracing_disabled,
     function_tool,
@@ -17,19 +15,12 @@ from agents import (
     Tool,
 )
 from rich import print
+from shared.model_client import get_model
 
 load_dotenv()
 # enable_verbose_stdout_logging()
 
-API_KEY = os.environ.get("GEMINI_API_KEY")
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-1.5-flash",
-    openai_client=AsyncOpenAI(
-        api_key=API_KEY,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
-)
+model = get_model("gemini-1.5-flash")
 
 config = RunConfig(
     model=model
@@ -0,0 +1,83 @@
+from dotenv import load_dotenv
+import asyncio, time
+from agents import (
+    Agent,
+    RunContextWrapper,
+    Runner,
+    set_tracing_disabled
+)
+from agents.run import RunConfig
+from pydantic import BaseModel
+from rich import print
+from shared.instruction_cache import cached_instructions
+from shared.model_client import get_model
+
+load_dotenv()
+set_tracing_disabled(disabled=True)
+
+model=get_model("gemini-1.5-flash")
+
+config=RunConfig(
+    model=model
+)
+
+
+class Audiance(BaseModel):
+    role:str
+    name:str
+
+
+# the prompt only depends on role -> cached by role (name is NOT part of the prompt, so not declared)
+@cached_instructions("role", max_entries=256)
+async def dynamic_instructions(ctx: RunContextWrapper[Audiance], agent: Agent) -> str:
+    role = ctx.context.role.lower()
+    print(f"\n[building the prompt for: {role}]\n")
+    await asyncio.sleep(0.2)  # e.g. template rendering + fetching the style guide
+
+    if role == "student":
+        return "You are a marketing agent. Explain simply, step by step, with easy examples."
+
+    elif role == "teacher":
+        return "You are a marketing agent. Give clear, structured explanations with definitions."
+
+    elif role == "developer":
+        return "You are a marketing agent. Be technical, focus on practical use and efficiency."
+
+    else:
+        return "You are a marketing agent. Explain clearly in a friendly, professional tone."
+
+
+agent = Agent(
+    name="marketing_agent",
+    instructions=dynamic_instructions,
+    model=model,
+)
+
+async def main():
+
+    audiences = [
+        Audiance(role="Student", name="uneeza"),
+        Audiance(role="Student", name="ali"),       # same role -> cache hit
+        Audiance(role="Developer", name="sara"),
+        Audiance(role="Student", name="hina"),      # cache hit
+    ]
+    for audiance in audiences:
+        start = time.perf_counter()
+        prompt = await agent.get_system_prompt(RunContextWrapper(audiance))
+        print(f"{audiance.name} ({audiance.role}): {time.perf_counter() - start:.3f}s  {prompt}")
+
+    result = await Runner.run(agent, "write a a short blog post on web development?", run_config=config, context=audiences[0])
+    print(result.final_output)
+
+    print(dynamic_instructions.stats, f"hit rate: {dynamic_instructions.stats.hit_rate:.0%}")
+
+asyncio.run(main())
+
+
+# NOTE:
+# - @cached_instructions keeps the (ctx, agent) signature and stays async,
+#   so the SDK checks and awaits it exactly like before.
+# - Declare EVERY context field the prompt reads. A field left out is not in the key,
+#   and another user would get a prompt built for someone else.
+# - agent.name is part of the key (not the agent): a clone with the same name shares the prompts.
+#   dynamic_instructions.cache_clear() drops all prompts.
@@ -4,26 +4,16 @@ from agents import (
     Agent,
     ModelSettings,
     Runner,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
     set_tracing_disabled,
     function_tool
 )
 from agents.run import RunConfig
 from rich import print
+from shared.model_client import get_model
 
 load_dotenv()
 
-API_KEY = os.environ.get("GEMINI_API_KEY")
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=AsyncOpenAI(
-        api_key=API_KEY,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
-)
+model = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model
@@ -0,0 +1,137 @@
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    ModelSettings,
+    Runner,
+    function_tool
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.payload_optimizer import PayloadOptimizingModel
+
+load_dotenv()
+
+# wrap the model: every request is trimmed before it is sent
+model = PayloadOptimizingModel(get_model("gemini-2.0-flash"))
+
+config = RunConfig(
+    model=model
+)
+
+
+# tools
+@function_tool
+def simple_tool(text: str) -> str:
+    """
+    A simple tool that echoes back the given text with a prefix.
+    """
+    return f"[TOOL EXECUTED] You entered: {text}"
+
+
+@function_tool
+def translate(text: str, language: str) -> str:
+    """
+    Translate marketing copy into another language.
+
+    Args:
+        text: The copy to translate.
+        language: The target language, e.g. "French".
+    """
+    return f"[{language}] {text}"
+
+
+@function_tool
+def count_words(text: str) -> int:
+    """
+    Count the words in a piece of marketing copy.
+    """
+    return len(text.split())
+
+
+review_agent = Agent(
+    name="review_agent",
+    instructions="You review marketing copy.",
+    handoff_description="Reviews marketing copy for tone and clarity.",
+    model=model,
+)
+
+
+# Agent 1: tool_choice = "none"
+
+# - Tool will NEVER execute, so the 3 tool schemas and the handoff are not sent at all.
+agent_none = Agent(
+    name="marketing_agent_none",
+    instructions="You are a professional marketing assistant. Explain concepts clearly and simply.",
+    model=model,
+    tools=[simple_tool, translate, count_words],
+    handoffs=[review_agent],
+    model_settings=ModelSettings(
+        tool_choice="none"
+    )
+)
+
+
+# Agent 2: tool_choice="your_tool_name"
+
+# - Only simple_tool can be called, so only its schema is sent
+#   (translate, count_words and the handoff are left out).
+agent_forced_tool = Agent(
+    name="agent_forced_tool",
+    instructions="You are a professional marketing assistant.",
+    model=model,
+    tools=[simple_tool, translate, count_words],
+    handoffs=[review_agent],
+    model_settings=ModelSettings(
+        tool_choice="simple_tool"
+    )
+)
+
+
+# Agent 3: tool_choice = "auto"
+
+# - The model may call anything, so everything is sent (nothing to save here).
+agent_auto = Agent(
+    name="marketing_agent_auto",
+    instructions="You are a professional marketing assistant.",
+    model=model,
+    tools=[simple_tool, translate, count_words],
+    handoffs=[review_agent],
+    model_settings=ModelSettings(
+        tool_choice="auto"
+    )
+)
+
+
+async def main():
+    print("[bold red]--- None Tool Choice ---[/bold red]")
+    result1 = await Runner.run(agent_none, "Use the tool with input 'Test this'", run_config=config)
+    print(result1.final_output)
+    print(model.stats)
+
+    print("\n[bold yellow]--- Forced Tool Choice ---[/bold yellow]")
+    result2 = await Runner.run(agent_forced_tool, "Just explain web development basics", run_config=config)
+    print(result2.final_output)
+    print(model.stats)
+
+    print("\n[bold green]--- Auto Tool Choice ---[/bold green]")
+    result3 = await Runner.run(agent_auto, "Use the tool with input 'Hello World'", run_config=config)
+    print(result3.final_output)
+    print(model.stats)
+
+asyncio.run(main())
+
+
+
+# NOTE on the saved payload:
+# - "none": no tool or handoff definitions go to the LLM (and tool_choice itself is dropped,
+#   some APIs reject a tool_choice without tools). Same answer, fewer input tokens.
+#
+# - "simple_tool": only that tool's definition is sent. After the tool ran, the SDK resets
+#   tool_choice to "auto" (Agent.reset_tool_choice), so the next turn gets every tool again.
+#
+# - "auto" / "required": nothing is dropped, except tools or handoffs with the same name
+#   twice (only the last one could ever run).
+#
+# - bytes_saved is the size of the Chat Completions tool JSON; tokens_saved is ~bytes / 4.
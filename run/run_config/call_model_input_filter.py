@@ -4,8 +4,6 @@ import asyncio, os
 from agents import (
     Agent,
     Runner,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
     set_tracing_disabled,
     enable_verbose_stdout_logging
     
@@ -13,21 +11,13 @@ from agents import (
     
 from agents.run import RunConfig,ModelInputData,CallModelData
 from rich import print
+from shared.model_client import get_model
 
 load_dotenv()
 set_tracing_disabled(disabled=True)
 enable_verbose_stdout_logging()
 
-API_KEY=os.environ.get("GEMINI_API_KEY")
-OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY")
-
-model=OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=AsyncOpenAI(
-        api_key=API_KEY,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
-)
+model=get_model("gemini-2.0-flash")
 
 # This function runs right before the model is called
 def call_model_input_filterr(cm: CallModelData[Any]) -> ModelInputData:
@@ -0,0 +1,5 @@
+"""Reusable helpers shared by the example scripts.
+
+Run the examples from the repo root as modules so this package is importable, e.g.
+`uv run python -m guardrails.01_input_guardrail.01_input_guardrail_without_params`.
+"""
@@ -0,0 +1,384 @@
+"""Distill LLM guardrail verdicts into a tiny local classifier.
+
+Every `HackingOutput` a guardrail agent returns is a labelled example. This module turns them
+into a local model in three steps:
+
+1. log:   `@verdict_log` (a `VerdictLog`) under `@input_guardrail` appends every verdict to a
+          JSONL file (`.cache/verdicts.jsonl`).
+2. train: `HashedNgramClassifier` - logistic regression on hashed word 1-2 grams and character
+          3-grams, pure Python, trained offline:
+
+              uv run python -m shared.distill train --guardrail hacking_guardrail \\
+                  --out .cache/hacking_guardrail.json
+
+3. serve: `DistilledGuardrail` wraps the LLM guardrail function. When the local model is sure
+          (probability >= threshold, or <= 1 - threshold) it answers in-process in well under a
+          millisecond, otherwise the LLM guardrail runs. `audit_rate` of the local answers are
+          re-checked by the LLM in the background to measure the agreement rate.
+
+    distilled = DistilledGuardrail(HashedNgramClassifier.load(".cache/hacking_guardrail.json"))
+
+    @input_guardrail
+    @distilled
+    async def hacking_guardrail(ctx, agent, input): ...   # the LLM guardrail, as before
+
+`output_info` is a `TieredVerdict` (see prefilter.py): tier "local" or "llm".
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, TResponseInputItem
+
+from .guardrail_cache import GuardrailFunction
+from .prefilter import TieredVerdict, input_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG = Path(".cache/verdicts.jsonl")
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+class VerdictLog:
+    """Append-only JSONL dataset of guardrail verdicts. Use as a decorator on guardrail functions.
+
+    The decorator writes in a worker thread (`asyncio.to_thread`), so the file append never
+    blocks the event loop. A failed write is logged; the guardrail's verdict is still returned.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_LOG) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, guardrail: str, text: str, output: GuardrailFunctionOutput) -> None:
+        info = output.output_info
+        record = {
+            "guardrail": guardrail,
+            "text": text,
+            "label": bool(output.tripwire_triggered),
+            "output": info.model_dump() if hasattr(info, "model_dump") else None,
+            "time": time.time(),
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def records(self, guardrail: str | None = None) -> Iterator[dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if guardrail is None or record["guardrail"] == guardrail:
+                    yield record
+
+    def dataset(self, guardrail: str) -> tuple[list[str], list[bool]]:
+        """(texts, labels) for one guardrail. The latest label wins for repeated texts."""
+        latest: dict[str, bool] = {}
+        for record in self.records(guardrail):
+            latest[record["text"]] = record["label"]
+        return list(latest), list(latest.values())
+
+    def __call__(self, func: GuardrailFunction) -> GuardrailFunction:
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(
+            ctx: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+        ) -> GuardrailFunctionOutput:
+            output = func(ctx, agent, input)
+            if inspect.isawaitable(output):
+                output = await output
+            try:
+                await asyncio.to_thread(self.append, name, input_text(input), output)
+            except Exception:
+                logger.exception("could not log the %s verdict to %s", name, self.path)
+            return output
+
+        return wrapper
+
+
+def features(text: str, n_features: int) -> dict[int, float]:
+    """Hashed word 1-2 grams and character 3-grams, L2-normalized.
+
+    crc32 instead of hash(): Python's str hash changes between processes.
+    """
+    text = text.lower()
+    words = _WORD.findall(text)
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    padded = f" {' '.join(words)} "
+    grams += [f"#{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+
+    counts: dict[int, float] = {}
+    for gram in grams:
+        index = zlib.crc32(gram.encode()) % n_features
+        counts[index] = counts.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {i: v / norm for i, v in counts.items()}
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+class HashedNgramClassifier:
+    """Binary logistic regression over hashed n-gram features (sparse, pure Python)."""
+
+    def __init__(self, n_features: int = 2**18) -> None:
+        self.n_features = n_features
+        self.weights: dict[int, float] = {}
+        self.bias = 0.0
+
+    def predict_proba(self, text: str) -> float:
+        """Probability that the guardrail trips for `text`."""
+        x = features(text, self.n_features)
+        return _sigmoid(self.bias + sum(self.weights.get(i, 0.0) * v for i, v in x.items()))
+
+    def fit(
+        self,
+        texts: list[str],
+        labels: list[bool],
+        *,
+        epochs: int = 20,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 0,
+    ) -> HashedNgramClassifier:
+        """Plain SGD on the log loss. Positive examples are re-weighted when classes are unbalanced."""
+        rows = [(features(t, self.n_features), 1.0 if y else 0.0) for t, y in zip(texts, labels)]
+        positives = sum(y for _, y in rows)
+        negatives = len(rows) - positives
+        weight = {
+            1.0: len(rows) / (2 * positives) if positives else 1.0,
+            0.0: len(rows) / (2 * negatives) if negatives else 1.0,
+        }
+
+        rng = random.Random(seed)
+        w = self.weights
+        for epoch in range(epochs):
+            rng.shuffle(rows)
+            lr = learning_rate / (1 + epoch * 0.1)
+            for x, y in rows:
+                z = self.bias + sum(w.get(i, 0.0) * v for i, v in x.items())
+                grad = (_sigmoid(z) - y) * weight[y]
+                self.bias -= lr * grad
+                for i, v in x.items():
+                    w[i] = w.get(i, 0.0) * (1 - lr * l2) - lr * grad * v
+        return self
+
+    def save(self, path: str | Path) -> None:
+        data = {
+            "n_features": self.n_features,
+            "bias": self.bias,
+            "weights": {str(i): round(v, 6) for i, v in self.weights.items() if abs(v) > 1e-6},
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(data))
+
+    @classmethod
+    def load(cls, path: str | Path) -> HashedNgramClassifier:
+        data = json.loads(Path(path).read_text())
+        model = cls(data["n_features"])
+        model.bias = data["bias"]
+        model.weights = {int(i): v for i, v in data["weights"].items()}
+        return model
+
+
+@dataclass
+class DistillStats:
+    local: int = 0
+    """Checks answered by the local classifier."""
+
+    fallback: int = 0
+    """Checks the local classifier was unsure about (the LLM guardrail answered)."""
+
+    compared: int = 0
+    """Checks where both the local classifier and the LLM gave a verdict."""
+
+    agreed: int = 0
+    audit_errors: int = 0
+    """Background audits whose LLM guardrail call failed (logged, not counted in `compared`)."""
+
+    local_seconds: float = 0.0
+
+    @property
+    def local_rate(self) -> float:
+        total = self.local + self.fallback
+        return self.local / total if total else 0.0
+
+    @property
+    def agreement_rate(self) -> float:
+        return self.agreed / self.compared if self.compared else 0.0
+
+
+class DistilledGuardrail:
+    """Local classifier in front of an LLM guardrail function. Use as a decorator."""
+
+    def __init__(
+        self,
+        classifier: HashedNgramClassifier,
+        *,
+        threshold: float = 0.9,
+        audit_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Args:
+            classifier: the trained local model.
+            threshold: answer locally when P(trip) >= threshold or <= 1 - threshold.
+            audit_rate: fraction of local answers also checked by the LLM in the background,
+                only to measure the agreement rate (the local answer is still used).
+        """
+        if not 0.5 <= threshold <= 1.0:
+            raise ValueError("threshold must be between 0.5 and 1")
+        self.classifier = classifier
+        self.threshold = threshold
+        self.audit_rate = audit_rate
+        self.stats = DistillStats()
+        self._rng = random.Random(seed)
+        self._audits: set[asyncio.Task[None]] = set()
+
+    def _compare(self, local_trip: bool, output: GuardrailFunctionOutput) -> None:
+        self.stats.compared += 1
+        if local_trip == bool(output.tripwire_triggered):
+            self.stats.agreed += 1
+
+    async def _audit(self, func: GuardrailFunction, args: tuple[Any, ...], local_trip: bool) -> None:
+        output = func(*args)
+        if inspect.isawaitable(output):
+            output = await output
+        self._compare(local_trip, output)
+
+    def _audit_done(self, task: asyncio.Task[None]) -> None:
+        self._audits.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()  # retrieved here, so asyncio never reports it as unhandled
+        if error is not None:
+            self.stats.audit_errors += 1
+            logger.warning("background guardrail audit failed", exc_info=error)
+
+    async def wait_for_audits(self) -> None:
+        """Wait for background audits (so `stats.agreement_rate` includes them)."""
+        if self._audits:
+            await asyncio.gather(*self._audits, return_exceptions=True)
+
+    def __call__(self, func: GuardrailFunction) -> GuardrailFunction:
+        @functools.wraps(func)
+        async def wrapper(
+            ctx: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+        ) -> GuardrailFunctionOutput:
+            start = time.perf_counter()
+            p = self.classifier.predict_proba(input_text(input))
+            elapsed = time.perf_counter() - start
+            self.stats.local_seconds += elapsed
+            matched = [f"p={p:.3f}"]
+
+            if p >= self.threshold or p <= 1 - self.threshold:
+                self.stats.local += 1
+                tripped = p >= self.threshold
+                if self.audit_rate and self._rng.random() < self.audit_rate:
+                    task = asyncio.create_task(self._audit(func, (ctx, agent, input), tripped))
+                    self._audits.add(task)
+                    task.add_done_callback(self._audit_done)
+                return GuardrailFunctionOutput(
+                    output_info=TieredVerdict(
+                        "local", "block" if tripped else "allow", matched, elapsed_ms=elapsed * 1000
+                    ),
+                    tripwire_triggered=tripped,
+                )
+
+            self.stats.fallback += 1
+            output = func(ctx, agent, input)
+            if inspect.isawaitable(output):
+                output = await output
+            self._compare(p >= 0.5, output)
+            return GuardrailFunctionOutput(
+                output_info=TieredVerdict(
+                    "llm",
+                    "escalate",
+                    matched,
+                    llm_output=output.output_info,
+                    elapsed_ms=(time.perf_counter() - start) * 1000,
+                ),
+                tripwire_triggered=output.tripwire_triggered,
+            )
+
+        wrapper.distilled = self  # type: ignore[attr-defined]
+        return wrapper
+
+
+def evaluate(
+    classifier: HashedNgramClassifier, texts: Iterable[str], labels: Iterable[bool], threshold: float = 0.9
+) -> dict[str, float]:
+    """Accuracy on all examples, and coverage / accuracy of the confident (local) answers."""
+    total = correct = confident = confident_correct = 0
+    for text, label in zip(texts, labels):
+        p = classifier.predict_proba(text)
+        total += 1
+        correct += (p >= 0.5) == label
+        if p >= threshold or p <= 1 - threshold:
+            confident += 1
+            confident_correct += (p >= threshold) == label
+    return {
+        "examples": total,
+        "accuracy": correct / total if total else 0.0,
+        "local_rate": confident / total if total else 0.0,
+        "local_accuracy": confident_correct / confident if confident else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train a local classifier from logged guardrail verdicts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train")
+    train.add_argument("--log", default=str(DEFAULT_LOG))
+    train.add_argument("--guardrail", required=True, help="guardrail function name, e.g. hacking_guardrail")
+    train.add_argument("--out", required=True)
+    train.add_argument("--epochs", type=int, default=20)
+    train.add_argument("--threshold", type=float, default=0.9)
+    train.add_argument("--holdout", type=float, default=0.2, help="fraction kept for evaluation")
+    args = parser.parse_args()
+
+    texts, labels = VerdictLog(args.log).dataset(args.guardrail)
+    if not texts:
+        parser.error(f"no verdicts for {args.guardrail!r} in {args.log}")
+    rows = list(zip(texts, labels))
+    random.Random(0).shuffle(rows)
+    cut = int(len(rows) * (1 - args.holdout)) if len(rows) > 4 else len(rows)
+    train_rows, test_rows = rows[:cut], rows[cut:] or rows
+
+    classifier = HashedNgramClassifier().fit(
+        [t for t, _ in train_rows], [y for _, y in train_rows], epochs=args.epochs
+    )
+    report = evaluate(classifier, [t for t, _ in test_rows], [y for _, y in test_rows], args.threshold)
+    classifier.save(args.out)
+    print(f"trained on {len(train_rows)} verdicts, evaluated on {len(test_rows)}: {report}")
+    print(f"saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
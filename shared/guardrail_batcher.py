@@ -0,0 +1,181 @@
+"""Micro-batching for guardrail classifiers: many concurrent checks, one LLM call.
+
+When hundreds of requests arrive together, every `hacking_guardrail` sends its own tiny
+`HackingOutput` request, and the per-request rate limit is hit long before the token limit.
+`GuardrailBatcher` collects the inputs of concurrent guardrail calls for a few milliseconds (or
+until `max_batch` are waiting), asks the model once for a *list* of verdicts, and hands each
+waiting guardrail its own verdict back.
+
+    hacking_batcher = GuardrailBatcher(
+        HackingOutput, "Check if the user is asking you to do hacking.", model=model, window_ms=10, max_batch=32
+    )
+
+    @input_guardrail
+    async def hacking_guardrail(ctx, agent, input):
+        verdict = await hacking_batcher.classify(input)   # a HackingOutput
+        return GuardrailFunctionOutput(output_info=verdict, tripwire_triggered=verdict.is_hacking)
+
+A batch of one is sent as a normal single request. If the model leaves out an item, that item is
+re-checked on its own, so every caller always gets a verdict.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from agents import Agent, Model, RunConfig, Runner, TResponseInputItem
+from pydantic import BaseModel, create_model
+
+from .prefilter import input_text
+
+TVerdict = TypeVar("TVerdict", bound=BaseModel)
+
+_BATCH_INSTRUCTIONS = """{instructions}
+
+You get several numbered user messages, one per line, as `[index] "message"`.
+Judge every message on its own and return exactly one verdict per message in `verdicts`,
+with `index` set to the number of the message it belongs to."""
+
+
+@dataclass
+class BatchStats:
+    batches: int = 0
+    """LLM calls made for batches (including batches of one)."""
+
+    items: int = 0
+    """Inputs classified."""
+
+    deduplicated: int = 0
+    """Inputs that were identical to another input in the same batch."""
+
+    fallbacks: int = 0
+    """Items the batch answer missed, re-checked with a single call."""
+
+    largest_batch: int = 0
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    @property
+    def calls_saved(self) -> int:
+        return self.items - self.batches - self.fallbacks
+
+
+class GuardrailBatcher(Generic[TVerdict]):
+    """Batches `classify()` calls that arrive within `window_ms` into one structured-output call."""
+
+    def __init__(
+        self,
+        output_type: type[TVerdict],
+        instructions: str,
+        *,
+        model: str | Model | None = None,
+        window_ms: float = 10.0,
+        max_batch: int = 16,
+        run_config: RunConfig | None = None,
+        name: str | None = None,
+    ) -> None:
+        """
+        Args:
+            output_type: the verdict model of one input, e.g. `HackingOutput`.
+            instructions: the guardrail agent's instructions (for one input).
+            model: model for the guardrail agent (or set it through `run_config`).
+            window_ms: how long the first waiting input waits for others to join its batch.
+            max_batch: a batch is sent right away once this many inputs are waiting.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.output_type = output_type
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self.run_config = run_config
+        self.stats = BatchStats()
+
+        name = name or f"{output_type.__name__} check"
+        item_type = create_model(f"{output_type.__name__}Item", __base__=output_type, index=(int, ...))
+        batch_type = create_model(f"{output_type.__name__}Batch", verdicts=(list[item_type], ...))
+        self._single_agent = Agent(name=name, instructions=instructions, output_type=output_type, model=model)
+        self._batch_agent = Agent(
+            name=f"{name} (batched)",
+            instructions=_BATCH_INSTRUCTIONS.format(instructions=instructions),
+            output_type=batch_type,
+            model=model,
+        )
+
+        self._pending: list[tuple[str, asyncio.Future[TVerdict]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task[None]] = set()
+
+    async def classify(self, input: str | list[TResponseInputItem]) -> TVerdict:
+        """The verdict for one guardrail input. Waits at most `window_ms` + one LLM call."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[TVerdict] = loop.create_future()
+        self._pending.append((input_text(input), future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # guardrails cancelled while waiting (another one tripped) don't need a verdict any more
+        batch = [(text, future) for text, future in self._pending if not future.done()]
+        self._pending = []
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future[TVerdict]]]) -> None:
+        waiting: dict[str, list[asyncio.Future[TVerdict]]] = {}
+        for text, future in batch:
+            waiting.setdefault(text, []).append(future)
+        texts = list(waiting)
+
+        self.stats.batches += 1
+        self.stats.items += len(batch)
+        self.stats.deduplicated += len(batch) - len(texts)
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+
+        try:
+            verdicts = await self._classify_many(texts)
+        except Exception as e:
+            for futures in waiting.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for text, verdict in zip(texts, verdicts):
+            for future in waiting[text]:
+                if not future.done():
+                    future.set_result(verdict)
+
+    async def _classify_one(self, text: str) -> TVerdict:
+        result = await Runner.run(self._single_agent, text, run_config=self.run_config)
+        return result.final_output
+
+    async def _classify_many(self, texts: list[str]) -> list[TVerdict]:
+        if len(texts) == 1:
+            return [await self._classify_one(texts[0])]
+
+        prompt = "\n".join(f"[{i}] {json.dumps(text, ensure_ascii=False)}" for i, text in enumerate(texts))
+        result = await Runner.run(self._batch_agent, prompt, run_config=self.run_config)
+        verdicts: dict[int, TVerdict] = {
+            item.index: self.output_type.model_validate(item.model_dump(exclude={"index"}))
+            for item in result.final_output.verdicts
+            if 0 <= item.index < len(texts)
+        }
+
+        missing = [i for i in range(len(texts)) if i not in verdicts]
+        self.stats.fallbacks += len(missing)
+        rechecked = await asyncio.gather(*(self._classify_one(texts[i]) for i in missing))
+        verdicts.update(zip(missing, rechecked))
+        return [verdicts[i] for i in range(len(texts))]
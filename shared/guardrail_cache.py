@@ -0,0 +1,178 @@
+"""Verdict cache for LLM-backed guardrails.
+
+A guardrail like `hacking_guardrail` runs a whole `Runner.run(guardrail_agent, input)` for every
+request, even when the exact same prompt was classified a minute ago. `VerdictCache` remembers
+the `GuardrailFunctionOutput` (tripwire + output_info) per normalized input:
+
+    verdicts = VerdictCache(agent=guardrail_agent, ttl=600, max_entries=10_000)
+
+    @input_guardrail
+    @verdicts
+    async def hacking_guardrail(ctx, agent, input):
+        result = await Runner.run(guardrail_agent, input, context=ctx.context)
+        return GuardrailFunctionOutput(output_info=result.final_output, tripwire_triggered=...)
+
+The guardrail agent's instructions, output type and model are part of the key, so editing the
+instructions automatically stops old verdicts from being served. `invalidate()` drops everything.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, TResponseInputItem
+
+_WHITESPACE = re.compile(r"\s+")
+
+GuardrailFunction = Callable[..., Awaitable[GuardrailFunctionOutput] | GuardrailFunctionOutput]
+
+
+@dataclass
+class VerdictStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def input_digest(input: str | list[TResponseInputItem] | Any) -> str:
+    """Stable hash of a guardrail input. Case and whitespace differences map to the same digest."""
+    if isinstance(input, str):
+        normalized: Any = normalize_text(input)
+    else:
+
+        def _normalize(value: Any) -> Any:
+            if isinstance(value, str):
+                return normalize_text(value)
+            if isinstance(value, dict):
+                # ids differ on every run but don't change what the user said
+                return {k: _normalize(v) for k, v in value.items() if k not in ("id", "call_id")}
+            if isinstance(value, list):
+                return [_normalize(v) for v in value]
+            if hasattr(value, "model_dump"):
+                return _normalize(value.model_dump())
+            return value
+
+        normalized = _normalize(input)
+    raw = json.dumps(normalized, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def agent_fingerprint(agent: Agent[Any] | None) -> str:
+    """Hash of what decides a guardrail agent's verdicts: instructions, output type and model."""
+    if agent is None:
+        return ""
+    instructions = agent.instructions
+    if callable(instructions):
+        instructions = f"{instructions.__module__}.{instructions.__qualname__}"
+    parts = [
+        str(instructions),
+        getattr(agent.output_type, "__qualname__", str(agent.output_type)),
+        str(getattr(agent.model, "model", agent.model)),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:16]
+
+
+class VerdictCache:
+    """Bounded (size + TTL) cache of guardrail verdicts, used as a decorator on the guardrail function."""
+
+    def __init__(
+        self,
+        agent: Agent[Any] | None = None,
+        *,
+        ttl: float | None = 600,
+        max_entries: int = 10_000,
+        version: str = "",
+    ) -> None:
+        """
+        Args:
+            agent: the guardrail agent. Its instructions/output type/model are part of the key.
+            ttl: seconds a verdict stays valid. None = until evicted.
+            max_entries: LRU bound.
+            version: extra string for the key; bump it to drop verdicts after a logic change.
+        """
+        self.agent = agent
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = version
+        self.stats = VerdictStats()
+        self._entries: OrderedDict[str, tuple[GuardrailFunctionOutput, float]] = OrderedDict()
+        self._fingerprint = agent_fingerprint(agent)
+
+    def _current_fingerprint(self) -> str:
+        fingerprint = agent_fingerprint(self.agent)
+        if fingerprint != self._fingerprint:
+            # guardrail agent changed since the verdicts were stored: none of them apply anymore
+            self._fingerprint = fingerprint
+            self.invalidate()
+        return fingerprint
+
+    def key(self, name: str, input: Any) -> str:
+        return f"{name}:{self.version}:{self._current_fingerprint()}:{input_digest(input)}"
+
+    def get(self, key: str) -> GuardrailFunctionOutput | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        output, stored_at = entry
+        if self.ttl is not None and time.monotonic() - stored_at >= self.ttl:
+            del self._entries[key]
+            self.stats.expired += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return output
+
+    def put(self, key: str, output: GuardrailFunctionOutput) -> None:
+        self._entries[key] = (output, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+        self.stats.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __call__(self, func: GuardrailFunction) -> GuardrailFunction:
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(
+            ctx: RunContextWrapper[Any], agent: Agent[Any], input: Any
+        ) -> GuardrailFunctionOutput:
+            key = self.key(name, input)
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+            output = func(ctx, agent, input)
+            if inspect.isawaitable(output):
+                output = await output
+            self.put(key, output)
+            return output
+
+        wrapper.verdict_cache = self  # type: ignore[attr-defined]
+        return wrapper
@@ -0,0 +1,113 @@
+"""Run many input guardrails at once, stop at the first tripwire, and time each one.
+
+With a RunConfig guardrail *and* an agent guardrail (see global_input_guardrail.py) every request
+makes two guardrail LLM calls. `concurrent_input_guardrail()` merges any number of guardrails into
+one `InputGuardrail` that:
+
+    - starts all of them at the same time (worst case = the slowest one, not the sum)
+    - cancels the rest as soon as one trips, and trips itself right away
+    - reports wall-clock time per guardrail in `output_info` (a `GuardrailRunReport`)
+
+    all_checks = concurrent_input_guardrail(hacking_guardrail, biology_guardrail)
+    config = RunConfig(input_guardrails=[all_checks])
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrail,
+    InputGuardrailResult,
+    RunContextWrapper,
+    TResponseInputItem,
+)
+
+
+@dataclass
+class GuardrailTiming:
+    name: str
+    seconds: float
+    tripped: bool = False
+    cancelled: bool = False
+
+
+@dataclass
+class GuardrailRunReport:
+    timings: list[GuardrailTiming] = field(default_factory=list)
+    results: list[InputGuardrailResult] = field(default_factory=list)
+    """Results of the guardrails that finished (the tripped one is last)."""
+
+    tripped: InputGuardrailResult | None = None
+    wall_seconds: float = 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        """Time saved compared to running the guardrails one after another."""
+        return max(sum(t.seconds for t in self.timings) - self.wall_seconds, 0.0)
+
+
+async def run_input_guardrails(
+    guardrails: list[InputGuardrail[Any]],
+    agent: Agent[Any],
+    input: str | list[TResponseInputItem],
+    context: RunContextWrapper[Any],
+) -> GuardrailRunReport:
+    """Run `guardrails` concurrently. Stops (and cancels the others) at the first tripwire."""
+    report = GuardrailRunReport()
+    start = time.perf_counter()
+    started: dict[asyncio.Task[InputGuardrailResult], InputGuardrail[Any]] = {}
+
+    async def _timed(guardrail: InputGuardrail[Any]) -> InputGuardrailResult:
+        t0 = time.perf_counter()
+        try:
+            result = await guardrail.run(agent, input, context)
+        except asyncio.CancelledError:
+            report.timings.append(GuardrailTiming(guardrail.get_name(), time.perf_counter() - t0, cancelled=True))
+            raise
+        report.timings.append(
+            GuardrailTiming(guardrail.get_name(), time.perf_counter() - t0, result.output.tripwire_triggered)
+        )
+        return result
+
+    for guardrail in guardrails:
+        started[asyncio.create_task(_timed(guardrail))] = guardrail
+
+    pending = set(started)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                report.results.append(result)
+                if result.output.tripwire_triggered and report.tripped is None:
+                    report.tripped = result
+            if report.tripped is not None:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            # let the cancelled guardrails record their timing before we report
+            await asyncio.gather(*pending, return_exceptions=True)
+        report.wall_seconds = time.perf_counter() - start
+    return report
+
+
+def concurrent_input_guardrail(
+    *guardrails: InputGuardrail[Any], name: str = "concurrent_input_guardrails"
+) -> InputGuardrail[Any]:
+    """One `InputGuardrail` that runs all `guardrails` concurrently with early cancellation."""
+
+    async def _run_all(
+        ctx: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+    ) -> GuardrailFunctionOutput:
+        report = await run_input_guardrails(list(guardrails), agent, input, ctx)
+        return GuardrailFunctionOutput(output_info=report, tripwire_triggered=report.tripped is not None)
+
+    return InputGuardrail(guardrail_function=_run_all, name=name)
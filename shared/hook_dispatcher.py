@@ -0,0 +1,326 @@
+"""Hooks that never do I/O on the event loop.
+
+`AgentEventHook` and `MyRunHooks` call `rich.print` inside the hook. The hook is awaited by the
+runner, so every print (or file write) pauses that run, and every other run on the same loop.
+With a slow terminal or disk that adds up fast.
+
+`HookEventDispatcher` keeps the hooks cheap: a hook only puts a small `HookEvent` into a bounded
+in-memory queue. A background task takes the events out in batches and hands each batch to the
+sinks in a worker thread, where the formatting and writing happen.
+
+    dispatcher = HookEventDispatcher(ConsoleSink(), JsonlSink(".cache/hook_events.jsonl"))
+
+    agent = Agent(..., hooks=dispatcher.agent_hooks())                 # like AgentEventHook
+    result = await Runner.run(agent, "...", hooks=dispatcher.run_hooks())  # like MyRunHooks
+
+    await dispatcher.aclose()   # flush everything that is still queued
+
+When the queue is full (`max_queue`), `policy` decides:
+
+    "drop_new"  -> the new event is dropped (default, never slows a run down)
+    "drop_old"  -> the oldest queued event is dropped to make room
+    "block"     -> the hook waits for room (backpressure: runs slow down instead of losing events)
+
+Dropped events are counted in `dispatcher.stats`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Literal, Protocol, TextIO
+
+from agents import Agent, AgentHooks, ModelResponse, RunContextWrapper, RunHooks, Tool, TResponseInputItem
+
+Policy = Literal["drop_new", "drop_old", "block"]
+
+
+@dataclass(slots=True)
+class HookEvent:
+    kind: str
+    """"agent_start", "agent_end", "llm_start", "llm_end", "tool_start", "tool_end" or "handoff"."""
+
+    agent: str
+    time: float
+    source: str
+    """"run" (RunHooks) or "agent" (AgentHooks)."""
+
+    tool: str | None = None
+    to_agent: str | None = None
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    result: Any = None
+    """Tool result or agent output (formatted by the sink, not by the hook)."""
+
+
+class HookSink(Protocol):
+    def write(self, events: list[HookEvent]) -> None:
+        """Write a batch of events. Called in a worker thread, never on the event loop."""
+        ...
+
+    def close(self) -> None: ...
+
+
+def format_event(event: HookEvent) -> str:
+    prefix = "[RunHook]" if event.source == "run" else "[AgentHook]"
+    if event.kind in ("tool_start", "tool_end"):
+        text = f"{event.kind} {event.tool} (agent: {event.agent})"
+        if event.kind == "tool_end":
+            text += f", result: {event.result}"
+    elif event.kind == "handoff":
+        text = f"handoff {event.agent} -> {event.to_agent}"
+    elif event.kind == "llm_end":
+        tokens = f"input tokens: {event.input_tokens}, output tokens: {event.output_tokens}"
+        text = f"llm_end {event.agent} ({tokens})"
+    elif event.kind == "agent_end":
+        text = f"agent_end {event.agent}, output: {event.result}"
+    else:
+        text = f"{event.kind} {event.agent}"
+    return f"{prefix} {text}"
+
+
+class ConsoleSink:
+    """Prints events, one write per batch."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream or sys.stdout
+
+    def write(self, events: list[HookEvent]) -> None:
+        self.stream.write("".join(format_event(e) + "\n" for e in events))
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class JsonlSink:
+    """Appends events as JSON lines, one write per batch."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def write(self, events: list[HookEvent]) -> None:
+        self._file.write("".join(json.dumps(asdict(e), default=str) + "\n" for e in events))
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass
+class DispatcherStats:
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    batches: int = 0
+    sink_errors: int = 0
+    max_depth: int = 0
+    """Most events ever waiting in the queue."""
+
+    blocked_seconds: float = 0.0
+    """Time hooks waited for room ("block" policy)."""
+
+    @property
+    def average_batch(self) -> float:
+        return self.written / self.batches if self.batches else 0.0
+
+
+class HookEventDispatcher:
+    """Bounded queue + background batch writer behind `run_hooks()` / `agent_hooks()`."""
+
+    def __init__(
+        self,
+        *sinks: HookSink,
+        max_queue: int = 10_000,
+        max_batch: int = 500,
+        policy: Policy = "drop_new",
+    ) -> None:
+        if not sinks:
+            sinks = (ConsoleSink(),)
+        self.sinks = list(sinks)
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.policy = policy
+        self.stats = DispatcherStats()
+        self._queue: asyncio.Queue[HookEvent | None] | None = None
+        self._consumer: asyncio.Task[None] | None = None
+        self._closed = False
+        self._sink_lock = threading.Lock()
+
+    def _ensure_consumer(self) -> asyncio.Queue[HookEvent | None]:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._consumer = asyncio.create_task(self._consume(self._queue))
+        return self._queue
+
+    async def emit(self, event: HookEvent) -> None:
+        """Queue one event. Only waits with the "block" policy and a full queue."""
+        if self._closed:
+            self.stats.dropped += 1
+            return
+        queue = self._ensure_consumer()
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if self.policy == "drop_new":
+                self.stats.dropped += 1
+                return
+            if self.policy == "drop_old":
+                queue.get_nowait()
+                queue.task_done()
+                self.stats.dropped += 1
+                queue.put_nowait(event)
+            else:
+                start = time.perf_counter()
+                await queue.put(event)
+                self.stats.blocked_seconds += time.perf_counter() - start
+        self.stats.enqueued += 1
+        self.stats.max_depth = max(self.stats.max_depth, queue.qsize())
+
+    def _write(self, batch: list[HookEvent]) -> None:
+        with self._sink_lock:
+            for sink in self.sinks:
+                try:
+                    sink.write(batch)
+                except Exception:
+                    # a broken sink must not take the runs down with it
+                    self.stats.sink_errors += 1
+
+    async def _consume(self, queue: asyncio.Queue[HookEvent | None]) -> None:
+        while True:
+            first = await queue.get()
+            items = [first]
+            while len(items) < self.max_batch and not queue.empty():
+                items.append(queue.get_nowait())
+
+            batch = [e for e in items if e is not None]
+            if batch:
+                await asyncio.to_thread(self._write, batch)
+                self.stats.written += len(batch)
+                self.stats.batches += 1
+            for _ in items:
+                queue.task_done()
+            if None in items:
+                return
+
+    async def flush(self) -> None:
+        """Wait until every queued event was written."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def aclose(self) -> None:
+        """Flush, stop the background task and close the sinks. Later events are dropped."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._queue is not None and self._consumer is not None:
+            await self._queue.put(None)  # sentinel, after everything that is queued
+            await self._consumer
+        await asyncio.to_thread(self._close_sinks)
+
+    def _close_sinks(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+    async def __aenter__(self) -> HookEventDispatcher:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    def run_hooks(self) -> RunHooks[Any]:
+        return _BufferedRunHooks(self)
+
+    def agent_hooks(self) -> AgentHooks[Any]:
+        return _BufferedAgentHooks(self)
+
+
+class _BufferedRunHooks(RunHooks[Any]):
+    def __init__(self, dispatcher: HookEventDispatcher) -> None:
+        self.emit = dispatcher.emit
+
+    async def on_agent_start(self, context: RunContextWrapper[Any], agent: Agent[Any]) -> None:
+        await self.emit(HookEvent("agent_start", agent.name, time.time(), "run"))
+
+    async def on_agent_end(self, context: RunContextWrapper[Any], agent: Agent[Any], output: Any) -> None:
+        await self.emit(HookEvent("agent_end", agent.name, time.time(), "run", result=output))
+
+    async def on_llm_start(
+        self,
+        context: RunContextWrapper[Any],
+        agent: Agent[Any],
+        system_prompt: str | None,
+        input_items: list[TResponseInputItem],
+    ) -> None:
+        await self.emit(HookEvent("llm_start", agent.name, time.time(), "run"))
+
+    async def on_llm_end(self, context: RunContextWrapper[Any], agent: Agent[Any], response: ModelResponse) -> None:
+        usage = response.usage
+        await self.emit(
+            HookEvent(
+                "llm_end",
+                agent.name,
+                time.time(),
+                "run",
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+            )
+        )
+
+    async def on_handoff(self, context: RunContextWrapper[Any], from_agent: Agent[Any], to_agent: Agent[Any]) -> None:
+        await self.emit(HookEvent("handoff", from_agent.name, time.time(), "run", to_agent=to_agent.name))
+
+    async def on_tool_start(self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool) -> None:
+        await self.emit(HookEvent("tool_start", agent.name, time.time(), "run", tool=tool.name))
+
+    async def on_tool_end(self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool, result: Any) -> None:
+        await self.emit(HookEvent("tool_end", agent.name, time.time(), "run", tool=tool.name, result=result))
+
+
+class _BufferedAgentHooks(AgentHooks[Any]):
+    def __init__(self, dispatcher: HookEventDispatcher) -> None:
+        self.emit = dispatcher.emit
+
+    async def on_start(self, context: RunContextWrapper[Any], agent: Agent[Any]) -> None:
+        await self.emit(HookEvent("agent_start", agent.name, time.time(), "agent"))
+
+    async def on_end(self, context: RunContextWrapper[Any], agent: Agent[Any], output: Any) -> None:
+        await self.emit(HookEvent("agent_end", agent.name, time.time(), "agent", result=output))
+
+    async def on_llm_start(
+        self,
+        context: RunContextWrapper[Any],
+        agent: Agent[Any],
+        system_prompt: str | None,
+        input_items: list[TResponseInputItem],
+    ) -> None:
+        await self.emit(HookEvent("llm_start", agent.name, time.time(), "agent"))
+
+    async def on_llm_end(self, context: RunContextWrapper[Any], agent: Agent[Any], response: ModelResponse) -> None:
+        usage = response.usage
+        await self.emit(
+            HookEvent(
+                "llm_end",
+                agent.name,
+                time.time(),
+                "agent",
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+            )
+        )
+
+    async def on_handoff(self, context: RunContextWrapper[Any], agent: Agent[Any], source: Agent[Any]) -> None:
+        await self.emit(HookEvent("handoff", source.name, time.time(), "agent", to_agent=agent.name))
+
+    async def on_tool_start(self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool) -> None:
+        await self.emit(HookEvent("tool_start", agent.name, time.time(), "agent", tool=tool.name))
+
+    async def on_tool_end(self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool, result: Any) -> None:
+        await self.emit(HookEvent("tool_end", agent.name, time.time(), "agent", tool=tool.name, result=result))
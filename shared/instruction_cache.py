@@ -0,0 +1,182 @@
+"""Memoized dynamic instructions: the prompt is cached by the context fields it depends on.
+
+`dynamic_instructions` (instructions/dynamic_instruction.py) builds the system prompt from
+`ctx.context.role`, and `Agent.get_system_prompt()` (agent_methods/get_system_prompt.py) calls it
+again on every turn of every run. Real instruction builders render templates and fetch data, so
+that is repeated work: the prompt only changes when `role` does.
+
+`cached_instructions` declares what the prompt depends on and caches the result by it:
+
+    @cached_instructions("role", max_entries=256)
+    async def dynamic_instructions(ctx: RunContextWrapper[Audiance], agent: Agent) -> str: ...
+
+    agent = Agent(name="marketing_agent", instructions=dynamic_instructions)
+
+    dynamic_instructions.stats          # hits / misses / joined / evicted, hit_rate
+    dynamic_instructions.cache_clear()  # e.g. after the templates changed
+
+- Fields are read from `ctx.context` (attributes or dict keys, "user.role" for nested values).
+  `key=lambda ctx: ...` adds a part computed from the context, like `ToolCache.memoize(key=...)`.
+- `per_agent=True` puts `agent.name` in the key (the function gets the agent too), not the
+  agent itself: clones that keep the name but change other settings (`agent.clone(...)`) share
+  the cached prompts. Give them another name, or call `cache_clear()`. `per_agent=False` shares
+  the prompts between all agents.
+- Only the declared fields are in the key: if the function reads anything else from the context,
+  declare it too, or two contexts with the same role get the same (stale) prompt.
+- Errors are not cached. Concurrent misses with the same key (parallel runs) share one call.
+
+The wrapper keeps the function's signature (the SDK checks for exactly 2 parameters) and stays
+`async` for async functions, so `get_system_prompt()` still awaits it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Protocol, cast
+
+from agents import RunContextWrapper
+
+from .tool_cache import canonical_args
+
+
+@dataclass
+class InstructionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    joined: int = 0
+    """Calls that waited for an identical call already running."""
+
+    evicted: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses + self.joined
+        return (self.hits + self.joined) / total if total else 0.0
+
+
+class CachedInstructions(Protocol):
+    """What `cached_instructions` returns: the instructions function, plus its cache."""
+
+    stats: InstructionCacheStats
+
+    def __call__(self, ctx: RunContextWrapper[Any], agent: Any) -> Any: ...
+
+    def cache_clear(self) -> None: ...
+
+
+def context_field(context: Any, path: str) -> Any:
+    """`context.a.b` for path "a.b", attributes or dict keys."""
+    value = context
+    for part in path.split("."):
+        if isinstance(value, dict):
+            if part not in value:
+                raise KeyError(f"instruction cache field {path!r}: context has no {part!r}")
+            value = value[part]
+        elif hasattr(value, part):
+            value = getattr(value, part)
+        else:
+            raise AttributeError(f"instruction cache field {path!r}: context has no {part!r}")
+    return value
+
+
+def cached_instructions(
+    *fields: str,
+    key: Callable[[RunContextWrapper[Any]], Any] | None = None,
+    max_entries: int = 128,
+    per_agent: bool = True,
+) -> Callable[[Callable[..., Any]], CachedInstructions]:
+    """Cache an instructions function's prompt by `fields` of the run context (see module docs)."""
+    if not fields and key is None:
+        raise TypeError("cached_instructions needs the context fields the prompt depends on (or key=)")
+
+    def decorator(func: Callable[..., Any]) -> CachedInstructions:
+        stats = InstructionCacheStats()
+        entries: OrderedDict[tuple[str | None, str], str] = OrderedDict()
+        in_flight: dict[tuple[str | None, str], asyncio.Future[str]] = {}
+
+        def cache_key(ctx: RunContextWrapper[Any], agent: Any) -> tuple[str | None, str]:
+            context = ctx.context if ctx is not None else None
+            parts = {field: context_field(context, field) for field in fields}
+            if key is not None:
+                parts["<key>"] = key(ctx)
+            return (getattr(agent, "name", None) if per_agent else None, canonical_args(parts))
+
+        def lookup(k: tuple[str | None, str]) -> str | None:
+            prompt = entries.get(k)
+            if prompt is not None:
+                entries.move_to_end(k)
+                stats.hits += 1
+            return prompt
+
+        def store(k: tuple[str | None, str], prompt: str) -> None:
+            entries[k] = prompt
+            entries.move_to_end(k)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+                stats.evicted += 1
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(ctx: RunContextWrapper[Any], agent: Any) -> str:
+                k = cache_key(ctx, agent)
+                prompt = lookup(k)
+                if prompt is not None:
+                    return prompt
+                running = in_flight.get(k)
+                if running is not None:
+                    stats.joined += 1
+                    try:
+                        return await asyncio.shield(running)
+                    except asyncio.CancelledError:
+                        if not running.cancelled():
+                            raise  # this caller was cancelled
+                        return await func(ctx, agent)  # the first caller's run was cancelled
+
+                stats.misses += 1
+                future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+                in_flight[k] = future
+                try:
+                    prompt = await func(ctx, agent)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    future.set_exception(e)
+                    future.exception()  # joined callers get it, nobody else needs to
+                    raise
+                finally:
+                    in_flight.pop(k, None)
+                future.set_result(prompt)
+                if prompt is not None:
+                    store(k, prompt)
+                return prompt
+
+            wrapper: Any = async_wrapper
+        else:
+
+            @functools.wraps(func)
+            def sync_wrapper(ctx: RunContextWrapper[Any], agent: Any) -> str:
+                k = cache_key(ctx, agent)
+                prompt = lookup(k)
+                if prompt is not None:
+                    return prompt
+                stats.misses += 1
+                prompt = func(ctx, agent)
+                if prompt is not None:
+                    store(k, prompt)
+                return prompt
+
+            wrapper = sync_wrapper
+
+        # a function (not an object with __call__): the SDK checks iscoroutinefunction() on it
+        wrapper.stats = stats
+        wrapper.cache_clear = entries.clear
+        return cast(CachedInstructions, wrapper)
+
+    return decorator
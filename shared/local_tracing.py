@@ -0,0 +1,381 @@
+"""Offline tracing: a batched trace processor that writes spans to JSONL files or SQLite.
+
+The examples either call `set_tracing_disabled(True)` or use the hosted exporter (which needs
+`OPENAI_API_KEY` and a network call per batch). `LocalTraceProcessor` keeps tracing on and
+writes every span (agent, generation, function, guardrail, handoff, ...) to local storage:
+
+    processor = LocalTraceProcessor(SqliteSpanSink(".cache/traces.sqlite"))
+    # or: LocalTraceProcessor(JsonlSpanSink(".cache/traces/spans.jsonl", max_bytes=10_000_000, backups=5))
+    set_trace_processors([processor])
+
+Ending a span only puts the span object into a bounded in-memory queue. A background thread takes
+the spans out in batches (up to `max_batch`, at most `flush_interval` seconds after the first
+one), turns them into rows (exporting, serializing and truncating the `data` payload there, not
+on the run's thread) and writes each batch in one go (one JSONL write / one SQLite transaction). Under overload
+it degrades instead of slowing the runs down:
+
+    queue above `shed_at` (fraction of max_queue) -> span kept, its `data` payload dropped
+    queue full                                    -> span dropped
+    sink error                                    -> batch dropped, processor keeps going
+
+Everything is counted in `processor.stats`. Query the spans afterwards:
+
+    python -m shared.local_tracing report .cache/traces.sqlite --slowest 10
+    python -m shared.local_tracing report .cache/traces/spans.jsonl --type function
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+from agents import Span, Trace
+from agents.tracing import TracingProcessor
+
+from .timeline_trace import describe_span
+
+
+class SpanSink(Protocol):
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        """Write a batch of spans. Called from the processor's background thread."""
+        ...
+
+    def close(self) -> None: ...
+
+
+class JsonlSpanSink:
+    """One JSON object per line. Rotates to `path.1` ... `path.<backups>` at `max_bytes`."""
+
+    def __init__(self, path: str | Path, max_bytes: int = 50_000_000, backups: int = 5) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(row, default=str) + "\n" for row in rows))
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+_COLUMNS = (
+    "span_id", "trace_id", "parent_id", "type", "label",
+    "started_at", "ended_at", "duration_ms", "error", "args", "data",
+)  # fmt: skip
+
+
+class SqliteSpanSink:
+    """A `spans` table in a local SQLite file (WAL mode, one transaction per batch)."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # only the processor's background thread writes, but it is not the thread that opened it
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS spans (span_id TEXT PRIMARY KEY, trace_id TEXT, parent_id TEXT, "
+            "type TEXT, label TEXT, started_at TEXT, ended_at TEXT, duration_ms REAL, error TEXT, "
+            "args TEXT, data TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS spans_type_duration ON spans (type, duration_ms)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS spans_trace ON spans (trace_id)")
+        self._db.commit()
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        values = [
+            tuple(json.dumps(row[c], default=str) if c in ("args", "data") else row[c] for c in _COLUMNS)
+            for row in rows
+        ]
+        with self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO spans ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                values,
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+@dataclass
+class LocalTracingStats:
+    queued: int = 0
+    written: int = 0
+    batches: int = 0
+    shed: int = 0
+    """Spans written without their `data` payload because the queue was filling up."""
+
+    dropped: int = 0
+    """Spans lost: queue full, the span could not be exported, or their batch failed to write."""
+
+    sink_errors: int = 0
+    max_depth: int = 0
+
+
+def _duration_ms(started_at: str | None, ended_at: str | None) -> float | None:
+    if started_at is None or ended_at is None:
+        return None
+    return (datetime.fromisoformat(ended_at) - datetime.fromisoformat(started_at)).total_seconds() * 1000
+
+
+class LocalTraceProcessor(TracingProcessor):
+    """Bounded queue + background batch writer for spans."""
+
+    def __init__(
+        self,
+        sink: SpanSink,
+        *,
+        max_queue: int = 8192,
+        max_batch: int = 256,
+        flush_interval: float = 1.0,
+        shed_at: float = 0.5,
+        include_data: bool = True,
+        max_data_chars: int = 2000,
+    ) -> None:
+        self.sink = sink
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.shed_depth = int(max_queue * shed_at)
+        self.include_data = include_data
+        self.max_data_chars = max_data_chars
+        self.stats = LocalTracingStats()
+        self._stats_lock = threading.Lock()  # counters change on the run threads and the writer
+        # (span, keep its data payload)
+        self._queue: queue.Queue[tuple[Span[Any], bool]] = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="local-trace-writer", daemon=True)
+                    self._worker.start()
+
+    # --- TracingProcessor ---------------------------------------------------------------------
+
+    def on_trace_start(self, trace: Trace) -> None:
+        pass
+
+    def on_trace_end(self, trace: Trace) -> None:
+        pass
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        pass
+
+    def _count(self, **amounts: int) -> None:
+        with self._stats_lock:
+            for name, amount in amounts.items():
+                setattr(self.stats, name, getattr(self.stats, name) + amount)
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        if self._stop.is_set():
+            self._count(dropped=1)
+            return
+        depth = self._queue.qsize()
+        keep_data = self.include_data
+        if keep_data and depth >= self.shed_depth:
+            keep_data = False
+            self._count(shed=1)
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((span, keep_data))
+        except queue.Full:
+            self._count(dropped=1)  # never block the run for tracing
+            return
+        with self._stats_lock:
+            self.stats.queued += 1
+            self.stats.max_depth = max(self.stats.max_depth, depth + 1)
+
+    def _row(self, span: Span[Any], keep_data: bool) -> dict[str, Any]:
+        """The stored row of a span (runs on the writer thread)."""
+        label, args = describe_span(span)
+        return {
+            "span_id": span.span_id,
+            "trace_id": span.trace_id,
+            "parent_id": span.parent_id,
+            "type": span.span_data.type,
+            "label": label,
+            "started_at": span.started_at,
+            "ended_at": span.ended_at,
+            "duration_ms": _duration_ms(span.started_at, span.ended_at),
+            "error": span.error.get("message") if span.error else None,
+            "args": args,
+            "data": self._data(span) if keep_data else None,
+        }
+
+    def _data(self, span: Span[Any]) -> Any:
+        data = span.span_data.export()
+        text = json.dumps(data, default=str)
+        if len(text) > self.max_data_chars:
+            return {"truncated": text[: self.max_data_chars]}
+        return data
+
+    def force_flush(self) -> None:
+        """Wait until every queued span was written."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def shutdown(self) -> None:
+        """Flush, stop the writer thread and close the sink (the SDK calls this at exit)."""
+        if self._stop.is_set():
+            return
+        self.force_flush()
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+        self.sink.close()
+
+    # --- background thread --------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            # linger: collect spans for up to flush_interval, so light traffic is still batched
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: list[tuple[Span[Any], bool]]) -> None:
+        try:
+            rows = []
+            for span, keep_data in batch:
+                try:
+                    rows.append(self._row(span, keep_data))
+                except Exception:
+                    self._count(dropped=1)  # a span whose data can't be exported is skipped
+            if not rows:
+                return
+            try:
+                self.sink.write(rows)
+            except Exception:
+                # a full disk or a locked database must not take the runs down
+                self._count(sink_errors=1, dropped=len(rows))
+            else:
+                self._count(written=len(rows), batches=1)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+# --- reading and reporting --------------------------------------------------------------------
+
+
+def load_spans(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Spans from a SQLite file, or from a JSONL file and its rotated backups."""
+    path = Path(path)
+    if path.suffix in (".sqlite", ".db", ".sqlite3"):
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        db.row_factory = sqlite3.Row
+        try:
+            for row in db.execute(f"SELECT {', '.join(_COLUMNS)} FROM spans"):
+                yield dict(row)
+        finally:
+            db.close()
+        return
+    files = sorted(path.parent.glob(f"{path.name}.*"), key=lambda p: -int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0)
+    for file in [*files, path]:
+        if not file.exists():
+            continue
+        with file.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def report(
+    spans: Iterator[dict[str, Any]], *, slowest: int = 10, span_type: str | None = None, trace_id: str | None = None
+) -> str:
+    """Percentiles per span type and the slowest spans, as a text table."""
+    by_type: dict[str, list[float]] = defaultdict(list)
+    kept: list[dict[str, Any]] = []
+    for span in spans:
+        if span_type and span["type"] != span_type:
+            continue
+        if trace_id and span["trace_id"] != trace_id:
+            continue
+        if span.get("duration_ms") is None:
+            continue
+        by_type[span["type"]].append(span["duration_ms"])
+        kept.append(span)
+
+    lines = [f"{'type':<12}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for kind, durations in sorted(by_type.items()):
+        durations.sort()
+        p50, p90, p99 = (percentile(durations, p) for p in (50, 90, 99))
+        lines.append(f"{kind:<12}{len(durations):>8}{p50:>10.1f}{p90:>10.1f}{p99:>10.1f}{durations[-1]:>10.1f}")
+
+    lines.append("")
+    lines.append(f"slowest {slowest}:")
+    for span in sorted(kept, key=lambda s: -s["duration_ms"])[:slowest]:
+        error = f"  error: {span['error']}" if span.get("error") else ""
+        lines.append(f"{span['duration_ms']:>10.1f} ms  {span['label']:<40} {span['trace_id']}{error}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query spans written by LocalTraceProcessor.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("report", help="percentiles per span type + slowest spans")
+    rep.add_argument("path", help="a .sqlite file or a .jsonl file (rotated backups are read too)")
+    rep.add_argument("--slowest", type=int, default=10)
+    rep.add_argument("--type", dest="span_type", help="only this span type, e.g. function or generation")
+    rep.add_argument("--trace", dest="trace_id", help="only this trace id")
+    args = parser.parse_args()
+
+    if not Path(args.path).exists():
+        parser.error(f"{args.path} does not exist")
+    print(report(load_spans(args.path), slowest=args.slowest, span_type=args.span_type, trace_id=args.trace_id))
+
+
+if __name__ == "__main__":
+    main()
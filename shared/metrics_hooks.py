@@ -0,0 +1,298 @@
+"""Production metrics as RunHooks, exported in the Prometheus text format.
+
+`MyRunHooks` (hooks/02_runhook/runhook.py) prints on every event. `MetricsHooks` records instead:
+
+    agents_agent_seconds       histogram  {agent}          agent active: on_agent_start -> on_agent_end / handoff
+    agents_llm_seconds         histogram  {agent}          on_llm_start -> on_llm_end
+    agents_tool_seconds        histogram  {agent, tool}    on_tool_start -> on_tool_end
+    agents_handoff_seconds     histogram  {from, to}       on_handoff -> next agent started
+    agents_tokens_total        counter    {agent, kind}    input / output / total tokens (usage of each LLM call)
+    agents_llm_calls_total     counter    {agent}
+    agents_tool_calls_total    counter    {agent, tool}
+    agents_handoffs_total      counter    {from, to}
+
+Recording an event is a dict lookup on a tuple of existing strings, a bisect and an integer add:
+nothing is formatted until the metrics are exported.
+
+    metrics = MetricsHooks()
+    await Runner.run(agent, "...", hooks=metrics)
+
+    metrics.write_textfile(".cache/agents.prom")   # node_exporter textfile collector
+    metrics.serve(port=9464)                       # or scrape http://127.0.0.1:9464/metrics
+
+Note: openai-agents 0.2.11 (the version this repo pins) calls `on_llm_start` / `on_llm_end` on
+run hooks, so `hooks=metrics` records the LLM metrics. Older versions only call them on *agent*
+hooks: there, add `metrics.agent_hooks()` to your agents (`Agent(..., hooks=metrics.agent_hooks())`).
+Both can be used together, each LLM call is only counted once.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from agents import (
+    Agent,
+    AgentHooks,
+    ModelResponse,
+    RunContextWrapper,
+    RunHooks,
+    Tool,
+    TResponseInputItem,
+)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple[str, ...], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Series:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size  # per bucket (not cumulative), last one is +Inf
+        self.sum = 0.0
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help: str, label_names: tuple[str, ...], buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series: dict[Labels, _Series] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = _Series(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+
+    def render(self, out: list[str]) -> None:
+        out.append(f"# HELP {self.name} {self.help}")
+        out.append(f"# TYPE {self.name} histogram")
+        for labels, series in list(self.series.items()):
+            counts, total = list(series.counts), series.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                out.append(f"{self.name}_bucket{_label_text(self.label_names, labels, le)} {cumulative}")
+            out.append(f"{self.name}_sum{_label_text(self.label_names, labels)} {total}")
+            out.append(f"{self.name}_count{_label_text(self.label_names, labels)} {cumulative}")
+
+
+class Counter:
+    def __init__(self, name: str, help: str, label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self, out: list[str]) -> None:
+        out.append(f"# HELP {self.name} {self.help}")
+        out.append(f"# TYPE {self.name} counter")
+        for labels, value in list(self.values.items()):
+            out.append(f"{self.name}{_label_text(self.label_names, labels)} {value}")
+
+
+class MetricsHooks(RunHooks[Any]):
+    """RunHooks that record latency histograms and token / call counters."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = "agents") -> None:
+        self.agent_seconds = Histogram(
+            f"{prefix}_agent_seconds", "Time an agent was the active agent.", ("agent",), buckets
+        )
+        self.llm_seconds = Histogram(f"{prefix}_llm_seconds", "LLM call latency.", ("agent",), buckets)
+        self.tool_seconds = Histogram(f"{prefix}_tool_seconds", "Tool call latency.", ("agent", "tool"), buckets)
+        self.handoff_seconds = Histogram(
+            f"{prefix}_handoff_seconds", "Time from a handoff until the next agent started.", ("from", "to"), buckets
+        )
+        self.tokens = Counter(f"{prefix}_tokens_total", "Tokens used by LLM calls.", ("agent", "kind"))
+        self.llm_calls = Counter(f"{prefix}_llm_calls_total", "LLM calls.", ("agent",))
+        self.tool_calls = Counter(f"{prefix}_tool_calls_total", "Tool calls.", ("agent", "tool"))
+        self.handoffs = Counter(f"{prefix}_handoffs_total", "Handoffs between agents.", ("from", "to"))
+        self._metrics = [
+            self.agent_seconds, self.llm_seconds, self.tool_seconds, self.handoff_seconds,
+            self.tokens, self.llm_calls, self.tool_calls, self.handoffs,
+        ]  # fmt: skip
+
+        # open intervals, keyed by the run's context wrapper (one LLM call / active agent per run);
+        # tool calls by the run's usage object, then by tool_call_id
+        self._agent_start: dict[int, tuple[str, float]] = {}
+        self._llm_start: dict[int, float] = {}
+        self._tool_start: dict[int, dict[str, float]] = {}
+        self._handoff_start: dict[int, tuple[str, str, float]] = {}
+        self._watched: set[int] = set()
+        self._server: ThreadingHTTPServer | None = None
+
+    def _watch(self, owner: Any) -> int:
+        """id(owner), with its open intervals dropped when it is garbage collected (aborted runs)."""
+        key = id(owner)
+        if key not in self._watched:
+            self._watched.add(key)
+            weakref.finalize(owner, self._forget, key)
+        return key
+
+    def _forget(self, key: int) -> None:
+        self._watched.discard(key)
+        self._agent_start.pop(key, None)
+        self._llm_start.pop(key, None)
+        self._tool_start.pop(key, None)
+        self._handoff_start.pop(key, None)
+
+    # --- events -----------------------------------------------------------------------------
+
+    async def on_agent_start(self, context: RunContextWrapper[Any], agent: Agent[Any]) -> None:
+        now = time.perf_counter()
+        key = self._watch(context)
+        handoff = self._handoff_start.pop(key, None)
+        if handoff is not None:
+            self.handoff_seconds.observe((handoff[0], handoff[1]), now - handoff[2])
+        self._agent_start[key] = (agent.name, now)
+
+    async def on_agent_end(self, context: RunContextWrapper[Any], agent: Agent[Any], output: Any) -> None:
+        # the run is over: also drop what its failed / cancelled calls left open
+        self._end_agent(id(context), time.perf_counter())
+        self._llm_start.pop(id(context), None)
+        self._handoff_start.pop(id(context), None)
+        self._tool_start.pop(id(context.usage), None)
+
+    def _end_agent(self, key: int, now: float) -> None:
+        started = self._agent_start.pop(key, None)
+        if started is not None:
+            self.agent_seconds.observe((started[0],), now - started[1])
+
+    async def on_llm_start(
+        self,
+        context: RunContextWrapper[Any],
+        agent: Agent[Any],
+        system_prompt: str | None,
+        input_items: list[TResponseInputItem],
+    ) -> None:
+        # setdefault: when both run hooks and agent hooks report the call, the first one wins
+        self._llm_start.setdefault(self._watch(context), time.perf_counter())
+
+    async def on_llm_end(self, context: RunContextWrapper[Any], agent: Agent[Any], response: ModelResponse) -> None:
+        started = self._llm_start.pop(id(context), None)
+        if started is None:
+            return
+        labels = (agent.name,)
+        self.llm_seconds.observe(labels, time.perf_counter() - started)
+        self.llm_calls.inc(labels)
+        usage = response.usage
+        self.tokens.inc((agent.name, "input"), usage.input_tokens)
+        self.tokens.inc((agent.name, "output"), usage.output_tokens)
+        self.tokens.inc((agent.name, "total"), usage.total_tokens)
+
+    async def on_tool_start(self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool) -> None:
+        # function tools get a ToolContext per call (with its tool_call_id); all of them share
+        # the run's usage object
+        run = self._watch(context.usage)
+        self._tool_start.setdefault(run, {})[_call_id(context, tool)] = time.perf_counter()
+
+    async def on_tool_end(self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool, result: Any) -> None:
+        started = self._tool_start.get(id(context.usage), {}).pop(_call_id(context, tool), None)
+        if started is None:
+            return
+        labels = (agent.name, tool.name)
+        self.tool_seconds.observe(labels, time.perf_counter() - started)
+        self.tool_calls.inc(labels)
+
+    async def on_handoff(
+        self, context: RunContextWrapper[Any], from_agent: Agent[Any], to_agent: Agent[Any]
+    ) -> None:
+        now = time.perf_counter()
+        key = id(context)
+        self._end_agent(key, now)
+        self.handoffs.inc((from_agent.name, to_agent.name))
+        self._handoff_start[key] = (from_agent.name, to_agent.name, now)
+
+    def agent_hooks(self) -> AgentHooks[Any]:
+        """AgentHooks that feed the LLM metrics, for SDK versions that only call LLM hooks on agents."""
+        return _AgentLLMHooks(self)
+
+    # --- export -----------------------------------------------------------------------------
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        out: list[str] = []
+        for metric in self._metrics:
+            metric.render(out)
+        return "\n".join(out) + "\n"
+
+    def write_textfile(self, path: str | Path) -> None:
+        """Write the metrics atomically (for the node_exporter textfile collector)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+        tmp.write_text(self.render())
+        tmp.replace(path)
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve `GET /metrics` from a background thread. Returns the server (`.shutdown()` to stop)."""
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+
+def _call_id(context: RunContextWrapper[Any], tool: Tool) -> str:
+    # computer tools get the run's context wrapper, without a tool_call_id
+    return getattr(context, "tool_call_id", None) or tool.name
+
+
+class _AgentLLMHooks(AgentHooks[Any]):
+    def __init__(self, metrics: MetricsHooks) -> None:
+        self.metrics = metrics
+
+    async def on_llm_start(
+        self,
+        context: RunContextWrapper[Any],
+        agent: Agent[Any],
+        system_prompt: str | None,
+        input_items: list[TResponseInputItem],
+    ) -> None:
+        await self.metrics.on_llm_start(context, agent, system_prompt, input_items)
+
+    async def on_llm_end(self, context: RunContextWrapper[Any], agent: Agent[Any], response: ModelResponse) -> None:
+        await self.metrics.on_llm_end(context, agent, response)
@@ -0,0 +1,350 @@
+"""Offline stand-in for the Chat Completions endpoint.
+
+Speaks enough of the wire format for every example in this repo: plain text, streaming (SSE),
+tool calls and JSON structured output (`response_format`). Nothing is sent to Gemini, so runs
+measure only SDK + orchestration overhead plus whatever latency you configure here.
+
+Start it:
+    uv run python -m shared.mock_llm_server --port 8765 --latency 0.2 --tokens-per-sec 80
+
+Point any example at it (see shared/model_client.py):
+    LLM_BASE_URL=http://127.0.0.1:8765/v1 GEMINI_API_KEY=mock uv run python -m hooks.02_runhook.runhook
+
+How the fake model answers:
+    - tools present and tool_choice is not "none" and the last message is from the user
+      -> one tool call (the forced tool, else the first tool), arguments built from its schema
+    - response_format is a json_schema -> a JSON object built from that schema;
+      booleans named `is_<topic>` are true when the first 4 letters of <topic> appear in the
+      user text, so "how to hack wifi" trips `is_hacking`; an array of objects with an `index`
+      field gets one item per numbered `[i] ...` line of the user text (batched classification)
+    - otherwise -> `--reply-tokens` words of text
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+@dataclass
+class MockSettings:
+    latency: float = 0.0
+    """Seconds before the first token (time to first token)."""
+
+    tokens_per_sec: float = 0.0
+    """Generation speed. 0 means all tokens are sent at once."""
+
+    reply_tokens: int = 50
+    """Number of words in a plain text reply."""
+
+    fail_rate: float = 0.0
+    """Probability (0-1) that a request fails with `fail_status`."""
+
+    fail_status: int = 500
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    streamed: int = 0
+    tool_calls: int = 0
+    structured: int = 0
+    failures: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def bump(self, **counts: int) -> None:
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def to_dict(self) -> dict[str, int]:
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+
+
+_NUMBERED_LINE = re.compile(r"^\[(\d+)\] (.*)$", re.MULTILINE)
+
+
+def _text_of(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def _user_text(messages: list[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return _text_of(message.get("content"))
+    return ""
+
+
+def _count_tokens(messages: list[dict[str, Any]]) -> int:
+    return sum(len(_text_of(m.get("content")).split()) for m in messages)
+
+
+def _numbered_lines(user_text: str) -> list[tuple[int, str]]:
+    return [(int(m.group(1)), m.group(2)) for m in _NUMBERED_LINE.finditer(user_text)]
+
+
+def _value_for_schema(schema: dict[str, Any], name: str, user_text: str, defs: dict[str, Any]) -> Any:
+    if "$ref" in schema:
+        schema = defs.get(schema["$ref"].rsplit("/", 1)[-1], {})
+    if "anyOf" in schema:
+        schema = next((s for s in schema["anyOf"] if s.get("type") != "null"), schema["anyOf"][0])
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    kind = schema.get("type", "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "string")
+
+    if kind == "object":
+        props = schema.get("properties", {})
+        return {key: _value_for_schema(sub, key, user_text, defs) for key, sub in props.items()}
+    if kind == "array":
+        items = schema.get("items", {})
+        item_props = defs.get(items["$ref"].rsplit("/", 1)[-1], {}) if "$ref" in items else items
+        numbered = _numbered_lines(user_text)
+        if numbered and "index" in item_props.get("properties", {}):
+            return [
+                {**_value_for_schema(items, name, text, defs), "index": index} for index, text in numbered
+            ]
+        return [_value_for_schema(schema.get("items", {}), name, user_text, defs)]
+    if kind == "boolean":
+        topic = name.removeprefix("is_")[:4].lower()
+        return bool(topic) and topic in user_text.lower()
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    return user_text or f"mock {name}"
+
+
+def _build_reply(body: dict[str, Any], settings: MockSettings) -> dict[str, Any]:
+    """Decide what the fake model says. Returns {"content": str|None, "tool_call": dict|None}."""
+    messages = body.get("messages", [])
+    user_text = _user_text(messages)
+    tools = body.get("tools") or []
+    tool_choice = body.get("tool_choice", "auto")
+    last_role = messages[-1].get("role") if messages else None
+
+    if tools and tool_choice != "none" and last_role == "user":
+        tool = tools[0]
+        if isinstance(tool_choice, dict):
+            forced = tool_choice.get("function", {}).get("name")
+            tool = next((t for t in tools if t["function"]["name"] == forced), tool)
+        params = tool["function"].get("parameters") or {}
+        args = _value_for_schema(params, "", user_text, params.get("$defs", {}))
+        return {
+            "content": None,
+            "tool_call": {
+                "id": f"call_{uuid.uuid4().hex[:24]}",
+                "type": "function",
+                "function": {"name": tool["function"]["name"], "arguments": json.dumps(args or {})},
+            },
+        }
+
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        schema = response_format["json_schema"].get("schema", {})
+        value = _value_for_schema(schema, "", user_text, schema.get("$defs", {}))
+        return {"content": json.dumps(value), "tool_call": None, "structured": True}
+
+    words = f"Mock answer to: {user_text}".split()
+    words += ["lorem"] * max(settings.reply_tokens - len(words), 0)
+    return {"content": " ".join(words[: max(settings.reply_tokens, 1)]), "tool_call": None}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client connection pooling can be measured
+    server: _MockServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, payload: dict[str, Any] | str) -> None:
+        line = payload if isinstance(payload, str) else json.dumps(payload)
+        data = f"data: {line}\n\n".encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send_json(200, self.server.stats.to_dict())
+        elif self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        settings, stats = self.server.settings, self.server.stats
+        stats.bump(requests=1)
+        if settings.fail_rate and random.random() < settings.fail_rate:
+            stats.bump(failures=1)
+            self._send_json(
+                settings.fail_status,
+                {"error": {"message": "injected failure", "type": "mock_error"}},
+            )
+            return
+
+        reply = _build_reply(body, settings)
+        stats.bump(tool_calls=int(reply["tool_call"] is not None), structured=int(bool(reply.get("structured"))))
+        if settings.latency:
+            time.sleep(settings.latency)
+
+        if body.get("stream"):
+            stats.bump(streamed=1)
+            self._stream(body, reply, settings)
+        else:
+            self._complete(body, reply, settings)
+
+    def _usage(self, body: dict[str, Any], completion_tokens: int) -> dict[str, int]:
+        prompt_tokens = _count_tokens(body.get("messages", []))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def _complete(self, body: dict[str, Any], reply: dict[str, Any], settings: MockSettings) -> None:
+        content, tool_call = reply["content"], reply["tool_call"]
+        tokens = len(content.split()) if content else 1
+        if settings.tokens_per_sec:
+            time.sleep(tokens / settings.tokens_per_sec)
+
+        message: dict[str, Any] = {"role": "assistant", "content": content}
+        if tool_call:
+            message["tool_calls"] = [tool_call]
+        self._send_json(
+            200,
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": "tool_calls" if tool_call else "stop",
+                    }
+                ],
+                "usage": self._usage(body, tokens),
+            },
+        )
+
+    def _stream(self, body: dict[str, Any], reply: dict[str, Any], settings: MockSettings) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+        }
+
+        def chunk(delta: dict[str, Any], finish_reason: str | None = None) -> dict[str, Any]:
+            return base | {"choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+        delay = 1 / settings.tokens_per_sec if settings.tokens_per_sec else 0
+        content, tool_call = reply["content"], reply["tool_call"]
+        tokens = 0
+        self._send_chunk(chunk({"role": "assistant", "content": ""}))
+
+        if tool_call:
+            tokens = 1
+            self._send_chunk(chunk({"tool_calls": [{"index": 0, **tool_call}]}))
+        else:
+            words = content.split(" ")
+            for i, word in enumerate(words):
+                if delay:
+                    time.sleep(delay)
+                self._send_chunk(chunk({"content": word if i == 0 else " " + word}))
+            tokens = len(words)
+
+        self._send_chunk(chunk({}, "tool_calls" if tool_call else "stop"))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            self._send_chunk(base | {"choices": [], "usage": self._usage(body, tokens)})
+        self._send_chunk("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class _MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], settings: MockSettings) -> None:
+        super().__init__(address, _Handler)
+        self.settings = settings
+        self.stats = MockStats()
+
+
+def start_mock_server(
+    settings: MockSettings | None = None, host: str = "127.0.0.1", port: int = 0
+) -> tuple[str, _MockServer]:
+    """Start the server on a background thread. Returns (base_url, server); `port=0` picks a free port.
+
+    Call `server.shutdown()` when done.
+    """
+    server = _MockServer((host, port), settings or MockSettings())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://{host}:{server.server_address[1]}/v1/", server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline mock Chat Completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="0 = no pacing")
+    parser.add_argument("--reply-tokens", type=int, default=50)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="0-1 chance of an injected error")
+    parser.add_argument("--fail-status", type=int, default=500)
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        reply_tokens=args.reply_tokens,
+        fail_rate=args.fail_rate,
+        fail_status=args.fail_status,
+    )
+    server = _MockServer((args.host, args.port), settings)
+    print(f"mock Chat Completions server on http://{args.host}:{args.port}/v1  (stats: GET /v1/stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Process-wide pooled model clients.
+
+Every example used to build its own `AsyncOpenAI` inside `OpenAIChatCompletionsModel(...)`,
+so each agent (and each guardrail agent) opened its own connection pool and paid a cold
+TLS handshake. `get_model()` hands out one shared client per base_url, so the guardrail
+agent and the main agent reuse the same warm keep-alive connections.
+
+Settings (all optional, read from the environment):
+    GEMINI_API_KEY          api key sent to the endpoint
+    LLM_BASE_URL            endpoint base url (defaults to the Gemini OpenAI-compatible url)
+    LLM_MAX_CONNECTIONS     max open connections per client (default 100)
+    LLM_MAX_KEEPALIVE       max idle keep-alive connections per client (default 20)
+    LLM_KEEPALIVE_EXPIRY    seconds an idle connection is kept open (default 30)
+    LLM_HTTP2               "1" to enable HTTP/2 (needs the `h2` package)
+    LLM_RESPONSE_CACHE      "memory" or a SQLite file path to wrap every model in a
+                            `CachedModel` (see shared/response_cache.py)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+
+import httpx
+from agents import AsyncOpenAI, Model, OpenAIChatCompletionsModel
+from openai import DefaultAsyncHttpxClient
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+
+@dataclass
+class PoolStats:
+    client_hits: int = 0
+    client_misses: int = 0
+    model_hits: int = 0
+    model_misses: int = 0
+
+    @property
+    def client_hit_rate(self) -> float:
+        total = self.client_hits + self.client_misses
+        return self.client_hits / total if total else 0.0
+
+    @property
+    def model_hit_rate(self) -> float:
+        total = self.model_hits + self.model_misses
+        return self.model_hits / total if total else 0.0
+
+
+_lock = threading.Lock()
+_clients: dict[tuple[str, str | None], AsyncOpenAI] = {}
+_models: dict[tuple[str, str | None, str], Model] = {}
+_stats = PoolStats()
+
+
+def _http2_enabled() -> bool:
+    if os.environ.get("LLM_HTTP2", "0") != "1":
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        # httpx raises at client creation without h2, fall back to HTTP/1.1 keep-alive
+        return False
+    return True
+
+
+def _normalize_base_url(base_url: str | None) -> str:
+    base_url = base_url or os.environ.get("LLM_BASE_URL") or GEMINI_BASE_URL
+    # "…/openai" and "…/openai/" are the same endpoint, don't open two pools for them
+    return base_url.rstrip("/") + "/"
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=int(os.environ.get("LLM_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.environ.get("LLM_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.environ.get("LLM_KEEPALIVE_EXPIRY", "30")),
+    )
+    return DefaultAsyncHttpxClient(limits=limits, http2=_http2_enabled())
+
+
+def get_client(base_url: str | None = None, api_key: str | None = None) -> AsyncOpenAI:
+    """Return the shared `AsyncOpenAI` client for `base_url`, creating it on first use."""
+    base_url = _normalize_base_url(base_url)
+    api_key = api_key or os.environ.get("GEMINI_API_KEY")
+    key = (base_url, api_key)
+
+    with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            _stats.client_hits += 1
+            return client
+
+        _stats.client_misses += 1
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=_build_http_client(),
+        )
+        _clients[key] = client
+        return client
+
+
+def get_model(
+    model: str = "gemini-2.0-flash",
+    base_url: str | None = None,
+    api_key: str | None = None,
+) -> Model:
+    """Return a shared `OpenAIChatCompletionsModel` for (base_url, api_key, model) on a pooled client.
+
+    When LLM_RESPONSE_CACHE is set the model comes wrapped in a `CachedModel`.
+    """
+    normalized = _normalize_base_url(base_url)
+    api_key = api_key or os.environ.get("GEMINI_API_KEY")
+    # same key as the client's: another api_key must get a model on that key's client
+    key = (normalized, api_key, model)
+
+    with _lock:
+        cached = _models.get(key)
+        if cached is not None:
+            _stats.model_hits += 1
+            return cached
+
+    client = get_client(normalized, api_key)
+    with _lock:
+        # another thread may have built it while we were fetching the client
+        cached = _models.get(key)
+        if cached is not None:
+            _stats.model_hits += 1
+            return cached
+
+        _stats.model_misses += 1
+        cached = _maybe_cached(OpenAIChatCompletionsModel(model=model, openai_client=client))
+        _models[key] = cached
+        return cached
+
+
+def _maybe_cached(model: Model) -> Model:
+    cache = os.environ.get("LLM_RESPONSE_CACHE")
+    if not cache:
+        return model
+
+    from .response_cache import CachedModel
+
+    return CachedModel(model, db_path=None if cache == "memory" else cache)
+
+
+def pool_stats() -> PoolStats:
+    """A snapshot of the client/model reuse counters."""
+    with _lock:
+        return PoolStats(**vars(_stats))
+
+
+async def close_clients() -> None:
+    """Close every pooled client. Call once at shutdown, inside the running event loop."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _models.clear()
+    for client in clients:
+        await client.close()
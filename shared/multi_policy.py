@@ -0,0 +1,205 @@
+"""Check many guardrail policies with ONE model call.
+
+`global_input_guardrail.py` asks one agent "is this hacking?" and another "is this biology?" -
+two LLM calls on the same text. `MultiPolicyGuardrail` merges every registered policy into one
+structured output (one field per policy) and one call, then splits the answer back into one
+`GuardrailFunctionOutput` per policy, each with its own tripwire.
+
+    policies = MultiPolicyGuardrail(model=model)
+    policies.add("hacking", HackingOutput, "Check if the user is asking you to do hacking.")
+    policies.add("biology", BiologyOutput, "Check if the input is related to biology.")
+
+    config = RunConfig(input_guardrails=[policies.input_guardrail("hacking")])
+    agent = Agent(..., input_guardrails=[policies.input_guardrail("biology")])
+
+Both guardrails above share a single model call: checks of the same text that run at the same
+time wait for one request. `policies.input_guardrail()` (no name) checks every policy at once,
+and `policies.output_guardrail(...)` does the same for agent outputs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrail,
+    Model,
+    OutputGuardrail,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+)
+from pydantic import BaseModel, Field, create_model
+
+from .prefilter import input_text
+
+_INSTRUCTIONS = """You are a content checker. Check the text against EVERY policy below, each one
+on its own, and fill in the field with the policy's name.
+
+{policies}"""
+
+
+@dataclass(frozen=True)
+class Policy:
+    name: str
+    """Field name in the merged output, e.g. "hacking"."""
+
+    output_type: type[BaseModel]
+    instructions: str
+    tripwire: Callable[[Any], bool]
+
+
+@dataclass
+class MultiPolicyResult:
+    outputs: dict[str, GuardrailFunctionOutput] = field(default_factory=dict)
+    """One output per policy, with the policy's own tripwire."""
+
+    @property
+    def tripped(self) -> list[str]:
+        return [name for name, output in self.outputs.items() if output.tripwire_triggered]
+
+
+@dataclass
+class MultiPolicyStats:
+    calls: int = 0
+    """Model calls made."""
+
+    checks: int = 0
+    """Guardrail checks answered (one per guardrail run)."""
+
+    policies_checked: int = 0
+    """Sum of the policies answered by each call."""
+
+    @property
+    def calls_saved(self) -> int:
+        return self.policies_checked - self.calls
+
+
+def _bool_field(output_type: type[BaseModel]) -> Callable[[Any], bool]:
+    names = [
+        name
+        for name, info in output_type.model_fields.items()
+        if name.startswith("is_") and info.annotation is bool
+    ]
+    if len(names) != 1:
+        raise ValueError(
+            f"{output_type.__name__} needs exactly one `is_...: bool` field, or pass tripwire="
+        )
+    return lambda output: getattr(output, names[0])
+
+
+class MultiPolicyGuardrail:
+    """A registry of policies that are all answered by one structured-output call."""
+
+    def __init__(
+        self,
+        *,
+        model: str | Model | None = None,
+        run_config: RunConfig | None = None,
+        name: str = "multi_policy_guardrail",
+    ) -> None:
+        self.model = model
+        self.run_config = run_config
+        self.name = name
+        self.policies: dict[str, Policy] = {}
+        self.stats = MultiPolicyStats()
+        self._agent: Agent[Any] | None = None
+        self._in_flight: dict[str, asyncio.Task[MultiPolicyResult]] = {}
+
+    def add(
+        self,
+        name: str,
+        output_type: type[BaseModel],
+        instructions: str,
+        tripwire: str | Callable[[Any], bool] | None = None,
+    ) -> Policy:
+        """Register a policy. `tripwire` is a bool field name or a function of the policy output
+        (default: the output type's only `is_...` bool field)."""
+        if not name.isidentifier():
+            raise ValueError(f"policy name must be a valid identifier, got {name!r}")
+        if isinstance(tripwire, str):
+            field_name = tripwire
+            tripwire = lambda output: getattr(output, field_name)  # noqa: E731
+        policy = Policy(name, output_type, instructions, tripwire or _bool_field(output_type))
+        self.policies[name] = policy
+        self._agent = None  # the merged schema changed
+        return policy
+
+    def _merged_agent(self) -> Agent[Any]:
+        if self._agent is None:
+            if not self.policies:
+                raise ValueError("MultiPolicyGuardrail has no policies, call add() first")
+            fields: dict[str, Any] = {
+                p.name: (p.output_type, Field(description=p.instructions)) for p in self.policies.values()
+            }
+            listing = "\n".join(f"- {p.name}: {p.instructions}" for p in self.policies.values())
+            self._agent = Agent(
+                name=self.name,
+                instructions=_INSTRUCTIONS.format(policies=listing),
+                output_type=create_model("MultiPolicyOutput", **fields),
+                model=self.model,
+            )
+        return self._agent
+
+    async def _call(self, text: str) -> MultiPolicyResult:
+        self.stats.calls += 1
+        self.stats.policies_checked += len(self.policies)
+        result = await Runner.run(self._merged_agent(), text, run_config=self.run_config)
+        merged = result.final_output
+        checked = MultiPolicyResult()
+        for policy in self.policies.values():
+            output = getattr(merged, policy.name)
+            checked.outputs[policy.name] = GuardrailFunctionOutput(
+                output_info=output, tripwire_triggered=bool(policy.tripwire(output))
+            )
+        return checked
+
+    async def check(self, text: str) -> MultiPolicyResult:
+        """All policies for `text`. Concurrent checks of the same text share one model call."""
+        self.stats.checks += 1
+        key = hashlib.sha256(text.encode()).hexdigest()
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._call(text))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # shield: one guardrail being cancelled (another one tripped) must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _output_for(self, checked: MultiPolicyResult, policy: str | None) -> GuardrailFunctionOutput:
+        if policy is not None:
+            return checked.outputs[policy]
+        return GuardrailFunctionOutput(output_info=checked, tripwire_triggered=bool(checked.tripped))
+
+    def _check_name(self, policy: str | None) -> str:
+        if policy is not None and policy not in self.policies:
+            raise KeyError(f"unknown policy {policy!r}, registered: {list(self.policies)}")
+        return f"{policy}_guardrail" if policy else self.name
+
+    def input_guardrail(self, policy: str | None = None) -> InputGuardrail[Any]:
+        """An input guardrail for one policy, or for all of them (`output_info` is a `MultiPolicyResult`)."""
+        name = self._check_name(policy)
+
+        async def _guardrail(
+            ctx: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+        ) -> GuardrailFunctionOutput:
+            return self._output_for(await self.check(input_text(input)), policy)
+
+        return InputGuardrail(guardrail_function=_guardrail, name=name)
+
+    def output_guardrail(self, policy: str | None = None) -> OutputGuardrail[Any]:
+        """Same as `input_guardrail()`, checking the agent's final output."""
+        name = self._check_name(policy)
+
+        async def _guardrail(ctx: RunContextWrapper[Any], agent: Agent[Any], output: Any) -> GuardrailFunctionOutput:
+            text = output.model_dump_json() if isinstance(output, BaseModel) else str(output)
+            return self._output_for(await self.check(text), policy)
+
+        return OutputGuardrail(guardrail_function=_guardrail, name=name)
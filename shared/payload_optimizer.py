@@ -0,0 +1,175 @@
+"""Leave tool definitions out of the request when `tool_choice` makes them unusable.
+
+`agent_none` in model_settings/04_tool_choice.py uses `tool_choice="none"`, and the notes there
+say it: the tool schema is still sent to the LLM. We pay input tokens (and latency) for tools the
+model is not allowed to call. `PayloadOptimizingModel` wraps any model (like `CachedModel` in
+shared/response_cache.py) and trims each request first:
+
+    tool_choice="none"           -> no tools and no handoffs are sent (tool_choice is dropped too,
+                                    some APIs reject a tool_choice without tools)
+    tool_choice="word_count"     -> only that tool is sent (or only that handoff, if it names
+                                    a handoff tool like "transfer_to_review_agent")
+    any tool_choice              -> tools / handoffs with a duplicate name are sent once (the
+                                    runner would only ever run the last one with that name)
+
+A `tool_choice` that names nothing the agent has is left alone, so the mistake still shows.
+
+    model = PayloadOptimizingModel(get_model("gemini-2.0-flash"))
+    agent = Agent(..., model=model, model_settings=ModelSettings(tool_choice="none"))
+    print(model.stats)   # bytes and (approximate) tokens not sent
+
+The sizes are the tools' Chat Completions JSON definitions; tokens are estimated at ~4 characters
+per token.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from agents import Handoff, Model, ModelResponse, ModelSettings, ModelTracing, Tool
+from agents.agent_output import AgentOutputSchemaBase
+from agents.items import TResponseInputItem, TResponseStreamEvent
+from agents.models.chatcmpl_converter import Converter
+from openai.types.responses.response_prompt_param import ResponsePromptParam
+
+from .tool_pruning import forced_tool
+
+
+@dataclass
+class PayloadStats:
+    calls: int = 0
+    optimized_calls: int = 0
+    tools_dropped: int = 0
+    handoffs_dropped: int = 0
+    bytes_saved: int = 0
+    tokens_saved: int = 0
+    """Approximate (~4 characters per token)."""
+
+
+def _definition(item: Tool | Handoff) -> str:
+    try:
+        if isinstance(item, Handoff):
+            return json.dumps(Converter.convert_handoff_tool(item))
+        return json.dumps(Converter.tool_to_openai(item))
+    except Exception:
+        return json.dumps({"name": getattr(item, "name", "")})  # hosted tools have no Chat Completions form
+
+
+def _last_by_name(items: list[Any], name_of: Any) -> list[Any]:
+    """Drop earlier items whose name comes again later (the runner's name -> tool map keeps the last)."""
+    last = {name_of(item): i for i, item in enumerate(items)}
+    return [item for i, item in enumerate(items) if last[name_of(item)] == i]
+
+
+class PayloadOptimizingModel(Model):
+    """Model wrapper that removes tool and handoff definitions the model can't call."""
+
+    def __init__(self, model: Model, max_sizes: int = 4096) -> None:
+        self.model = model
+        self.stats = PayloadStats()
+        self.max_sizes = max_sizes
+        self._sizes: dict[int, tuple[Any, int]] = {}  # id -> (item, json size); the item keeps the id unique
+
+    def _size(self, item: Tool | Handoff) -> int:
+        entry = self._sizes.get(id(item))
+        if entry is not None and entry[0] is item:
+            return entry[1]
+        if len(self._sizes) >= self.max_sizes:
+            self._sizes.clear()
+        size = len(_definition(item).encode())
+        self._sizes[id(item)] = (item, size)
+        return size
+
+    def optimize(
+        self, model_settings: ModelSettings, tools: list[Tool], handoffs: list[Handoff]
+    ) -> tuple[ModelSettings, list[Tool], list[Handoff]]:
+        """The settings, tools and handoffs to really send."""
+        self.stats.calls += 1
+        new_settings = model_settings
+        new_tools = _last_by_name(tools, lambda t: t.name)
+        new_handoffs = _last_by_name(handoffs, lambda h: h.tool_name)
+
+        choice = model_settings.tool_choice
+        forced = forced_tool(model_settings)
+        if choice == "none":
+            new_tools, new_handoffs = [], []
+            new_settings = dataclasses.replace(model_settings, tool_choice=None)
+        elif forced is not None:
+            tool_match = [t for t in new_tools if t.name == forced]
+            handoff_match = [h for h in new_handoffs if h.tool_name == forced]
+            if tool_match or handoff_match:
+                new_tools, new_handoffs = tool_match, handoff_match
+
+        if len(new_tools) == len(tools) and len(new_handoffs) == len(handoffs):
+            return new_settings, tools, handoffs
+
+        kept = {id(x) for x in (*new_tools, *new_handoffs)}
+        dropped_tools = [t for t in tools if id(t) not in kept]
+        dropped_handoffs = [h for h in handoffs if id(h) not in kept]
+        saved = sum(self._size(x) for x in (*dropped_tools, *dropped_handoffs))
+        self.stats.optimized_calls += 1
+        self.stats.tools_dropped += len(dropped_tools)
+        self.stats.handoffs_dropped += len(dropped_handoffs)
+        self.stats.bytes_saved += saved
+        self.stats.tokens_saved += (saved + 3) // 4  # approx_tokens() in shared/streaming_guardrails.py
+        return new_settings, new_tools, new_handoffs
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None = None,
+        conversation_id: str | None = None,
+        prompt: ResponsePromptParam | None = None,
+    ) -> ModelResponse:
+        model_settings, tools, handoffs = self.optimize(model_settings, tools, handoffs)
+        return await self.model.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        )
+
+    def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None = None,
+        conversation_id: str | None = None,
+        prompt: ResponsePromptParam | None = None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        model_settings, tools, handoffs = self.optimize(model_settings, tools, handoffs)
+        return self.model.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        )
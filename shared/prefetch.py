@@ -0,0 +1,186 @@
+"""Single-flight prefetching with a shared TTL cache, for `on_start` hooks.
+
+`PreFetchHook.on_start` (hooks/01_agenthook/prefetch_data_in_hook.py) fills `UserInfo.name`
+for every run. With a real user lookup, 50 concurrent runs for the same user make 50 identical
+requests (a thundering herd). `Prefetcher` wraps the loader:
+
+    - single-flight: while a key is loading, other callers wait for that same load
+    - cache: results are kept for `ttl` seconds, at most `max_entries` (least recently used out)
+
+`prefetch_into()` starts several independent loads at the same time and writes each result
+onto the run context, so tools find it there:
+
+    user_names = Prefetcher(fetch_user_name, ttl=300)
+    user_plans = Prefetcher(fetch_user_plan, ttl=60)
+
+    class PreFetchHook(AgentHooks[UserInfo]):
+        async def on_start(self, context, agent):
+            await prefetch_into(context.context, name=(user_names, context.context.user_id),
+                                plan=(user_plans, context.context.user_id))
+
+With `wait=False` the hook returns at once and the loads finish while the model is already
+thinking; a tool that runs before a load finished can `await user_names.get(user_id)` and joins
+the load that is already running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class PrefetchStats:
+    hits: int = 0
+    loads: int = 0
+    joined: int = 0
+    """Callers that waited for a load another caller had already started."""
+
+    expired: int = 0
+    evicted: int = 0
+    errors: int = 0
+    stale: int = 0
+    """Loads that finished after an `invalidate()` of their key, so their value was not cached."""
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.loads + self.joined
+        return (self.hits + self.joined) / total if total else 0.0
+
+
+class Prefetcher(Generic[K, V]):
+    """Async loader with single-flight deduplication and a TTL + size bounded cache."""
+
+    def __init__(
+        self,
+        loader: Callable[[K], Awaitable[V]],
+        *,
+        ttl: float = 60.0,
+        max_entries: int = 1024,
+    ) -> None:
+        self.loader = loader
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = PrefetchStats()
+        self._cache: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._in_flight: dict[K, asyncio.Task[V]] = {}
+        # generations: every invalidate() bumps `_generation`; a load only caches its value when
+        # neither its key nor the whole cache was invalidated after it started
+        self._generation = 0
+        self._cleared_at = 0
+        self._invalidated_at: dict[K, int] = {}  # only for keys with a load still running
+        self._running: dict[K, int] = {}  # loads running per key (a detached one included)
+
+    def peek(self, key: K) -> V | None:
+        """The cached value, without loading (None if missing or expired)."""
+        entry = self._cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    async def get(self, key: K) -> V:
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry[0] >= time.monotonic():
+                self._cache.move_to_end(key)
+                self.stats.hits += 1
+                return entry[1]
+            del self._cache[key]
+            self.stats.expired += 1
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.stats.loads += 1
+            task = asyncio.create_task(self._load(key))
+            self._in_flight[key] = task
+        else:
+            self.stats.joined += 1
+        # shield: a cancelled caller (its run was cancelled) must not cancel the others' load
+        return await asyncio.shield(task)
+
+    async def _load(self, key: K) -> V:
+        started = self._generation
+        self._running[key] = self._running.get(key, 0) + 1
+        try:
+            value = await self.loader(key)
+            stale = self._cleared_at > started or self._invalidated_at.get(key, -1) > started
+        except Exception:
+            self.stats.errors += 1  # not cached: the next caller tries again
+            raise
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+            self._running[key] -= 1
+            if not self._running[key]:
+                del self._running[key]
+                self._invalidated_at.pop(key, None)
+        if stale:
+            self.stats.stale += 1  # invalidated while loading: the callers get it, the cache doesn't
+            return value
+        self._cache[key] = (time.monotonic() + self.ttl, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.stats.evicted += 1
+        return value
+
+    def invalidate(self, key: K | None = None) -> None:
+        """Drop one key, or everything.
+
+        A load already running is not cached when it finishes, and the next `get()` starts a
+        new load instead of joining it.
+        """
+        self._generation += 1
+        if key is None:
+            self._cache.clear()
+            self._in_flight.clear()
+            self._cleared_at = self._generation
+        else:
+            self._cache.pop(key, None)
+            self._in_flight.pop(key, None)
+            if key in self._running:
+                self._invalidated_at[key] = self._generation
+
+
+def _assign(target: Any, field: str, value: Any) -> None:
+    if isinstance(target, dict):
+        target[field] = value
+    else:
+        setattr(target, field, value)
+
+
+async def prefetch_into(
+    target: Any, *, wait: bool = True, **fields: tuple[Prefetcher[Any, Any], Any]
+) -> None:
+    """Load every `field=(prefetcher, key)` concurrently and set `target.field` to the result.
+
+    `wait=False` starts the loads and returns right away; each field is set when its load is done.
+    """
+
+    async def _one(field: str, prefetcher: Prefetcher[Any, Any], key: Any) -> None:
+        _assign(target, field, await prefetcher.get(key))
+
+    loads = [_one(field, prefetcher, key) for field, (prefetcher, key) in fields.items()]
+    if wait:
+        await asyncio.gather(*loads)
+        return
+    for load in loads:
+        task = asyncio.create_task(load)
+        _background.add(task)
+        task.add_done_callback(_finished)
+
+
+_background: set[asyncio.Task[None]] = set()  # keeps wait=False loads alive until they finish
+
+
+def _finished(task: asyncio.Task[None]) -> None:
+    _background.discard(task)
+    if not task.cancelled():
+        task.exception()  # a failed background load is retried by the next get(), don't warn
@@ -0,0 +1,228 @@
+"""Cheap local tier in front of LLM guardrails.
+
+Most traffic is obviously fine (or obviously not), and a keyword scan answers that in
+microseconds. `LocalPrefilter` scans the input once with an Aho-Corasick automaton (all keywords
+in one pass) plus a small list of regexes, and decides:
+
+    "block"    -> trip the guardrail locally, no LLM call
+    "allow"    -> pass locally, no LLM call
+    "escalate" -> not sure, run the real LLM guardrail
+
+    prefilter = LocalPrefilter(
+        block=["hack wifi", "crack password", "ddos"],
+        escalate=["hack", "exploit", "bypass", "password"],
+        no_match="allow",
+    )
+
+    @input_guardrail
+    @prefilter
+    async def hacking_guardrail(ctx, agent, input): ...   # only runs for "escalate"
+
+`output_info` becomes a `TieredVerdict` saying which tier decided (and the LLM output, if any).
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import re
+import time
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, TResponseInputItem
+
+Decision = Literal["block", "allow", "escalate"]
+
+
+class AhoCorasick:
+    """Multi-keyword matcher: finds every keyword in a text in one pass over the text."""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[str]] = [[]]
+        for keyword in keywords:
+            self._add(keyword.lower())
+        self._build()
+
+    def _add(self, keyword: str) -> None:
+        if not keyword:
+            return
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if keyword not in self._out[state]:
+            self._out[state].append(keyword)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                if state == 0:
+                    continue  # depth-1 states fall back to the root
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> list[str]:
+        """Every keyword found in `text` (case-insensitive, substring match), in order of appearance."""
+        found: list[str] = []
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.extend(out[state])
+        return found
+
+
+def input_text(input: str | list[TResponseInputItem] | Any) -> str:
+    """The user-visible text of a guardrail input (a string, or the text parts of input items)."""
+    if isinstance(input, str):
+        return input
+    parts: list[str] = []
+    for item in input if isinstance(input, list) else [input]:
+        content = item.get("content") if isinstance(item, dict) else getattr(item, "content", item)
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            for part in content:
+                text = part.get("text") if isinstance(part, dict) else getattr(part, "text", None)
+                if text:
+                    parts.append(text)
+    return "\n".join(parts)
+
+
+@dataclass
+class TieredVerdict:
+    tier: Literal["local", "llm"]
+    """Which tier made the decision."""
+
+    decision: Decision
+    """What the local tier said. "escalate" means the LLM guardrail decided."""
+
+    matched: list[str] = field(default_factory=list)
+    """Keywords / patterns the local tier matched."""
+
+    llm_output: Any = None
+    """`output_info` from the LLM guardrail, when it ran."""
+
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class PrefilterStats:
+    blocked: int = 0
+    allowed: int = 0
+    escalated: int = 0
+    local_seconds: float = 0.0
+
+    @property
+    def local_rate(self) -> float:
+        total = self.blocked + self.allowed + self.escalated
+        return (self.blocked + self.allowed) / total if total else 0.0
+
+
+class LocalPrefilter:
+    """Keyword/regex tier. Use as a decorator on an LLM guardrail function."""
+
+    def __init__(
+        self,
+        block: Iterable[str] = (),
+        escalate: Iterable[str] = (),
+        allow: Iterable[str] = (),
+        *,
+        block_patterns: Iterable[str] = (),
+        escalate_patterns: Iterable[str] = (),
+        no_match: Decision = "allow",
+    ) -> None:
+        """
+        Args:
+            block: keywords that are a clear "no" (trip locally).
+            escalate: keywords that need a closer look by the LLM guardrail.
+            allow: keywords that are a clear "yes" (pass locally) if nothing above matched.
+            block_patterns / escalate_patterns: regexes for the same two tiers.
+            no_match: decision when nothing matched. "allow" for guardrails where most traffic
+                is benign, "escalate" when only the LLM can tell.
+        """
+        self._terms: dict[str, Decision] = {}
+        # stronger decisions win when the same keyword is listed twice
+        for decision, terms in (("allow", allow), ("escalate", escalate), ("block", block)):
+            for term in terms:
+                self._terms[term.lower()] = decision  # type: ignore[assignment]
+        self._matcher = AhoCorasick(self._terms)
+        self._block_patterns = [re.compile(p, re.IGNORECASE) for p in block_patterns]
+        self._escalate_patterns = [re.compile(p, re.IGNORECASE) for p in escalate_patterns]
+        self.no_match = no_match
+        self.stats = PrefilterStats()
+
+    def classify(self, text: str) -> tuple[Decision, list[str]]:
+        found = self._matcher.find(text)
+        block = [t for t in found if self._terms[t] == "block"]
+        block += [p.pattern for p in self._block_patterns if p.search(text)]
+        if block:
+            return "block", block
+
+        escalate = [t for t in found if self._terms[t] == "escalate"]
+        escalate += [p.pattern for p in self._escalate_patterns if p.search(text)]
+        if escalate:
+            return "escalate", escalate
+
+        allow = [t for t in found if self._terms[t] == "allow"]
+        if allow:
+            return "allow", allow
+        return self.no_match, []
+
+    def __call__(self, func: Any) -> Any:
+        @functools.wraps(func)
+        async def wrapper(
+            ctx: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+        ) -> GuardrailFunctionOutput:
+            start = time.perf_counter()
+            decision, matched = self.classify(input_text(input))
+            elapsed = time.perf_counter() - start
+            self.stats.local_seconds += elapsed
+
+            if decision != "escalate":
+                if decision == "block":
+                    self.stats.blocked += 1
+                else:
+                    self.stats.allowed += 1
+                return GuardrailFunctionOutput(
+                    output_info=TieredVerdict("local", decision, matched, elapsed_ms=elapsed * 1000),
+                    tripwire_triggered=decision == "block",
+                )
+
+            self.stats.escalated += 1
+            output = func(ctx, agent, input)
+            if inspect.isawaitable(output):
+                output = await output
+            return GuardrailFunctionOutput(
+                output_info=TieredVerdict(
+                    "llm",
+                    decision,
+                    matched,
+                    llm_output=output.output_info,
+                    elapsed_ms=(time.perf_counter() - start) * 1000,
+                ),
+                tripwire_triggered=output.tripwire_triggered,
+            )
+
+        wrapper.prefilter = self  # type: ignore[attr-defined]
+        return wrapper
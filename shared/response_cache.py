@@ -0,0 +1,322 @@
+"""Two-tier response cache for any `Model`.
+
+`CachedModel` wraps a model (usually the one from `get_model()`) and remembers its responses:
+
+    tier 1: in-memory LRU (per process, fastest)
+    tier 2: SQLite file on disk (survives restarts, shared by processes on the same machine)
+
+The cache key covers everything that changes the answer: model name, resolved system
+instructions, input items, tools/handoffs, output schema and the `ModelSettings` fields that
+shape the output. Calls with `temperature` above `max_temperature` are never cached (they are
+meant to be random), and neither are streamed calls. Neither are calls that continue server-side
+state (`previous_response_id`, `conversation_id`) or use a stored `prompt`: their `input` is only
+the new turn, so the key can't tell two conversations apart, and a hit has no `response_id` to
+chain the next turn from.
+
+    model = CachedModel(get_model("gemini-1.5-flash"), db_path=".cache/responses.sqlite")
+    agent = Agent(name="developer agent", model=model, ...)
+    ...
+    print(model.stats)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from agents import FunctionTool, Handoff, Model, ModelResponse, ModelSettings, ModelTracing, Tool, Usage
+from agents.agent_output import AgentOutputSchemaBase
+from agents.items import TResponseInputItem, TResponseStreamEvent
+from openai.types.responses import ResponseOutputItem
+from openai.types.responses.response_prompt_param import ResponsePromptParam
+from pydantic import TypeAdapter
+
+# ModelSettings fields that change what the model generates. metadata, store, include_usage and
+# extra_headers only change bookkeeping, so two calls that differ only there share an entry.
+_OUTPUT_SETTINGS = (
+    "temperature",
+    "top_p",
+    "frequency_penalty",
+    "presence_penalty",
+    "tool_choice",
+    "parallel_tool_calls",
+    "truncation",
+    "max_tokens",
+    "reasoning",
+    "verbosity",
+    "top_logprobs",
+    "response_include",
+    "extra_query",
+    "extra_body",
+    "extra_args",
+)
+
+_output_adapter = TypeAdapter(list[ResponseOutputItem])
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    expired: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+
+def _tool_key(tool: Tool) -> dict[str, Any]:
+    if isinstance(tool, FunctionTool):
+        return {"name": tool.name, "description": tool.description, "params": tool.params_json_schema}
+    return {"name": getattr(tool, "name", type(tool).__name__), "type": type(tool).__name__}
+
+
+def _schema_key(output_schema: AgentOutputSchemaBase | None) -> dict[str, Any] | None:
+    if output_schema is None or output_schema.is_plain_text():
+        return None
+    return {
+        "name": output_schema.name(),
+        "schema": output_schema.json_schema(),
+        "strict": output_schema.is_strict_json_schema(),
+    }
+
+
+def make_cache_key(
+    model_name: str,
+    system_instructions: str | None,
+    input: str | list[TResponseInputItem],
+    model_settings: ModelSettings,
+    tools: list[Tool],
+    output_schema: AgentOutputSchemaBase | None,
+    handoffs: list[Handoff],
+) -> str:
+    settings = model_settings.to_json_dict()
+    payload = {
+        "model": model_name,
+        "instructions": system_instructions,
+        "input": input,
+        "settings": {name: settings.get(name) for name in _OUTPUT_SETTINGS},
+        "tools": [_tool_key(tool) for tool in tools],
+        "handoffs": [{"name": h.tool_name, "params": h.input_json_schema} for h in handoffs],
+        "output_schema": _schema_key(output_schema),
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class _DiskTier:
+    def __init__(self, path: str | Path) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, output TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> tuple[str, float] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT output, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, key: str, output: str, created_at: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, output, created_at) VALUES (?, ?, ?)",
+                (key, output, created_at),
+            )
+            self._db.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def evict_older_than(self, created_before: float) -> int:
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE created_at < ?", (created_before,))
+            self._db.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CachedModel(Model):
+    """Drop-in `Model` wrapper that serves repeated calls from memory or disk."""
+
+    def __init__(
+        self,
+        model: Model,
+        *,
+        max_entries: int = 1024,
+        ttl: float | None = 3600,
+        db_path: str | Path | None = None,
+        max_temperature: float = 0.5,
+    ) -> None:
+        """
+        Args:
+            model: the model that really answers on a miss.
+            max_entries: size of the in-memory LRU tier.
+            ttl: seconds an entry stays valid (both tiers). None = never expires.
+            db_path: SQLite file for the disk tier. None = memory only.
+            max_temperature: calls with a higher temperature skip the cache. A temperature of
+                None (provider default) is treated as cacheable.
+        """
+        self.model = model
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, tuple[list[Any], float]] = OrderedDict()
+        self._disk = _DiskTier(db_path) if db_path else None
+        if self._disk and ttl is not None:
+            self._disk.evict_older_than(time.time() - ttl)
+
+    @property
+    def model_name(self) -> str:
+        return str(getattr(self.model, "model", type(self.model).__name__))
+
+    def _is_fresh(self, created_at: float) -> bool:
+        return self.ttl is None or time.time() - created_at < self.ttl
+
+    def _lookup(self, key: str) -> list[Any] | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            output, created_at = entry
+            if self._is_fresh(created_at):
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return output
+            del self._memory[key]
+            self.stats.expired += 1
+
+        if self._disk is not None:
+            row = self._disk.get(key)
+            if row is not None:
+                raw, created_at = row
+                if self._is_fresh(created_at):
+                    output = _output_adapter.validate_json(raw)
+                    self._remember(key, output, created_at)
+                    self.stats.disk_hits += 1
+                    return output
+                self._disk.delete(key)
+                self.stats.expired += 1
+
+        self.stats.misses += 1
+        return None
+
+    def _remember(self, key: str, output: list[Any], created_at: float) -> None:
+        self._memory[key] = (output, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.evict_older_than(float("inf"))
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None = None,
+        conversation_id: str | None = None,
+        prompt: ResponsePromptParam | None = None,
+    ) -> ModelResponse:
+        temperature = model_settings.temperature
+        too_random = temperature is not None and temperature > self.max_temperature
+        server_state = previous_response_id is not None or conversation_id is not None or prompt is not None
+        if too_random or server_state:
+            self.stats.bypassed += 1
+            return await self.model.get_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                previous_response_id=previous_response_id,
+                conversation_id=conversation_id,
+                prompt=prompt,
+            )
+
+        key = make_cache_key(
+            self.model_name, system_instructions, input, model_settings, tools, output_schema, handoffs
+        )
+        output = self._lookup(key)
+        if output is not None:
+            # nothing was sent to the LLM, so the hit costs no requests and no tokens
+            return ModelResponse(output=list(output), usage=Usage(), response_id=None)
+
+        response = await self.model.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        )
+        now = time.time()
+        self._remember(key, list(response.output), now)
+        if self._disk is not None:
+            self._disk.put(key, _output_adapter.dump_json(response.output).decode(), now)
+        return response
+
+    def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None = None,
+        conversation_id: str | None = None,
+        prompt: ResponsePromptParam | None = None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        # streamed runs want live tokens, so they always go to the real model
+        self.stats.bypassed += 1
+        return self.model.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        )
@@ -0,0 +1,254 @@
+"""Speculative first model call while the input guardrails are still running.
+
+Without this the agent either waits for `hacking_guardrail` (one extra round trip on every
+request) or, as the SDK does by default, starts its first turn alongside the guardrails and may
+already run tools / hand off before a tripwire fires.
+
+`Speculation.run()` starts the agent's first model call together with the guardrails and
+**holds the response** until every guardrail has passed:
+
+    - all guardrails pass -> the held response is used, nothing was lost (saved ~ one round trip)
+    - a tripwire fires    -> the model call is cancelled (or its response thrown away), no tool,
+                             handoff or hook after the LLM call runs for it
+
+    speculation = Speculation()
+    result = await speculation.run(agent, "how to 2 + 2?", run_config=config)
+    print(speculation.metrics)
+
+Only non-streamed runs are speculative (streamed runs already check guardrails in the background).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrail,
+    InputGuardrailResult,
+    InputGuardrailTripwireTriggered,
+    Model,
+    ModelResponse,
+    ModelSettings,
+    ModelTracing,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    RunResult,
+    Tool,
+    TResponseInputItem,
+)
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import TResponseStreamEvent
+from openai.types.responses.response_prompt_param import ResponsePromptParam
+
+from .guardrail_executor import run_input_guardrails
+
+
+class SpeculationAborted(Exception):
+    """Raised inside the discarded speculative turn when a guardrail trips."""
+
+
+@dataclass
+class SpeculationMetrics:
+    runs: int = 0
+    passed: int = 0
+    tripped: int = 0
+    cancelled_calls: int = 0
+    """Tripped runs where the model call was cancelled before it finished."""
+
+    tokens_wasted: int = 0
+    """Tokens of speculative responses that were thrown away because a guardrail tripped."""
+
+    latency_saved_seconds: float = 0.0
+    """Sum over passed runs of min(guardrail time, first model call time)."""
+
+
+class _Gate:
+    def __init__(self) -> None:
+        self.outcome: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self.speculated = False
+        self.tripped: InputGuardrailResult | None = None
+        self.guardrail_seconds = 0.0
+        self.model_seconds: float | None = None
+
+    def settle(self, passed: bool) -> None:
+        if not self.outcome.done():
+            self.outcome.set_result(passed)
+
+
+class _SpeculativeModel(Model):
+    def __init__(self, model: Model, gate: _Gate, metrics: SpeculationMetrics) -> None:
+        self.model = model
+        self._gate = gate
+        self._metrics = metrics
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None = None,
+        conversation_id: str | None = None,
+        prompt: ResponsePromptParam | None = None,
+    ) -> ModelResponse:
+        call = self.model.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        )
+        gate = self._gate
+        if gate.speculated or gate.outcome.done():
+            # guardrails already decided: later turns are normal calls
+            return await call
+        gate.speculated = True
+
+        start = time.perf_counter()
+        task = asyncio.ensure_future(call)
+        await asyncio.wait({task, gate.outcome}, return_when=asyncio.FIRST_COMPLETED)
+
+        if not task.done() and not gate.outcome.result():
+            task.cancel()
+            self._metrics.cancelled_calls += 1
+            raise SpeculationAborted("input guardrail tripped before the model answered")
+
+        response = await task
+        gate.model_seconds = time.perf_counter() - start
+        if not await gate.outcome:
+            self._metrics.tokens_wasted += response.usage.total_tokens
+            raise SpeculationAborted("input guardrail tripped, speculative response discarded")
+        return response
+
+    def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None = None,
+        conversation_id: str | None = None,
+        prompt: ResponsePromptParam | None = None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        return self.model.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        )
+
+
+class Speculation:
+    """Opt-in speculative mode for `Runner.run`. Keeps metrics across runs."""
+
+    def __init__(self) -> None:
+        self.metrics = SpeculationMetrics()
+
+    def _gated_guardrail(self, guardrails: list[InputGuardrail[Any]], gate: _Gate) -> InputGuardrail[Any]:
+        async def _run_all(
+            ctx: RunContextWrapper[Any], agent: Agent[Any], input: str | list[TResponseInputItem]
+        ) -> GuardrailFunctionOutput:
+            passed = False
+            try:
+                report = await run_input_guardrails(guardrails, agent, input, ctx)
+                gate.guardrail_seconds = report.wall_seconds
+                passed = report.tripped is None
+                output = GuardrailFunctionOutput(output_info=report, tripwire_triggered=not passed)
+                if not passed:
+                    gate.tripped = InputGuardrailResult(guardrail=gated, output=output)
+            finally:
+                # also settles on errors, so the held model call never waits forever
+                gate.settle(passed)
+            return output
+
+        gated = InputGuardrail(guardrail_function=_run_all, name="speculative_input_guardrails")
+        return gated
+
+    async def run(
+        self,
+        starting_agent: Agent[Any],
+        input: str | list[TResponseInputItem],
+        *,
+        run_config: RunConfig | None = None,
+        **kwargs: Any,
+    ) -> RunResult:
+        """Same as `Runner.run`, with the first model call started speculatively.
+
+        The agent's and the RunConfig's input guardrails are merged into one guardrail
+        (`output_info` is a `GuardrailRunReport`), and the starting agent is cloned with a
+        model that holds its first response until that guardrail passes.
+        """
+        run_config = run_config or RunConfig()
+        guardrails = starting_agent.input_guardrails + (run_config.input_guardrails or [])
+        if not guardrails:
+            return await Runner.run(starting_agent, input, run_config=run_config, **kwargs)
+
+        gate = _Gate()
+        run_config = dataclasses.replace(
+            run_config, input_guardrails=[self._gated_guardrail(guardrails, gate)]
+        )
+        if run_config.model is not None:
+            # a RunConfig model (a Model or a model name) overrides every agent's model, so wrap that one
+            if isinstance(run_config.model, Model):
+                model = run_config.model
+            else:
+                model = run_config.model_provider.get_model(run_config.model)
+            run_config = dataclasses.replace(
+                run_config, model=_SpeculativeModel(model, gate, self.metrics)
+            )
+            agent = starting_agent.clone(input_guardrails=[])
+        else:
+            if isinstance(starting_agent.model, Model):
+                model = starting_agent.model
+            else:
+                model = run_config.model_provider.get_model(starting_agent.model)
+            agent = starting_agent.clone(
+                input_guardrails=[], model=_SpeculativeModel(model, gate, self.metrics)
+            )
+
+        self.metrics.runs += 1
+        try:
+            result = await Runner.run(agent, input, run_config=run_config, **kwargs)
+        except InputGuardrailTripwireTriggered:
+            self.metrics.tripped += 1
+            raise
+        except SpeculationAborted:
+            # the held turn noticed the tripwire before the SDK did: report it the usual way
+            self.metrics.tripped += 1
+            assert gate.tripped is not None
+            raise InputGuardrailTripwireTriggered(gate.tripped) from None
+        finally:
+            gate.settle(False)
+
+        self.metrics.passed += 1
+        if gate.model_seconds is not None:
+            self.metrics.latency_saved_seconds += min(gate.guardrail_seconds, gate.model_seconds)
+        return result
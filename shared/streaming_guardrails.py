@@ -0,0 +1,207 @@
+"""Output guardrails that check a streamed answer *while* it is being generated.
+
+Normal output guardrails (`@output_guardrail`) only run after the whole answer is done. With
+`Runner.run_streamed` that means we show the user text we may reject later, and we pay for the
+full generation even when the first sentence was already a "no".
+
+`IncrementalOutputGuardrails` wraps `result.stream_events()` and runs the guardrails on the text
+generated so far at a boundary:
+
+    - `every_tokens=N` -> every ~N new tokens (1 token ~ 4 characters)
+    - `sentences=True` -> at the end of every sentence / line
+
+When a tripwire fires, the run is cancelled right away (the HTTP stream is closed, no more tokens
+are generated) and the usual `OutputGuardrailTripwireTriggered` is raised.
+
+    checker = IncrementalOutputGuardrails(biology_guardrail, every_tokens=40)
+    result = Runner.run_streamed(agent, "what is cell?", run_config=config)
+    async for event in checker.stream(result):
+        ...
+
+`release="checked"` only yields text events once the text they belong to has passed a check
+(nothing rejected is ever shown, at the cost of some delay). The default `"immediate"` yields
+events as they arrive, and the checks run in the background without slowing the stream down.
+
+Works for agents with a text output (the guardrail gets the partial answer as a `str`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from agents import OutputGuardrail, OutputGuardrailResult, OutputGuardrailTripwireTriggered
+from agents.result import RunResultStreaming
+from agents.stream_events import StreamEvent
+from openai.types.responses import ResponseCreatedEvent, ResponseTextDeltaEvent
+
+_SENTENCE_END = re.compile(r"[.!?](?:\s|$)|\n")
+
+
+def approx_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class StreamingGuardrailStats:
+    checks: int = 0
+    """Guardrail checks started (one check runs all guardrails on the text so far)."""
+
+    tripped: int = 0
+    checked_chars: int = 0
+    """Characters in the longest text that passed a check."""
+
+    rejected_at_chars: int | None = None
+    """How much text had been generated when the run was aborted."""
+
+    time_to_reject_seconds: float | None = None
+    """From the start of the stream to the abort."""
+
+
+class IncrementalOutputGuardrails:
+    """Runs output guardrails on partial streamed output and aborts the run on a tripwire."""
+
+    def __init__(
+        self,
+        *guardrails: OutputGuardrail[Any],
+        every_tokens: int | None = None,
+        sentences: bool = False,
+        release: Literal["immediate", "checked"] = "immediate",
+        check_final: bool = True,
+    ) -> None:
+        """
+        Args:
+            guardrails: the output guardrails to run (same ones you use with `output_guardrails=`).
+            every_tokens: check again after ~this many new tokens.
+            sentences: check again at the end of every sentence / line.
+            release: "immediate" yields events right away, "checked" holds text events until
+                their text passed a check.
+            check_final: also check the complete answer at the end of the stream (if the last
+                part was not checked yet).
+        """
+        if not guardrails:
+            raise ValueError("IncrementalOutputGuardrails needs at least one guardrail")
+        if every_tokens is None and not sentences:
+            sentences = True
+        self.guardrails = list(guardrails)
+        self.every_tokens = every_tokens
+        self.sentences = sentences
+        self.release = release
+        self.check_final = check_final
+        self.stats = StreamingGuardrailStats()
+
+    def _at_boundary(self, text: str, checked: int) -> bool:
+        new = text[checked:]
+        if not new:
+            return False
+        if self.every_tokens and approx_tokens(new) >= self.every_tokens:
+            return True
+        return self.sentences and _SENTENCE_END.search(new) is not None
+
+    async def _check(self, result: RunResultStreaming, text: str) -> OutputGuardrailResult | None:
+        self.stats.checks += 1
+        agent = result.current_agent
+        results = await asyncio.gather(
+            *(g.run(result.context_wrapper, agent, text) for g in self.guardrails)
+        )
+        for guardrail_result in results:
+            if guardrail_result.output.tripwire_triggered:
+                return guardrail_result
+        return None
+
+    async def stream(self, result: RunResultStreaming) -> AsyncIterator[StreamEvent]:
+        """`result.stream_events()`, with the guardrails checked along the way."""
+        start = time.perf_counter()
+        events = result.stream_events().__aiter__()
+        next_event: asyncio.Future[StreamEvent] = asyncio.ensure_future(events.__anext__())
+        check: asyncio.Task[OutputGuardrailResult | None] | None = None
+        check_end = 0  # end offset (in `text`) of the text the running check looks at
+
+        text = ""  # all text of the run, `response_start` = where the current response begins
+        response_start = 0
+        checked = 0  # text[:checked] passed
+        held: list[tuple[int, StreamEvent]] = []  # ("checked" mode) events waiting for a check
+
+        def abort(tripped: OutputGuardrailResult) -> OutputGuardrailTripwireTriggered:
+            result.cancel()
+            self.stats.tripped += 1
+            self.stats.rejected_at_chars = len(text) - response_start
+            self.stats.time_to_reject_seconds = time.perf_counter() - start
+            return OutputGuardrailTripwireTriggered(tripped)
+
+        def start_check() -> None:
+            nonlocal check, check_end
+            check_end = len(text)
+            check = asyncio.create_task(self._check(result, text[response_start:check_end]))
+
+        def releasable() -> list[StreamEvent]:
+            ready = [event for end, event in held if end <= checked]
+            held[:] = [(end, event) for end, event in held if end > checked]
+            return ready
+
+        try:
+            while True:
+                waiting: set[asyncio.Future[Any]] = {next_event}
+                if check is not None:
+                    waiting.add(check)
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+                if check is not None and check in done:
+                    tripped = check.result()
+                    check = None
+                    if tripped is not None:
+                        raise abort(tripped)
+                    checked = max(checked, check_end)
+                    self.stats.checked_chars = max(self.stats.checked_chars, checked - response_start)
+                    for event in releasable():
+                        yield event
+                    if self._at_boundary(text, checked):
+                        start_check()
+
+                if next_event not in done:
+                    continue
+                try:
+                    event = next_event.result()
+                except StopAsyncIteration:
+                    break
+                next_event = asyncio.ensure_future(events.__anext__())
+
+                if event.type == "raw_response_event":
+                    if isinstance(event.data, ResponseCreatedEvent):
+                        # a new model response: guardrails look at this answer only
+                        response_start = checked = len(text)
+                    elif isinstance(event.data, ResponseTextDeltaEvent):
+                        text += event.data.delta
+                        if check is None and self._at_boundary(text, checked):
+                            start_check()
+
+                if self.release == "checked" and (held or len(text) > checked):
+                    held.append((len(text), event))
+                else:
+                    yield event
+
+            # the stream is done: wait for the running check, then check what is left
+            if check is not None:
+                tripped = await check
+                check = None
+                if tripped is not None:
+                    raise abort(tripped)
+                checked = max(checked, check_end)
+            if self.check_final and len(text) > checked:
+                tripped = await self._check(result, text[response_start:])
+                if tripped is not None:
+                    raise abort(tripped)
+            checked = len(text)
+            self.stats.checked_chars = max(self.stats.checked_chars, checked - response_start)
+            for event in releasable():
+                yield event
+        finally:
+            # the cancelled stream may still end normally: don't leave its result unretrieved
+            next_event.add_done_callback(lambda f: f.cancelled() or f.exception())
+            next_event.cancel()
+            if check is not None:
+                check.cancel()
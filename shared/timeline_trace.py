@@ -0,0 +1,277 @@
+"""Run timelines as Chrome trace JSON (Perfetto) and collapsed stacks (flamegraphs), fully local.
+
+For a run like `helper_agent` -> `review_agent` (hooks/01_agenthook/agenthook.py) the printed
+hook events don't show where the wall-clock time goes. `TimelineRecorder` is a tracing processor:
+the SDK already opens a span for every agent turn, LLM call, tool call, guardrail and handoff,
+and the recorder keeps their start / end times in memory.
+
+    recorder = TimelineRecorder()
+    set_trace_processors([recorder])       # replaces the hosted exporter: nothing leaves the machine
+
+    await Runner.run(agent, "...", run_config=config)
+
+    recorder.write_chrome_trace(".cache/timeline.json")   # open in https://ui.perfetto.dev
+    recorder.write_collapsed(".cache/timeline.folded")    # flamegraph.pl / speedscope / inferno
+
+Don't combine it with `set_tracing_disabled(True)`: with tracing disabled the SDK creates no
+spans at all.
+
+In the Chrome trace every trace (run) is a process and spans that overlap without nesting
+(input guardrails running next to the first LLM call, parallel tool calls of one turn) get
+their own track (thread), so nothing is drawn on top of each other.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from agents import Span, Trace
+from agents.tracing import TracingProcessor
+
+
+@dataclass(slots=True)
+class SpanRecord:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    kind: str
+    """The span type: "agent", "generation", "response", "function", "guardrail", "handoff", "custom", ..."""
+
+    label: str
+    start_us: int
+    end_us: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_us(self) -> int:
+        return self.end_us - self.start_us
+
+
+@dataclass
+class TimelineStats:
+    spans: int = 0
+    dropped: int = 0
+    """Spans not kept because `max_spans` was reached."""
+
+
+def _micros(iso: str | None) -> int | None:
+    if iso is None:
+        return None
+    return int(datetime.fromisoformat(iso).timestamp() * 1_000_000)
+
+
+def describe_span(span: Span[Any]) -> tuple[str, dict[str, Any]]:
+    """A short label and a few small args for a span (no inputs / outputs, they can be huge)."""
+    data = span.span_data
+    kind = data.type
+    args: dict[str, Any] = {}
+    if kind == "agent":
+        label = f"agent:{data.name}"
+    elif kind == "generation":
+        label = f"llm:{data.model or 'model'}"
+        if data.usage:
+            args["usage"] = data.usage
+    elif kind == "response":
+        label = "llm:response"
+        if data.response is not None and data.response.usage is not None:
+            args["usage"] = data.response.usage.model_dump()
+    elif kind == "function":
+        label = f"tool:{data.name}"
+    elif kind == "guardrail":
+        label = f"guardrail:{data.name}"
+        args["triggered"] = data.triggered
+    elif kind == "handoff":
+        label = f"handoff:{data.from_agent}->{data.to_agent}"
+    elif kind == "custom":
+        label = f"custom:{data.name}"
+    else:
+        label = kind
+    if span.error:
+        args["error"] = span.error.get("message")
+    return label, args
+
+
+class TimelineRecorder(TracingProcessor):
+    """Keeps finished spans in memory and exports them as a timeline."""
+
+    def __init__(self, max_spans: int = 100_000) -> None:
+        self.max_spans = max_spans
+        self.stats = TimelineStats()
+        self._spans: list[SpanRecord] = []
+        self._trace_names: dict[str, str] = {}
+        self._lock = threading.Lock()  # the SDK may end spans from other threads (e.g. sync tools)
+
+    # --- TracingProcessor ---------------------------------------------------------------------
+
+    def on_trace_start(self, trace: Trace) -> None:
+        with self._lock:
+            self._trace_names[trace.trace_id] = trace.name
+
+    def on_trace_end(self, trace: Trace) -> None:
+        pass
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        pass
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        start, end = _micros(span.started_at), _micros(span.ended_at)
+        if start is None or end is None:
+            return
+        label, args = describe_span(span)
+        record = SpanRecord(span.trace_id, span.span_id, span.parent_id, span.span_data.type, label, start, end, args)
+        with self._lock:
+            if len(self._spans) >= self.max_spans:
+                self.stats.dropped += 1
+                return
+            self._spans.append(record)
+            self.stats.spans += 1
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self) -> None:
+        pass
+
+    # --- export -------------------------------------------------------------------------------
+
+    def spans(self) -> list[SpanRecord]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._trace_names.clear()
+
+    def _by_trace(self) -> dict[str, list[SpanRecord]]:
+        traces: dict[str, list[SpanRecord]] = defaultdict(list)
+        for record in self.spans():
+            traces[record.trace_id].append(record)
+        return traces
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The Trace Event Format dict: one process per trace, one thread per track."""
+        traces = self._by_trace()
+        if not traces:
+            return {"traceEvents": [], "displayTimeUnit": "ms"}
+        origin = min(r.start_us for records in traces.values() for r in records)
+
+        events: list[dict[str, Any]] = []
+        for pid, (trace_id, records) in enumerate(traces.items(), start=1):
+            name = self._trace_names.get(trace_id, "trace")
+            events.append({"ph": "M", "name": "process_name", "pid": pid, "args": {"name": f"{name} ({trace_id})"}})
+            tracks = assign_tracks(records)
+            track_names: dict[int, str] = {}  # named after the first span on the track
+            for record in sorted(records, key=lambda r: r.start_us):
+                tid = tracks[record.span_id]
+                track_names.setdefault(tid, record.label)
+                events.append(
+                    {
+                        "name": record.label,
+                        "cat": record.kind,
+                        "ph": "X",
+                        "ts": record.start_us - origin,
+                        "dur": record.duration_us,
+                        "pid": pid,
+                        "tid": tid,
+                        "args": {"span_id": record.span_id, **record.args},
+                    }
+                )
+            for tid, label in track_names.items():
+                events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": label}})
+                events.append({"ph": "M", "name": "thread_sort_index", "pid": pid, "tid": tid, "args": {"sort_index": tid}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace(), default=str))
+        return path
+
+    def collapsed_stacks(self) -> dict[str, int]:
+        """`"trace;agent:x;tool:y" -> self time in microseconds`, summed over identical stacks."""
+        stacks: dict[str, int] = defaultdict(int)
+        for trace_id, records in self._by_trace().items():
+            by_id = {r.span_id: r for r in records}
+            children: dict[str, list[SpanRecord]] = defaultdict(list)
+            for record in records:
+                if record.parent_id in by_id:
+                    children[record.parent_id].append(record)
+
+            root = _frame(self._trace_names.get(trace_id, "trace"))
+            for record in records:
+                frames = [_frame(record.label)]
+                parent = by_id.get(record.parent_id or "")
+                while parent is not None:
+                    frames.append(_frame(parent.label))
+                    parent = by_id.get(parent.parent_id or "")
+                frames.append(root)
+                busy = _covered(record, children[record.span_id])
+                self_time = max(record.duration_us - busy, 0)
+                if self_time:
+                    stacks[";".join(reversed(frames))] += self_time
+        return dict(stacks)
+
+    def write_collapsed(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {value}" for stack, value in sorted(self.collapsed_stacks().items())]
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+
+def _frame(label: str) -> str:
+    # one stack per line, ";" separates the frames
+    return label.replace(";", ":").replace("\n", " ")
+
+
+def _covered(parent: SpanRecord, children: list[SpanRecord]) -> int:
+    """Microseconds of `parent` during which at least one child was running."""
+    total = 0
+    current_start = current_end = None
+    for child in sorted(children, key=lambda c: c.start_us):
+        start, end = max(child.start_us, parent.start_us), min(child.end_us, parent.end_us)
+        if end <= start:
+            continue
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def assign_tracks(records: list[SpanRecord]) -> dict[str, int]:
+    """Span id -> track, so that the spans on one track nest properly.
+
+    A span goes onto its parent's track when the parent is the innermost open span there;
+    otherwise (a sibling is still running: concurrent guardrails, parallel tool calls) onto the
+    first free track, or a new one.
+    """
+    tracks: list[list[tuple[int, str]]] = []  # per track: stack of open (end_us, span_id)
+    track_of: dict[str, int] = {}
+    for record in sorted(records, key=lambda r: (r.start_us, -r.end_us)):
+        preferred = [track_of[record.parent_id]] if record.parent_id in track_of else []
+        chosen = None
+        for tid in (*preferred, *range(len(tracks))):
+            stack = tracks[tid]
+            while stack and stack[-1][0] <= record.start_us:
+                stack.pop()
+            if not stack or (stack[-1][1] == record.parent_id and record.end_us <= stack[-1][0]):
+                chosen = tid
+                break
+        if chosen is None:
+            tracks.append([])
+            chosen = len(tracks) - 1
+        tracks[chosen].append((record.end_us, record.span_id))
+        track_of[record.span_id] = chosen
+    return track_of
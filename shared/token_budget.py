@@ -0,0 +1,207 @@
+"""Token budgets per run and per tenant, enforced through run hooks.
+
+`AgentEventHook` prints `context.usage.input_tokens` / `output_tokens` and moves on. A helper
+agent that keeps calling tools (or bouncing to the review agent) can burn thousands of tokens
+before anyone notices. `TokenBudget` watches the usage after every LLM call and:
+
+    - soft limit crossed -> the rest of the run uses `downgrade_model` and/or `downgrade_max_tokens`
+    - hard limit crossed -> the run stops with `TokenBudgetExceeded` (before the next LLM call)
+
+Limits exist per run and per tenant (all runs of one customer, until `reset_tenant()`).
+The run hooks count the tokens; the hard limit is checked by a `call_model_input_filter` that
+`start()` installs on the run's RunConfig, right before every LLM call.
+
+    budget = TokenBudget(soft_run_tokens=2_000, hard_run_tokens=5_000, hard_tenant_tokens=50_000,
+                         downgrade_model=get_model("gemini-1.5-flash-8b"), downgrade_max_tokens=256)
+
+    run = budget.start(tenant="acme", run_config=config)
+    result = await Runner.run(agent, "...", run_config=run.run_config, hooks=run.hooks)
+    print(run.report)   # tokens per agent, downgraded?, stopped?
+
+`start()` gives every run its own copy of the RunConfig, so a downgrade only affects that run.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from agents import (
+    Agent,
+    Model,
+    ModelResponse,
+    ModelSettings,
+    RunConfig,
+    RunContextWrapper,
+    RunHooks,
+    Tool,
+    Usage,
+)
+from agents.run import CallModelData, ModelInputData
+
+
+@dataclass
+class AgentUsage:
+    llm_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+
+
+@dataclass
+class BudgetReport:
+    tenant: str
+    total_tokens: int = 0
+    agents: dict[str, AgentUsage] = field(default_factory=dict)
+    """Token use per agent (the agent that made the LLM call)."""
+
+    downgraded: bool = False
+    stopped: Literal["run", "tenant"] | None = None
+
+
+class TokenBudgetExceeded(Exception):
+    """A hard token limit was crossed. Raised before the run's next LLM call."""
+
+    def __init__(self, scope: Literal["run", "tenant"], used: int, limit: int, report: BudgetReport) -> None:
+        super().__init__(f"{scope} token budget exceeded for tenant {report.tenant!r}: {used} > {limit}")
+        self.scope = scope
+        self.used = used
+        self.limit = limit
+        self.report = report
+
+
+class TokenBudget:
+    """Per-run and per-tenant token limits. Use `start()` for every run."""
+
+    def __init__(
+        self,
+        *,
+        soft_run_tokens: int | None = None,
+        hard_run_tokens: int | None = None,
+        soft_tenant_tokens: int | None = None,
+        hard_tenant_tokens: int | None = None,
+        downgrade_model: str | Model | None = None,
+        downgrade_max_tokens: int | None = None,
+    ) -> None:
+        self.soft_run_tokens = soft_run_tokens
+        self.hard_run_tokens = hard_run_tokens
+        self.soft_tenant_tokens = soft_tenant_tokens
+        self.hard_tenant_tokens = hard_tenant_tokens
+        self.downgrade_model = downgrade_model
+        self.downgrade_max_tokens = downgrade_max_tokens
+        self.tenant_tokens: dict[str, int] = {}
+
+    def start(self, tenant: str = "default", run_config: RunConfig | None = None) -> BudgetedRun:
+        """Budget state, RunConfig copy and hooks for one run."""
+        return BudgetedRun(self, tenant, dataclasses.replace(run_config or RunConfig()))
+
+    def reset_tenant(self, tenant: str | None = None) -> None:
+        """Start a new budget period for one tenant (or all of them)."""
+        if tenant is None:
+            self.tenant_tokens.clear()
+        else:
+            self.tenant_tokens.pop(tenant, None)
+
+
+class BudgetedRun:
+    def __init__(self, budget: TokenBudget, tenant: str, run_config: RunConfig) -> None:
+        self.budget = budget
+        self.run_config = run_config
+        self.report = BudgetReport(tenant)
+        self.hooks: RunHooks[Any] = _BudgetHooks(self)
+        self._seen = Usage()  # the part of the run's usage already counted
+
+        # runs right before every LLM call of this run, and its exceptions reach the caller as-is
+        # (exceptions raised in tool hooks are wrapped in UserError by the SDK)
+        self._user_filter = run_config.call_model_input_filter
+        run_config.call_model_input_filter = self._before_llm_call
+
+    async def _before_llm_call(self, data: CallModelData[Any]) -> ModelInputData:
+        self.check()
+        if self._user_filter is None:
+            return data.model_data
+        updated = self._user_filter(data)
+        return await updated if inspect.isawaitable(updated) else updated
+
+    def account(self, agent: Agent[Any], usage: Usage, response: ModelResponse | None = None) -> None:
+        """Count what the run used since the last call, for `agent`."""
+        now = {
+            name: getattr(usage, name) for name in ("requests", "input_tokens", "output_tokens", "total_tokens")
+        }
+        if response is not None:
+            # some SDK versions add the response to context.usage only after on_llm_end
+            for name in now:
+                now[name] = max(now[name], getattr(self._seen, name) + (getattr(response.usage, name) or 0))
+
+        delta = {name: value - getattr(self._seen, name) for name, value in now.items()}
+        if delta["total_tokens"] <= 0 and delta["requests"] <= 0:
+            return
+        for name, value in now.items():
+            setattr(self._seen, name, value)
+
+        per_agent = self.report.agents.setdefault(agent.name, AgentUsage())
+        per_agent.llm_calls += delta["requests"]
+        per_agent.input_tokens += delta["input_tokens"]
+        per_agent.output_tokens += delta["output_tokens"]
+        per_agent.total_tokens += delta["total_tokens"]
+        self.report.total_tokens += delta["total_tokens"]
+        tenants = self.budget.tenant_tokens
+        tenants[self.report.tenant] = tenants.get(self.report.tenant, 0) + delta["total_tokens"]
+
+        if not self.report.downgraded and (
+            _over(self.report.total_tokens, self.budget.soft_run_tokens)
+            or _over(tenants[self.report.tenant], self.budget.soft_tenant_tokens)
+        ):
+            self._downgrade()
+
+    def _downgrade(self) -> None:
+        budget = self.budget
+        if budget.downgrade_model is not None:
+            self.run_config.model = budget.downgrade_model
+        if budget.downgrade_max_tokens is not None:
+            settings = self.run_config.model_settings or ModelSettings()
+            max_tokens = min(settings.max_tokens or budget.downgrade_max_tokens, budget.downgrade_max_tokens)
+            self.run_config.model_settings = dataclasses.replace(settings, max_tokens=max_tokens)
+        self.report.downgraded = True
+
+    def check(self) -> None:
+        """Raise `TokenBudgetExceeded` if a hard limit is crossed."""
+        budget, report = self.budget, self.report
+        if _over(report.total_tokens, budget.hard_run_tokens):
+            report.stopped = "run"
+            raise TokenBudgetExceeded("run", report.total_tokens, budget.hard_run_tokens or 0, report)
+        used = budget.tenant_tokens.get(report.tenant, 0)
+        if _over(used, budget.hard_tenant_tokens):
+            report.stopped = "tenant"
+            raise TokenBudgetExceeded("tenant", used, budget.hard_tenant_tokens or 0, report)
+
+
+def _over(used: int, limit: int | None) -> bool:
+    return limit is not None and used > limit
+
+
+class _BudgetHooks(RunHooks[Any]):
+    """Counts the run's usage after LLM calls.
+
+    openai-agents 0.2.11 calls `on_llm_end` on run hooks; older versions don't, so usage is also
+    picked up from `context.usage` at the tool, handoff and agent events that follow every LLM call.
+    """
+
+    def __init__(self, run: BudgetedRun) -> None:
+        self.run = run
+
+    async def on_llm_end(self, context: RunContextWrapper[Any], agent: Agent[Any], response: ModelResponse) -> None:
+        self.run.account(agent, context.usage, response)
+
+    async def on_tool_start(self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool) -> None:
+        self.run.account(agent, context.usage)
+
+    async def on_handoff(
+        self, context: RunContextWrapper[Any], from_agent: Agent[Any], to_agent: Agent[Any]
+    ) -> None:
+        self.run.account(from_agent, context.usage)
+
+    async def on_agent_end(self, context: RunContextWrapper[Any], agent: Agent[Any], output: Any) -> None:
+        self.run.account(agent, context.usage)
@@ -0,0 +1,220 @@
+"""DataLoader-style batching for tool backends: many calls in a short window -> one bulk call.
+
+When the model asks for `get_user_data(name=...)` (tools/simple_tool_using_decorator.py) three
+times in one turn, the SDK runs the three tool calls at the same time and each one makes its own
+backend round trip. The same happens across runs: 50 concurrent runs -> 50 lookups. Most backends
+have a bulk endpoint (`WHERE id IN (...)`, `/users?ids=a,b,c`, Redis `MGET`).
+
+`BatchLoader` collects the `load(key)` calls made within `window` seconds, sends their keys to
+*one* call of your batch function, and hands each caller its own value:
+
+    async def fetch_users(names: list[str]) -> list[str]:       # one value per key, same order
+        return await backend.bulk_get(names)                     # (or a dict key -> value)
+
+    users = BatchLoader(fetch_users, window=0.005, max_batch_size=100)
+
+    @function_tool
+    async def get_user_data(name: str) -> str:
+        return await users.load(name)
+
+- The same key twice in a window (or while its batch is running) is sent once, both callers get
+  the result.
+- A batch is sent as soon as it has `max_batch_size` keys, without waiting for the window.
+- Errors: if the batch function raises, every caller of that batch gets the exception (and the
+  model the usual tool error message). A value that *is* an exception, or a key missing from a
+  returned dict, fails only that caller.
+- `cache="run"` keeps the values for the rest of the run: the same key is not loaded again by
+  later turns. "The run" is the context object passed to `Runner.run(context=...)`, so the tool
+  passes its wrapper: `await users.load(name, ctx=wrapper)`. Nothing is kept across runs (use
+  `ToolCache` in shared/tool_cache.py for that). Without a context (`Runner.run(..., context=None)`)
+  or with one that can't be weak-referenced (e.g. a str), the values are kept per wrapper
+  instead, and the SDK passes each tool call its own wrapper: effectively per call, never
+  shared between runs.
+- `users.stats` -> loads, batches (round trips), deduplicated keys, cache hits, ...
+
+Keys must be hashable. A caller that is cancelled does not cancel the batch the others wait on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections.abc import Awaitable, Callable, Hashable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Generic, Literal, TypeVar
+
+from agents import RunContextWrapper
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFunction = Callable[[list[K]], Awaitable[Sequence[V] | Mapping[K, V]]]
+
+
+@dataclass
+class BatchStats:
+    loads: int = 0
+    """`load()` calls."""
+
+    batches: int = 0
+    """Calls of the batch function (backend round trips)."""
+
+    keys_sent: int = 0
+    deduplicated: int = 0
+    """Loads that joined a pending or running request for the same key."""
+
+    cache_hits: int = 0
+    errors: int = 0
+    """Batches whose batch function raised."""
+
+    max_batch: int = 0
+
+    @property
+    def average_batch(self) -> float:
+        return self.keys_sent / self.batches if self.batches else 0.0
+
+    @property
+    def round_trips_saved(self) -> int:
+        return self.loads - self.batches
+
+
+def _weakrefable(obj: Any) -> bool:
+    try:
+        weakref.ref(obj)
+    except TypeError:
+        return False
+    return True
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesces `load(key)` calls into calls of `batch_fn(keys)` (see module docs)."""
+
+    def __init__(
+        self,
+        batch_fn: BatchFunction[K, V],
+        *,
+        window: float = 0.005,
+        max_batch_size: int = 100,
+        cache: Literal["run"] | None = None,
+        name: str | None = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.cache = cache
+        self.name = name or getattr(batch_fn, "__name__", "batch")
+        self.stats = BatchStats()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: dict[K, asyncio.Future[V]] = {}
+        self._running: dict[K, asyncio.Future[V]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        # id(run context object or wrapper) -> {key: value}; dropped when that object is garbage collected
+        self._run_cache: dict[int, dict[K, V]] = {}
+
+    def _check_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # each asyncio.run() has its own loop: start clean
+            self._loop = loop
+            self._pending, self._running, self._timer = {}, {}, None
+        return loop
+
+    def _cache_for(self, ctx: RunContextWrapper[Any] | None) -> dict[K, V] | None:
+        if self.cache != "run":
+            return None
+        if ctx is None:
+            raise TypeError(f"{self.name}: cache='run' needs load(key, ctx=wrapper)")
+        owner: Any = ctx.context
+        if owner is None or not _weakrefable(owner):
+            owner = ctx  # no usable run context: the cache only lives as long as this wrapper
+        run_id = id(owner)
+        cache = self._run_cache.get(run_id)
+        if cache is None:
+            weakref.finalize(owner, self._run_cache.pop, run_id, None)
+            cache = self._run_cache[run_id] = {}
+        return cache
+
+    async def load(self, key: K, *, ctx: RunContextWrapper[Any] | None = None) -> V:
+        """The value for `key`, loaded together with the other keys asked for in the same window."""
+        loop = self._check_loop()
+        self.stats.loads += 1
+        run_cache = self._cache_for(ctx)
+        if run_cache is not None and key in run_cache:
+            self.stats.cache_hits += 1
+            return run_cache[key]
+
+        future = self._pending.get(key) or self._running.get(key)
+        if future is not None:
+            self.stats.deduplicated += 1
+        else:
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+
+        value = await asyncio.shield(future)  # a cancelled caller must not cancel the batch
+        if run_cache is not None:
+            run_cache[key] = value
+        return value
+
+    async def load_many(self, keys: Sequence[K], *, ctx: RunContextWrapper[Any] | None = None) -> list[V]:
+        return list(await asyncio.gather(*(self.load(key, ctx=ctx) for key in keys)))
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._running.update(batch)
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: dict[K, asyncio.Future[V]]) -> None:
+        keys = list(batch)
+        self.stats.batches += 1
+        self.stats.keys_sent += len(keys)
+        self.stats.max_batch = max(self.stats.max_batch, len(keys))
+        try:
+            values = await self.batch_fn(keys)
+            if isinstance(values, Mapping):
+                results: list[Any] = [
+                    values[k] if k in values else KeyError(f"{self.name}: no value for {k!r}") for k in keys
+                ]
+            else:
+                results = list(values)
+                if len(results) != len(keys):
+                    raise ValueError(f"{self.name}: batch function returned {len(results)} values for {len(keys)} keys")
+        except Exception as e:
+            self.stats.errors += 1
+            results = [e] * len(keys)
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        finally:
+            for key, future in batch.items():
+                if self._running.get(key) is future:
+                    del self._running[key]
+
+        for future, result in zip(batch.values(), results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+                future.exception()  # not an "exception never retrieved" if every caller left
+            else:
+                future.set_result(result)
+
+    def clear(self, ctx: RunContextWrapper[Any] | None = None) -> None:
+        """Forget the cached values of one run (or of every run)."""
+        if ctx is None:
+            self._run_cache.clear()
+        else:
+            self._run_cache.pop(id(ctx.context), None)
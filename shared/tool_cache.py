@@ -0,0 +1,234 @@
+"""Opt-in memoization for function tools: TTL, LRU bound, argument-keyed.
+
+`get_user_data(name)` (tools/simple_tool_using_decorator.py) and `get_user_name`
+(hooks/01_agenthook/prefetch_data_in_hook.py) are called again and again with the same
+arguments, in later turns and in other runs. With a slow backend behind them that is most of the
+tool-call latency. `ToolCache.memoize` goes *under* `@function_tool`:
+
+    tool_cache = ToolCache(max_entries=10_000)
+
+    @function_tool
+    @tool_cache.memoize(ttl=300)
+    async def get_user_data(name: str) -> str: ...
+
+    @function_tool
+    @tool_cache.memoize(ttl=60, key=lambda ctx: ctx.context.tenant)   # per tenant
+    async def get_user_name(wrapper: RunContextWrapper[UserInfo]) -> str: ...
+
+The cache key is (tool name, `key(ctx)`, the call arguments as canonical JSON: sorted keys, no
+whitespace, defaults filled in), so `{"b": 1, "a": 2}` and `{"a":2,"b":1}` hit the same entry.
+
+- Exceptions are never cached (the SDK turns them into an error message for the model, as before).
+- `cache_if=lambda result: ...` keeps some results out of the cache (e.g. "user not found").
+- `tool_cache.skip("get_user_data")` turns caching off for one tool at runtime, `resume()` back on.
+- Concurrent identical calls of an async tool (parallel tool calls, other runs) share one call.
+- `tool_cache.stats["get_user_data"]` -> hits / misses / joined / expired / evicted / bypassed.
+
+`function_tool` reads the signature, type hints and docstring through the wrapper, so the tool
+schema is exactly the same as without the cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import functools
+import inspect
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, get_origin, get_type_hints
+
+from agents import RunContextWrapper
+from pydantic import BaseModel
+
+
+@dataclass
+class ToolCacheStats:
+    hits: int = 0
+    misses: int = 0
+    joined: int = 0
+    """Calls that waited for an identical call already running."""
+
+    expired: int = 0
+    evicted: int = 0
+    bypassed: int = 0
+    """Calls that skipped the cache (`skip()`, or a result rejected by `cache_if`)."""
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses + self.joined
+        return (self.hits + self.joined) / total if total else 0.0
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+
+def canonical_args(arguments: dict[str, Any]) -> str:
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_jsonable)
+
+
+def takes_context_param(func: Callable[..., Any]) -> bool:
+    """Same rule as `function_tool`: the first parameter is annotated with RunContextWrapper / ToolContext."""
+    params = list(inspect.signature(func).parameters.values())
+    if not params:
+        return False
+    annotation = get_type_hints(func).get(params[0].name)
+    origin = get_origin(annotation) or annotation
+    return isinstance(origin, type) and issubclass(origin, RunContextWrapper)
+
+
+class ToolCache:
+    """One bounded LRU store shared by all memoized tools, stats per tool."""
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self.stats: dict[str, ToolCacheStats] = {}
+        self._entries: OrderedDict[tuple[str, Any, str], tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[tuple[str, Any, str], asyncio.Future[Any]] = {}
+        self._skipped: set[str] = set()
+
+    def memoize(
+        self,
+        ttl: float = 60.0,
+        *,
+        key: Callable[[RunContextWrapper[Any]], Any] | None = None,
+        name: str | None = None,
+        cache_if: Callable[[Any], bool] | None = None,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Cache the tool's results for `ttl` seconds.
+
+        `key(ctx)` adds a part from the run context (tenant, user, locale, ...) to the cache key;
+        the tool must then take the context as its first parameter. `name` must match
+        `function_tool(name_override=...)` if you use one.
+        """
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            tool_name = name or func.__name__
+            takes_context = takes_context_param(func)
+            if key is not None and not takes_context:
+                raise TypeError(f"{tool_name}: key= needs a RunContextWrapper as the first parameter")
+            signature = inspect.signature(func)
+            stats = self.stats.setdefault(tool_name, ToolCacheStats())
+
+            def cache_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[str, Any, str]:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+                context_part = None
+                if takes_context:
+                    ctx = arguments.pop(next(iter(signature.parameters)))
+                    context_part = key(ctx) if key is not None else None
+                return (tool_name, context_part, canonical_args(arguments))
+
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if tool_name in self._skipped:
+                        stats.bypassed += 1
+                        return await func(*args, **kwargs)
+                    k = cache_key(args, kwargs)
+                    found, value = self._lookup(k, stats)
+                    if found:
+                        return value
+                    running = self._in_flight.get(k)
+                    if running is not None:
+                        stats.joined += 1
+                        try:
+                            return await asyncio.shield(running)
+                        except asyncio.CancelledError:
+                            if not running.cancelled():
+                                raise  # this caller was cancelled
+                            return await func(*args, **kwargs)  # the first caller's run was cancelled
+
+                    stats.misses += 1
+                    future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+                    self._in_flight[k] = future
+                    try:
+                        value = await func(*args, **kwargs)
+                    except asyncio.CancelledError:
+                        future.cancel()
+                        raise
+                    except Exception as e:
+                        future.set_exception(e)
+                        future.exception()  # joined callers get it, nobody else needs to
+                        raise
+                    finally:
+                        self._in_flight.pop(k, None)
+                    future.set_result(value)
+                    self._store(k, value, ttl, cache_if, stats)
+                    return value
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if tool_name in self._skipped:
+                    stats.bypassed += 1
+                    return func(*args, **kwargs)
+                k = cache_key(args, kwargs)
+                found, value = self._lookup(k, stats)
+                if found:
+                    return value
+                stats.misses += 1
+                value = func(*args, **kwargs)
+                self._store(k, value, ttl, cache_if, stats)
+                return value
+
+            return sync_wrapper
+
+        return decorator
+
+    def _lookup(self, k: tuple[str, Any, str], stats: ToolCacheStats) -> tuple[bool, Any]:
+        entry = self._entries.get(k)
+        if entry is None:
+            return False, None
+        if entry[0] < time.monotonic():
+            del self._entries[k]
+            stats.expired += 1
+            return False, None
+        self._entries.move_to_end(k)
+        stats.hits += 1
+        return True, entry[1]
+
+    def _store(
+        self,
+        k: tuple[str, Any, str],
+        value: Any,
+        ttl: float,
+        cache_if: Callable[[Any], bool] | None,
+        stats: ToolCacheStats,
+    ) -> None:
+        if cache_if is not None and not cache_if(value):
+            stats.bypassed += 1
+            return
+        self._entries[k] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(k)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self.stats[evicted[0]].evicted += 1
+
+    def skip(self, tool_name: str) -> None:
+        """Stop caching one tool (calls go straight to the function)."""
+        self._skipped.add(tool_name)
+
+    def resume(self, tool_name: str) -> None:
+        self._skipped.discard(tool_name)
+
+    def invalidate(self, tool_name: str | None = None) -> None:
+        """Drop the entries of one tool, or everything."""
+        if tool_name is None:
+            self._entries.clear()
+            return
+        for k in [k for k in self._entries if k[0] == tool_name]:
+            del self._entries[k]
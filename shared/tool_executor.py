@@ -0,0 +1,258 @@
+"""Execution policies for function tools: inline, thread pool or process pool.
+
+`word_count` (hooks/01_agenthook/agenthook.py, hooks/02_runhook/runhook.py) and the tools in
+agent_methods/clone.py are plain `def` functions. The SDK calls a sync tool directly on the event
+loop, so when the model asks for several tool calls in one turn they run one after another, and
+a blocking or CPU-heavy tool freezes every other run on the loop while it works.
+
+`ToolExecutor.offload` goes *under* `@function_tool` and gives each tool a policy:
+
+    executor = ToolExecutor(max_threads=16, max_processes=4)
+
+    @function_tool
+    @executor.offload("thread", max_concurrency=8)      # blocking I/O (requests, sqlite, files)
+    def fetch_report(report_id: str) -> str: ...
+
+    @function_tool
+    @executor.offload("process", max_concurrency=2)     # CPU-bound pure Python
+    def count_primes(limit: int) -> int: ...
+
+    @function_tool
+    @executor.offload("inline")                          # cheap: run on the loop, only timed
+    def word_count(text: str) -> str: ...
+
+- `max_concurrency` caps the calls of one tool running at the same time (others wait their turn).
+- `timeout` (seconds) fails a call that takes too long, the model gets the usual tool error.
+- Run aborted (task cancelled, `result.cancel()`) -> calls still waiting for a worker are
+  cancelled. A call already running in a thread can't be interrupted, it finishes in the
+  background and its result is thrown away.
+- A timed-out (or aborted) call that is already running still holds its `max_concurrency` slot
+  until the worker really finishes, so a tool that keeps timing out never has more than
+  `max_concurrency` copies running in the shared pool.
+- `executor.stats["count_primes"]` -> calls, time waiting for a slot / worker, time running, ...
+
+"process" tools must be module-level functions with picklable arguments and results, and no
+`RunContextWrapper` parameter (a context can't be sent to another process). The worker finds the
+function through the module's import. With the "spawn" / "forkserver" start methods (macOS,
+Windows, Linux from Python 3.14) a tool defined in the script itself is found too (the worker
+imports the script as `__mp_main__`), but the script must start its runs under
+`if __name__ == "__main__":`. `ToolExecutor(mp_context=multiprocessing.get_context("spawn"))`
+picks the start method.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import importlib
+import inspect
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.context import BaseContext
+from typing import Any, Literal
+
+from .tool_cache import takes_context_param
+
+Mode = Literal["inline", "thread", "process"]
+
+
+@dataclass
+class ToolTimingStats:
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    cancelled: int = 0
+    running: int = 0
+    max_running: int = 0
+    wait_seconds: float = 0.0
+    """Time calls spent waiting for a free slot (`max_concurrency`) and a free worker."""
+
+    run_seconds: float = 0.0
+    """Time the function itself ran (measured inside the worker)."""
+
+    @property
+    def average_run_ms(self) -> float:
+        return self.run_seconds / self.calls * 1000 if self.calls else 0.0
+
+
+# "module:qualname" -> the undecorated function, so process workers can find it
+_PROCESS_TOOLS: dict[str, Callable[..., Any]] = {}
+
+
+def _process_key(func: Callable[..., Any]) -> str:
+    """The key of a process tool, the same in the parent and in "spawn" / "forkserver" workers.
+
+    Those workers import the parent's script as `__mp_main__` (and alias it as `__main__`), so a
+    tool the parent registered as "__main__:square" is registered as "__mp_main__:square" there.
+    """
+    module = "__main__" if func.__module__ == "__mp_main__" else func.__module__
+    return f"{module}:{func.__qualname__}"
+
+
+def _timed(func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[Any, float, float]:
+    started = time.perf_counter()
+    value = func(*args, **kwargs)
+    return value, started, time.perf_counter() - started
+
+
+def _run_in_process(key: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[Any, float]:
+    func = _PROCESS_TOOLS.get(key)
+    if func is None:
+        importlib.import_module(key.split(":")[0])  # "spawn" workers: importing runs the decorators
+        # ("__main__" is the parent's script, already imported by the worker as `__mp_main__`)
+        func = _PROCESS_TOOLS[key]
+    started = time.perf_counter()
+    value = func(*args, **kwargs)
+    return value, time.perf_counter() - started
+
+
+class ToolExecutor:
+    """Shared thread / process pools plus a per-tool concurrency limit and timing."""
+
+    def __init__(
+        self,
+        max_threads: int | None = None,
+        max_processes: int | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.mp_context = mp_context
+        self.stats: dict[str, ToolTimingStats] = {}
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+
+    def _pool(self, mode: Mode) -> Executor:
+        if mode == "thread":
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(self.max_threads, thread_name_prefix="tool")
+            return self._threads
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(self.max_processes, mp_context=self.mp_context)
+        return self._processes
+
+    def offload(
+        self,
+        mode: Mode = "thread",
+        *,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        name: str | None = None,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Run a sync tool inline, in the thread pool or in the process pool (see module docs)."""
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            tool_name = name or func.__name__
+            if inspect.iscoroutinefunction(func) and mode != "inline":
+                raise TypeError(f"{tool_name}: async tools already run on the loop, use mode='inline'")
+            key = _process_key(func)
+            if mode == "process":
+                if "<locals>" in func.__qualname__:
+                    raise TypeError(f"{tool_name}: process tools must be module-level functions")
+                if takes_context_param(func):
+                    raise TypeError(f"{tool_name}: a RunContextWrapper can't be sent to another process")
+                _PROCESS_TOOLS[key] = func
+            stats = self.stats.setdefault(tool_name, ToolTimingStats())
+            limit = _LoopSemaphore(max_concurrency)
+
+            async def call(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+                queued = time.perf_counter()
+                slot = await limit.acquire()
+                stats.running += 1
+                stats.max_running = max(stats.max_running, stats.running)
+
+                def release(_: object = None) -> None:
+                    stats.running -= 1
+                    if slot is not None:
+                        slot.release()
+
+                if mode == "inline":
+                    try:
+                        stats.wait_seconds += time.perf_counter() - queued
+                        started = time.perf_counter()
+                        value = func(*args, **kwargs)
+                        if inspect.isawaitable(value):
+                            value = await value
+                        stats.run_seconds += time.perf_counter() - started
+                        return value
+                    finally:
+                        release()
+
+                loop = asyncio.get_running_loop()
+                try:
+                    if mode == "thread":
+                        job = self._pool(mode).submit(_timed, func, args, kwargs)
+                    else:
+                        job = self._pool(mode).submit(_run_in_process, key, args, kwargs)
+                except BaseException:
+                    release()
+                    raise
+                # the slot is freed when the worker is really done (or the job was cancelled before
+                # it started), not when this call gives up: a timed-out call keeps its slot
+                job.add_done_callback(lambda _: _call_soon(loop, release))
+                if mode == "thread":
+                    value, started, seconds = await asyncio.wrap_future(job)
+                    stats.wait_seconds += started - queued
+                else:
+                    value, seconds = await asyncio.wrap_future(job)
+                    stats.wait_seconds += max(time.perf_counter() - queued - seconds, 0.0)
+                stats.run_seconds += seconds
+                return value
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                stats.calls += 1
+                try:
+                    if timeout is None:
+                        return await call(args, kwargs)
+                    return await asyncio.wait_for(call(args, kwargs), timeout)
+                except asyncio.TimeoutError:
+                    stats.timeouts += 1
+                    raise TimeoutError(f"{tool_name} took longer than {timeout}s") from None
+                except asyncio.CancelledError:
+                    stats.cancelled += 1
+                    raise
+                except Exception:
+                    stats.errors += 1
+                    raise
+
+            return wrapper
+
+        return decorator
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pools. Calls that have not started yet are cancelled."""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+        self._threads = self._processes = None
+
+
+class _LoopSemaphore:
+    """`asyncio.Semaphore` per event loop (each `asyncio.run()` has its own loop); no-op without a limit."""
+
+    def __init__(self, limit: int | None) -> None:
+        self.limit = limit
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def acquire(self) -> asyncio.Semaphore | None:
+        """Take a slot. Returns the semaphore to release it on (None without a limit)."""
+        if self.limit is None:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._semaphore is None:
+            self._loop, self._semaphore = loop, asyncio.Semaphore(self.limit)
+        semaphore = self._semaphore
+        await semaphore.acquire()
+        return semaphore
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    """Run `callback` on `loop` from a worker thread; nothing to do once the loop is closed."""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass
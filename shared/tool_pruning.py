@@ -0,0 +1,277 @@
+"""Send only the relevant tools to the model: BM25 ranking over tool names and descriptions.
+
+Every turn, the agent's whole `tools=[...]` list goes to the model with its JSON schemas. With a
+big toolset those definitions are most of the input tokens (and of the time to first token),
+while one turn only needs a few of them.
+
+`ToolPruningModel` wraps any model (like `CachedModel` in shared/response_cache.py). Before each
+call it ranks the tools against the current input with BM25, a local lexical index, and sends
+only the best `top_k`, plus:
+
+    - `pinned` tools (always sent)
+    - the tool named in `ModelSettings(tool_choice="...")` (model_settings/04_tool_choice.py):
+      a forced tool is never pruned
+    - tools the conversation already called (`keep_used=True`), so the model can call them again
+
+    model = ToolPruningModel(get_model("gemini-2.0-flash"), top_k=5, pinned=["get_user"])
+    agent = Agent(name="support", model=model, tools=[...50 tools...])
+
+The query is the last user message plus whatever came after it (tool results). When no tool
+matches at all the call gets every tool, so pruning never leaves the model without its tools.
+The full list still runs the tools: the runner looks them up by name in the agent's tools.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from agents import FunctionTool, Handoff, Model, ModelResponse, ModelSettings, ModelTracing, Tool
+from agents.agent_output import AgentOutputSchemaBase
+from agents.items import TResponseInputItem, TResponseStreamEvent
+from openai.types.responses.response_prompt_param import ResponsePromptParam
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from get give how i in is it me my of on or please set tell that "
+    "the this to use was what when where which who with you your".split()
+)
+_BUILTIN_CHOICES = ("auto", "required", "none")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase words, snake_case and camelCase split, stopwords and a plural "s" removed."""
+    words = _WORD.findall(_CAMEL.sub(" ", text).replace("_", " ").lower())
+    return [
+        w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+        for w in words
+        if w not in _STOPWORDS
+    ]
+
+
+def _tool_text(tool: Tool) -> str:
+    parts = [tool.name, tool.name]  # the name counts double
+    if isinstance(tool, FunctionTool):
+        parts.append(tool.description or "")
+        for name, prop in tool.params_json_schema.get("properties", {}).items():
+            parts.append(name)
+            if isinstance(prop, dict):
+                parts.append(str(prop.get("description", "")))
+    else:
+        parts.append(str(getattr(tool, "description", "")))
+    return " ".join(parts)
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents."""
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.docs = [Counter(tokenize(d)) for d in documents]
+        self.lengths = [sum(d.values()) for d in self.docs]
+        self.avg_length = sum(self.lengths) / len(self.docs) if self.docs else 0.0
+        df: Counter[str] = Counter()
+        for doc in self.docs:
+            df.update(doc.keys())
+        n = len(self.docs)
+        self.idf = {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+
+    def scores(self, query: str) -> list[float]:
+        terms = [t for t in set(tokenize(query)) if t in self.idf]
+        result = []
+        for doc, length in zip(self.docs, self.lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1))
+            for term in terms:
+                tf = doc.get(term, 0)
+                if tf:
+                    score += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            result.append(score)
+        return result
+
+
+def _text_of(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(str(part.get("text", "")) for part in content if isinstance(part, dict))
+    return ""
+
+
+def query_text(input: str | list[TResponseInputItem]) -> str:
+    """The last user message and everything after it (tool outputs, ...)."""
+    if isinstance(input, str):
+        return input
+    last_user = max((i for i, item in enumerate(input) if item.get("role") == "user"), default=0)
+    parts = []
+    for item in input[last_user:]:
+        if "content" in item:
+            parts.append(_text_of(item["content"]))
+        elif item.get("type") == "function_call_output":
+            parts.append(str(item.get("output", "")))
+    return " ".join(parts)
+
+
+def called_tools(input: str | list[TResponseInputItem]) -> set[str]:
+    if isinstance(input, str):
+        return set()
+    return {item["name"] for item in input if item.get("type") == "function_call" and "name" in item}
+
+
+def forced_tool(model_settings: ModelSettings) -> str | None:
+    """The tool name `tool_choice` forces, if any."""
+    choice = model_settings.tool_choice
+    if isinstance(choice, str):
+        return None if choice in _BUILTIN_CHOICES else choice
+    return getattr(choice, "name", None)  # MCPToolChoice
+
+
+@dataclass
+class PruningStats:
+    calls: int = 0
+    pruned_calls: int = 0
+    tools_in: int = 0
+    tools_sent: int = 0
+    schema_chars_saved: int = 0
+    """Characters of tool JSON (name + description + schema) that were not sent."""
+
+    fallbacks: int = 0
+    """Calls where no tool matched, so every tool was sent."""
+
+    @property
+    def kept_ratio(self) -> float:
+        return self.tools_sent / self.tools_in if self.tools_in else 1.0
+
+
+class ToolPruningModel(Model):
+    """Model wrapper that sends the `top_k` most relevant tools (+ pinned / forced ones)."""
+
+    def __init__(
+        self,
+        model: Model,
+        *,
+        top_k: int = 8,
+        pinned: Sequence[str] = (),
+        keep_used: bool = True,
+        max_indexes: int = 64,
+    ) -> None:
+        self.model = model
+        self.top_k = top_k
+        self.pinned = frozenset(pinned)
+        self.keep_used = keep_used
+        self.max_indexes = max_indexes
+        self.stats = PruningStats()
+        # one index per distinct tool list (an agent's list is the same object every turn)
+        self._indexes: OrderedDict[tuple[int, ...], tuple[list[Tool], BM25Index]] = OrderedDict()
+
+    def _index(self, tools: list[Tool]) -> BM25Index:
+        key = tuple(id(t) for t in tools)
+        entry = self._indexes.get(key)
+        if entry is not None:
+            self._indexes.move_to_end(key)
+            return entry[1]
+        index = BM25Index([_tool_text(t) for t in tools])
+        self._indexes[key] = (list(tools), index)  # keeps the tools alive, so their ids stay unique
+        while len(self._indexes) > self.max_indexes:
+            self._indexes.popitem(last=False)
+        return index
+
+    def select(
+        self, tools: list[Tool], input: str | list[TResponseInputItem], model_settings: ModelSettings
+    ) -> list[Tool]:
+        """The tools to send for this call, in their original order."""
+        self.stats.calls += 1
+        self.stats.tools_in += len(tools)
+        keep = set(self.pinned)
+        forced = forced_tool(model_settings)
+        if forced:
+            keep.add(forced)
+        if self.keep_used:
+            keep |= called_tools(input)
+
+        if model_settings.tool_choice == "none" or len(tools) <= self.top_k:
+            self.stats.tools_sent += len(tools)
+            return tools
+
+        scores = self._index(tools).scores(query_text(input))
+        ranked = sorted((i for i, s in enumerate(scores) if s > 0), key=lambda i: -scores[i])
+        if not ranked:
+            self.stats.fallbacks += 1
+            self.stats.tools_sent += len(tools)
+            return tools
+
+        chosen = set(ranked[: self.top_k])
+        selected = [t for i, t in enumerate(tools) if i in chosen or t.name in keep]
+        self.stats.tools_sent += len(selected)
+        if len(selected) < len(tools):
+            self.stats.pruned_calls += 1
+            sent = {id(t) for t in selected}
+            self.stats.schema_chars_saved += sum(_tool_size(t) for t in tools if id(t) not in sent)
+        return selected
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None = None,
+        conversation_id: str | None = None,
+        prompt: ResponsePromptParam | None = None,
+    ) -> ModelResponse:
+        return await self.model.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            self.select(tools, input, model_settings),
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        )
+
+    def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None = None,
+        conversation_id: str | None = None,
+        prompt: ResponsePromptParam | None = None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        return self.model.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            self.select(tools, input, model_settings),
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        )
+
+
+def _tool_size(tool: Tool) -> int:
+    if isinstance(tool, FunctionTool):
+        return len(tool.name) + len(tool.description or "") + len(json.dumps(tool.params_json_schema))
+    return len(tool.name)
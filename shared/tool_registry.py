@@ -0,0 +1,320 @@
+"""A tool registry with compiled, persisted schemas and cached tool-list snapshots.
+
+Every `@function_tool` builds a pydantic model for its parameters and turns it into a strict JSON
+schema at import time, and `Agent.get_all_tools()` (agent_methods/get_all_tools.py) rebuilds the
+tool list on every turn. With hundreds of tools both show up: worker cold start and per-turn
+tool assembly.
+
+`ToolRegistry` fixes both:
+
+    registry = ToolRegistry(".cache/tool_schemas.json")
+
+    @registry.function_tool                 # same options as @function_tool
+    def get_weather(city: str) -> str: ...
+
+    agent = RegistryAgent(name="support", registry=registry, tool_names=["get_weather", "get_date"])
+
+- **Compiled once, persisted.** Name, description and JSON schema are stored on disk. On the next
+  start a tool whose source didn't change is created from the stored schema, without pydantic;
+  the pydantic model (needed to parse arguments) is only built on the tool's first call.
+  The key covers the tool's options, the source of its module (and of the modules of the types in
+  its signature), the SDK and pydantic versions and `SCHEMA_CACHE_VERSION`.
+- **O(1) lookup.** `registry.get("get_weather")` / `"get_weather" in registry`.
+- **Snapshots.** `registry.snapshot(names)` is an immutable tuple of tools, built once and reused
+  until a tool is registered or removed. `RegistryAgent.get_all_tools()` returns a list copy of
+  it, without rebuilding anything (tools with a callable `is_enabled`, and MCP tools, still make
+  it check per call).
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import sys
+import threading
+import typing
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+import pydantic
+from agents import Agent, FunctionTool, RunContextWrapper, Tool, function_tool
+from agents.tool import default_tool_error_function
+
+SCHEMA_CACHE_VERSION = 1
+
+_SDK_VERSION = importlib.metadata.version("openai-agents")
+
+
+@dataclass
+class RegistryStats:
+    schema_hits: int = 0
+    """Tools created from a stored schema (no pydantic at startup)."""
+
+    schema_misses: int = 0
+    """Tools whose schema had to be compiled (new or changed source)."""
+
+    lazy_compiles: int = 0
+    """Stored-schema tools that were called and built their argument parser."""
+
+    snapshots_built: int = 0
+    snapshot_hits: int = 0
+
+
+@dataclass(frozen=True)
+class ToolSnapshot:
+    tools: tuple[Tool, ...]
+    """All tools of the snapshot, in order."""
+
+    enabled: tuple[Tool, ...]
+    """The tools without `is_enabled=False`."""
+
+    dynamic: bool
+    """Some tool has a callable `is_enabled`, so `enabled` must be checked per run."""
+
+    by_name: MappingProxyType[str, Tool] = field(repr=False)
+
+
+# file path -> (mtime_ns, size, sha256), so a module is only hashed once per process
+_file_hashes: dict[str, tuple[int, int, str]] = {}
+
+
+def _file_hash(path: str) -> str:
+    stat = os.stat(path)
+    known = _file_hashes.get(path)
+    if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+        return known[2]
+    digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    _file_hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def _modules_in(annotation: Any, found: set[str]) -> None:
+    module = getattr(annotation, "__module__", None)
+    if isinstance(annotation, type) and module and module not in ("builtins", "typing"):
+        found.add(module)
+    for arg in typing.get_args(annotation):
+        _modules_in(arg, found)
+
+
+def source_hash(func: Callable[..., Any]) -> str:
+    """Hash of the source files that decide the tool's schema: its module and its parameter types' modules."""
+    modules = {func.__module__}
+    try:
+        for annotation in typing.get_type_hints(func).values():
+            _modules_in(annotation, modules)
+    except Exception:
+        pass  # unresolvable hints: the SDK reports them when it compiles the schema
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        path = getattr(sys.modules.get(name), "__file__", None)
+        digest.update(f"{name}={_file_hash(path) if path and os.path.exists(path) else '?'};".encode())
+    return digest.hexdigest()
+
+
+class ToolRegistry:
+    """Tools by name, with a persisted schema cache and cached snapshots."""
+
+    def __init__(self, cache_path: str | Path | None = ".cache/tool_schemas.json", autosave: bool = True) -> None:
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.stats = RegistryStats()
+        self._tools: dict[str, Tool] = {}
+        self._snapshots: dict[tuple[str, ...] | None, ToolSnapshot] = {}
+        self._schemas: dict[str, dict[str, Any]] = self._load()
+        self._dirty = False
+        self._lock = threading.Lock()
+        if autosave and self.cache_path is not None:
+            atexit.register(self.save)
+
+    # --- schema cache ---------------------------------------------------------------------------
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != SCHEMA_CACHE_VERSION:
+            return {}  # other cache layout: start over
+        return data.get("schemas", {})
+
+    def save(self) -> None:
+        """Write the schema cache (atomically). Called at exit when `autosave` is on."""
+        if self.cache_path is None or not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(self.cache_path.suffix + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": SCHEMA_CACHE_VERSION, "schemas": self._schemas}))
+        tmp.replace(self.cache_path)
+        self._dirty = False
+
+    def _schema_key(self, func: Callable[..., Any], options: dict[str, Any]) -> str:
+        parts = [
+            f"{func.__module__}:{func.__qualname__}",
+            json.dumps(options, sort_keys=True, default=str),
+            source_hash(func),
+            _SDK_VERSION,
+            pydantic.VERSION,
+        ]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def function_tool(
+        self,
+        func: Callable[..., Any] | None = None,
+        *,
+        name_override: str | None = None,
+        description_override: str | None = None,
+        docstring_style: str | None = None,
+        use_docstring_info: bool = True,
+        failure_error_function: Callable[..., Any] | None = default_tool_error_function,
+        strict_mode: bool = True,
+        is_enabled: bool | Callable[..., Any] = True,
+    ) -> Any:
+        """Like `agents.function_tool`, but the schema comes from the cache when possible, and
+        the tool is registered."""
+        # the options that change the schema (callables don't)
+        schema_options = {
+            "name_override": name_override,
+            "description_override": description_override,
+            "docstring_style": docstring_style,
+            "use_docstring_info": use_docstring_info,
+            "strict_mode": strict_mode,
+        }
+
+        def compile_tool(the_func: Callable[..., Any]) -> FunctionTool:
+            return function_tool(
+                the_func,
+                **schema_options,
+                failure_error_function=failure_error_function,
+                is_enabled=is_enabled,
+            )
+
+        def decorator(the_func: Callable[..., Any]) -> FunctionTool:
+            key = self._schema_key(the_func, schema_options)
+            stored = self._schemas.get(key)
+            if stored is None:
+                tool = compile_tool(the_func)
+                with self._lock:
+                    self._schemas[key] = {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "params_json_schema": tool.params_json_schema,
+                        "strict_json_schema": tool.strict_json_schema,
+                    }
+                    self._dirty = True
+                self.stats.schema_misses += 1
+            else:
+                tool = self._from_schema(stored, the_func, compile_tool, is_enabled)
+                self.stats.schema_hits += 1
+            self.register(tool)
+            return tool
+
+        if func is not None:
+            return decorator(func)
+        return decorator
+
+    def _from_schema(
+        self,
+        stored: dict[str, Any],
+        func: Callable[..., Any],
+        compile_tool: Callable[[Callable[..., Any]], FunctionTool],
+        is_enabled: bool | Callable[..., Any],
+    ) -> FunctionTool:
+        compiled: FunctionTool | None = None
+
+        async def on_invoke_tool(ctx: Any, input: str) -> Any:
+            nonlocal compiled
+            if compiled is None:
+                compiled = compile_tool(func)  # the argument parser, built on the first call only
+                self.stats.lazy_compiles += 1
+            return await compiled.on_invoke_tool(ctx, input)
+
+        return FunctionTool(
+            name=stored["name"],
+            description=stored["description"],
+            params_json_schema=stored["params_json_schema"],
+            on_invoke_tool=on_invoke_tool,
+            strict_json_schema=stored["strict_json_schema"],
+            is_enabled=is_enabled,
+        )
+
+    # --- lookup and snapshots -------------------------------------------------------------------
+
+    def register(self, tool: Tool) -> Tool:
+        """Add (or replace) a tool. Any kind of tool works, not only function tools."""
+        with self._lock:
+            self._tools[tool.name] = tool
+            self._snapshots.clear()
+        return tool
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._tools.pop(name, None)
+            self._snapshots.clear()
+
+    def get(self, name: str) -> Tool | None:
+        return self._tools.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._tools
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def snapshot(self, names: Sequence[str] | None = None) -> ToolSnapshot:
+        """The tools `names` (all tools if None) as an immutable snapshot, cached until the registry changes."""
+        key = tuple(names) if names is not None else None
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            self.stats.snapshot_hits += 1
+            return snapshot
+        with self._lock:
+            if names is None:
+                tools = tuple(self._tools.values())
+            else:
+                missing = [n for n in names if n not in self._tools]
+                if missing:
+                    raise KeyError(f"tools not in the registry: {', '.join(missing)}")
+                tools = tuple(self._tools[n] for n in names)
+            enabled = tuple(t for t in tools if not isinstance(t, FunctionTool) or t.is_enabled is not False)
+            dynamic = any(isinstance(t, FunctionTool) and not isinstance(t.is_enabled, bool) for t in enabled)
+            snapshot = ToolSnapshot(tools, enabled, dynamic, MappingProxyType({t.name: t for t in tools}))
+            self._snapshots[key] = snapshot
+        self.stats.snapshots_built += 1
+        return snapshot
+
+
+@dataclass
+class RegistryAgent(Agent[Any]):
+    """An Agent whose tools come from a `ToolRegistry` snapshot (its `tools` list is not used)."""
+
+    registry: ToolRegistry | None = None
+    tool_names: Sequence[str] | None = None
+    """Tools of this agent, by name. None = every tool in the registry."""
+
+    async def get_all_tools(self, run_context: RunContextWrapper[Any]) -> list[Tool]:
+        if self.registry is None:
+            return await super().get_all_tools(run_context)
+        snapshot = self.registry.snapshot(self.tool_names)
+        if not snapshot.dynamic and not self.mcp_servers:
+            return list(snapshot.enabled)  # a copy: callers may append to it
+
+        # some tools decide per run whether they are enabled: check those (and add MCP tools)
+        mcp_tools = await self.get_mcp_tools(run_context) if self.mcp_servers else []
+        enabled: list[Tool] = []
+        for tool in snapshot.enabled:
+            if isinstance(tool, FunctionTool) and not isinstance(tool.is_enabled, bool):
+                result = tool.is_enabled(run_context, self)
+                if inspect.isawaitable(result):
+                    result = await result
+                if not result:
+                    continue
+            enabled.append(tool)
+        return [*mcp_tools, *enabled]
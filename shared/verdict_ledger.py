@@ -0,0 +1,125 @@
+"""Reuse guardrail verdicts while a request moves through several agents.
+
+Guardrails belong to single agents. When the same user input is passed on - a triage agent
+forwards it to a billing agent, then to support, or an agent calls another agent as a tool - every
+agent that has `hacking_guardrail` classifies the same text again. `share_verdicts` records each
+verdict on the run context, keyed by (guardrail name, input digest), and later checks of the same
+input in the same request reuse it:
+
+    @input_guardrail
+    @share_verdicts
+    async def hacking_guardrail(ctx, agent, input): ...
+
+    @dataclass
+    class SupportContext:
+        user_id: str
+        guardrail_verdicts: VerdictLedger = field(default_factory=VerdictLedger)
+
+    ctx = SupportContext("u1")
+    await Runner.run(triage_agent, question, context=ctx)
+    await Runner.run(billing_agent, question, context=ctx)   # hacking_guardrail is not paid again
+
+The ledger is found on the context as a `guardrail_verdicts` attribute (or dict key). Without a
+context, verdicts are only shared inside one `Runner.run`. Every reuse is recorded as a
+"guardrail_verdict_reused" custom span in the trace, and in `ledger.reuses`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, custom_span
+
+from .guardrail_cache import GuardrailFunction, input_digest
+
+LEDGER_ATTRIBUTE = "guardrail_verdicts"
+
+
+@dataclass
+class VerdictReuse:
+    guardrail: str
+    input_digest: str
+    agent: str
+    """The agent whose guardrail check was answered from the ledger."""
+
+    computed_by: str
+    """The agent whose guardrail check computed the verdict."""
+
+    tripped: bool
+
+
+@dataclass
+class VerdictLedger:
+    verdicts: dict[tuple[str, str], tuple[str, GuardrailFunctionOutput]] = field(default_factory=dict)
+    """(guardrail name, input digest) -> (agent that computed it, verdict)."""
+
+    computed: int = 0
+    reuses: list[VerdictReuse] = field(default_factory=list)
+    _in_flight: dict[tuple[str, str], asyncio.Future[GuardrailFunctionOutput]] = field(
+        default_factory=dict, repr=False
+    )
+
+    def clear(self) -> None:
+        """Forget all verdicts, e.g. when the context is reused for a new user message."""
+        self.verdicts.clear()
+
+
+def ledger_for(ctx: RunContextWrapper[Any]) -> VerdictLedger:
+    """The ledger of this request: on the user context if it has one, else on this run."""
+    context = ctx.context
+    if isinstance(context, dict):
+        return context.setdefault(LEDGER_ATTRIBUTE, VerdictLedger())
+    ledger = getattr(context, LEDGER_ATTRIBUTE, None)
+    if isinstance(ledger, VerdictLedger):
+        return ledger
+    # no place on the user context: share only inside this Runner.run
+    ledger = ctx.__dict__.get("_" + LEDGER_ATTRIBUTE)
+    if ledger is None:
+        ledger = VerdictLedger()
+        setattr(ctx, "_" + LEDGER_ATTRIBUTE, ledger)
+    return ledger
+
+
+def share_verdicts(func: GuardrailFunction) -> GuardrailFunction:
+    """Decorator for a guardrail function (input or output): compute each verdict once per request."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(ctx: RunContextWrapper[Any], agent: Agent[Any], value: Any) -> GuardrailFunctionOutput:
+        ledger = ledger_for(ctx)
+        key = (name, input_digest(value))
+
+        if key not in ledger.verdicts and key in ledger._in_flight:
+            # the same check is running for another agent right now: wait for it
+            await asyncio.wait({ledger._in_flight[key]})
+
+        if key in ledger.verdicts:
+            computed_by, verdict = ledger.verdicts[key]
+            reuse = VerdictReuse(name, key[1], agent.name, computed_by, verdict.tripwire_triggered)
+            ledger.reuses.append(reuse)
+            with custom_span("guardrail_verdict_reused", data=asdict(reuse)):
+                pass
+            return verdict
+
+        future: asyncio.Future[GuardrailFunctionOutput] = asyncio.get_running_loop().create_future()
+        ledger._in_flight[key] = future
+        try:
+            output = func(ctx, agent, value)
+            if inspect.isawaitable(output):
+                output = await output
+            ledger.verdicts[key] = (agent.name, output)
+            ledger.computed += 1
+            future.set_result(output)
+            return output
+        except BaseException:
+            # not recorded: whoever waits for it computes the verdict itself
+            future.cancel()
+            raise
+        finally:
+            ledger._in_flight.pop(key, None)
+
+    return wrapper
@@ -4,30 +4,20 @@ import asyncio, os
 from agents import (
     Agent,
     Runner,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
     set_tracing_disabled
 )
 from agents.run import RunConfig
 from rich import print
+from shared.model_client import get_model
 from openai.types.responses import ResponseTextDeltaEvent
 
 load_dotenv()
 set_tracing_disabled(disabled=True)
 
-API_KEY=os.environ.get("GEMINI_API_KEY")
-OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY")
-
 
 async def main():
     
-    model=OpenAIChatCompletionsModel(
-        model="gemini-2.0-flash",
-        openai_client=AsyncOpenAI(
-            api_key=API_KEY,
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-        )
-    )
+    model=get_model("gemini-2.0-flash")
 
     config=RunConfig(
         model=model
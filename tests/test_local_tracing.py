@@ -0,0 +1,27 @@
+import unittest
+
+from shared.local_tracing import percentile
+
+
+class PercentileTest(unittest.TestCase):
+    def test_two_values(self) -> None:
+        values = [1.0, 2.0]
+        self.assertEqual(percentile(values, 0), 1.0)
+        self.assertEqual(percentile(values, 50), 1.0)
+        self.assertEqual(percentile(values, 51), 2.0)
+        self.assertEqual(percentile(values, 100), 2.0)
+
+    def test_ten_values(self) -> None:
+        values = [float(v) for v in range(1, 11)]
+        self.assertEqual(percentile(values, 10), 1.0)
+        self.assertEqual(percentile(values, 50), 5.0)
+        self.assertEqual(percentile(values, 90), 9.0)
+        self.assertEqual(percentile(values, 95), 10.0)
+        self.assertEqual(percentile(values, 100), 10.0)
+
+    def test_empty(self) -> None:
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
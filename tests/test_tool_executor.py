@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# a "process" tool defined in the script that is run, the case that broke under spawn
+SCRIPT = textwrap.dedent(
+    """
+    import asyncio, multiprocessing
+    from agents import function_tool
+    from agents.tool_context import ToolContext
+    from shared.tool_executor import ToolExecutor
+
+    executor = ToolExecutor(max_processes=1, mp_context=multiprocessing.get_context("spawn"))
+
+    @function_tool
+    @executor.offload("process")
+    def square(x: int) -> int:
+        return x * x
+
+    async def main():
+        ctx = ToolContext(context=None, tool_call_id="call", tool_name="square")
+        print(await square.on_invoke_tool(ctx, '{"x": 7}'))
+        executor.shutdown()
+
+    if __name__ == "__main__":
+        asyncio.run(main())
+    """
+)
+
+
+class ProcessToolTest(unittest.TestCase):
+    def test_tool_defined_in_main_script_runs_with_spawn(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            script = Path(tmp) / "spawn_tool.py"
+            script.write_text(SCRIPT)
+            env = {**os.environ, "PYTHONPATH": str(ROOT)}
+            result = subprocess.run(
+                [sys.executable, str(script)], capture_output=True, text=True, env=env, timeout=120
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "49")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from dotenv import load_dotenv
+import asyncio, time
+from agents import (
+    Agent,
+    RunContextWrapper,
+    Runner,
+    function_tool,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.tool_batcher import BatchLoader
+
+load_dotenv()
+
+model = get_model("gemini-2.0-flash")
+
+config = RunConfig(
+    model=model
+)
+
+
+# local stub backend: every request is one round trip of 50 ms, however many names it asks for
+class StubUserBackend:
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.round_trips = 0
+
+    async def get(self, name: str) -> str:
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+        return f"{name} is user."
+
+    async def bulk_get(self, names: list[str]) -> dict[str, str]:
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+        return {name: f"{name} is user." for name in names if name != "ghost"}
+
+
+backend = StubUserBackend()
+
+
+# one value per key: here a dict, missing names fail only their own call
+async def fetch_users(names: list[str]) -> dict[str, str]:
+    return await backend.bulk_get(names)
+
+
+# calls within 5 ms -> one bulk request; cache="run" -> a name is loaded once per run
+users = BatchLoader(fetch_users, window=0.005, max_batch_size=100, cache="run")
+
+
+@dataclass
+class UserInfo:
+    tenant: str
+
+
+@function_tool
+async def get_user_data(wrapper: RunContextWrapper[UserInfo], name: str) -> str:
+    """Get the data of one user by name."""
+    return await users.load(name, ctx=wrapper)
+
+
+agent = Agent(
+    name="helper_agent",
+    instructions="You are a helper agent. Use the tool once per user to get user data, call it for all users at the same time.",
+    model=model,
+    tools=[get_user_data],
+)
+
+
+# benchmark: 50 concurrent "runs", each asking for 3 users (some names shared between runs)
+async def one_run_direct(i: int) -> list[str]:
+    names = [f"user{i % 20}", f"user{(i + 1) % 20}", f"user{(i + 2) % 20}"]
+    return await asyncio.gather(*(backend.get(n) for n in names))
+
+
+async def one_run_batched(i: int) -> list[str]:
+    names = [f"user{i % 20}", f"user{(i + 1) % 20}", f"user{(i + 2) % 20}"]
+    ctx = RunContextWrapper(UserInfo("acme"))  # a new context per run, like Runner.run(context=...)
+    return await users.load_many(names, ctx=ctx)
+
+
+async def benchmark():
+    for label, one_run in [("direct ", one_run_direct), ("batched", one_run_batched)]:
+        backend.round_trips = 0
+        start = time.perf_counter()
+        await asyncio.gather(*(one_run(i) for i in range(50)))
+        print(f"{label}: 150 lookups -> {backend.round_trips} round trips in {time.perf_counter() - start:.2f}s")
+
+
+async def main():
+    result = await Runner.run(agent, "give me the data of users uneeza, ali and sara.", run_config=config, context=UserInfo("acme"))
+    print(result.final_output)
+
+    await benchmark()
+    print(users.stats)
+    print(f"average batch: {users.stats.average_batch:.1f} keys, round trips saved: {users.stats.round_trips_saved}")
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - The tool is a normal async tool: the LLM sees the same schema, batching happens behind load().
+# - Parallel tool calls of one turn AND concurrent runs share a batch, as long as they land in the same window.
+# - window is the extra latency a call can get (5 ms here) in exchange for fewer round trips.
+# - backend.bulk_get("ghost") has no value -> only that call fails (KeyError), the others in the batch still get theirs.
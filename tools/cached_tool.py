@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from dotenv import load_dotenv
+import asyncio, time
+from agents import (
+    Agent,
+    RunContextWrapper,
+    Runner,
+    function_tool,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.tool_cache import ToolCache
+
+load_dotenv()
+
+model=get_model("gemini-1.5-flash")
+
+config=RunConfig(
+    model=model
+)
+
+# one cache for all tools (bounded: least recently used entries go first)
+tool_cache = ToolCache(max_entries=10_000)
+
+
+@dataclass
+class UserInfo:
+    tenant: str
+
+
+@function_tool
+@tool_cache.memoize(ttl=300)
+async def get_user_data(name:str):
+    await asyncio.sleep(0.5)  # slow backend lookup
+    return f"{name} is user."
+
+
+# the same name can mean a different user in another tenant -> tenant is part of the key
+@function_tool
+@tool_cache.memoize(ttl=60, key=lambda ctx: ctx.context.tenant, cache_if=lambda result: "not found" not in result)
+async def get_user_plan(wrapper: RunContextWrapper[UserInfo], name: str) -> str:
+    await asyncio.sleep(0.5)
+    return f"{name} has the pro plan in {wrapper.context.tenant}."
+
+
+agent = Agent(
+    name="helper_agent",
+    instructions="You are a helper agent.must use tool to get user data and do not give answer from your own",
+    model=model,
+    tools=[get_user_data, get_user_plan],
+)
+
+
+async def main():
+    for tenant in ["acme", "acme", "acme", "globex"]:
+        start = time.perf_counter()
+        result = await Runner.run(agent, "give user uneeza data and plan.", run_config=config, context=UserInfo(tenant))
+        print(f"{tenant}: {time.perf_counter() - start:.2f}s  {result.final_output}")
+
+    for name, stats in tool_cache.stats.items():
+        print(name, stats, f"hit rate: {stats.hit_rate:.0%}")
+
+    # tool_cache.skip("get_user_plan")        -> stop caching one tool (e.g. while its backend is migrating)
+    # tool_cache.invalidate("get_user_data")  -> drop its entries
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - @tool_cache.memoize goes UNDER @function_tool: the tool schema the LLM sees does not change.
+# - Errors are not cached, the next call tries the backend again.
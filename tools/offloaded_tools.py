@@ -0,0 +1,95 @@
+from dotenv import load_dotenv
+import asyncio, time
+from agents import (
+    Agent,
+    Runner,
+    function_tool,
+)
+from agents.run import RunConfig
+from agents.tool_context import ToolContext
+from rich import print
+from shared.model_client import get_model
+from shared.tool_executor import ToolExecutor
+
+load_dotenv()
+
+model = get_model("gemini-2.0-flash")
+
+config = RunConfig(
+    model=model
+)
+
+executor = ToolExecutor(max_threads=16, max_processes=4)
+
+
+# cheap -> stays on the event loop, only timed
+@function_tool
+@executor.offload("inline")
+def word_count(text: str) -> str:
+    """Count the number of words in the given text."""
+    count = len(text.split())
+    return f"The text contains {count} words."
+
+
+# blocking I/O -> thread pool, at most 8 at a time (protects the backend)
+@function_tool
+@executor.offload("thread", max_concurrency=8, timeout=5)
+def get_weather(city: str) -> str:
+    """Get the weather for a city."""
+    time.sleep(0.5)  # e.g. requests.get(...)
+    return f"It is sunny in {city}."
+
+
+# CPU-bound pure Python -> process pool (the GIL would serialize threads)
+@function_tool
+@executor.offload("process", max_concurrency=4)
+def count_primes(limit: int) -> str:
+    """Count the prime numbers below limit."""
+    count = sum(1 for n in range(2, limit) if all(n % d for d in range(2, int(n**0.5) + 1)))
+    return f"There are {count} primes below {limit}."
+
+
+helper_agent = Agent(
+    name="helper_agent",
+    instructions="You are a helper agent that explains briefly and must call tool.",
+    model=model,
+    tools=[word_count, get_weather, count_primes],
+)
+
+
+async def one_turn(tool, arguments: list[str]):
+    """What the runner does when the model asks for several calls of a tool in one turn."""
+    ctx = ToolContext(context=None, tool_call_id="call", tool_name=tool.name)
+    start = time.perf_counter()
+    await asyncio.gather(*(tool.on_invoke_tool(ctx, a) for a in arguments))
+    return time.perf_counter() - start
+
+
+async def main():
+    cities = ['{"city": "Karachi"}', '{"city": "Lahore"}', '{"city": "Dubai"}', '{"city": "Oslo"}']
+    print(f"4 x get_weather in one turn: {await one_turn(get_weather, cities):.2f}s (inline would be ~2.0s)")
+
+    limits = ['{"limit": 100000}'] * 4
+    print(f"4 x count_primes in one turn: {await one_turn(count_primes, limits):.2f}s")
+
+    result = await Runner.run(
+        helper_agent,
+        "Please explain what HTML and CSS are, then count the words.",
+        run_config=config,
+    )
+    print("\nFinal Output:\n", result.final_output)
+
+    for name, stats in executor.stats.items():
+        print(name, stats)
+    executor.shutdown()
+
+
+# the guard is needed for "process" tools: worker processes may import this file
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+# NOTE:
+# - Without offload, a sync tool runs ON the event loop: parallel tool calls of one turn run
+#   one after another, and every other run on the loop waits too.
+# - count_primes only gets faster with more than one CPU core, but it never blocks the loop.
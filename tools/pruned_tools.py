@@ -0,0 +1,132 @@
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    ModelSettings,
+    Runner,
+    function_tool,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.tool_pruning import ToolPruningModel
+
+load_dotenv()
+
+# only the 3 most relevant tools (+ get_user, always) are sent with each LLM call
+model = ToolPruningModel(get_model("gemini-2.0-flash"), top_k=3, pinned=["get_user"])
+
+config = RunConfig(
+    model=model
+)
+
+
+# a big toolset (in production: hundreds)
+@function_tool
+def get_user() -> str:
+    """Get the name of the current user."""
+    return "uneeza"
+
+@function_tool
+def get_weather(city: str) -> str:
+    """Get the current weather forecast for a city."""
+    return f"It is sunny in {city}."
+
+@function_tool
+def get_date() -> str:
+    """Get today's date."""
+    return "2025-01-01"
+
+@function_tool
+def get_time(timezone: str) -> str:
+    """Get the current time in a timezone."""
+    return "10:00"
+
+@function_tool
+def word_count(text: str) -> str:
+    """Count the number of words in the given text."""
+    return f"The text contains {len(text.split())} words."
+
+@function_tool
+def translate(text: str, language: str) -> str:
+    """Translate text into another language."""
+    return text
+
+@function_tool
+def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
+    """Convert an amount of money from one currency to another."""
+    return f"{amount} {to_currency}"
+
+@function_tool
+def create_invoice(customer: str, amount: float) -> str:
+    """Create an invoice for a customer."""
+    return "invoice #1"
+
+@function_tool
+def refund_order(order_id: str) -> str:
+    """Refund a customer's order."""
+    return f"order {order_id} refunded"
+
+@function_tool
+def track_order(order_id: str) -> str:
+    """Track where an order's shipment is."""
+    return f"order {order_id} is on the way"
+
+@function_tool
+def send_email(to: str, subject: str, body: str) -> str:
+    """Send an email."""
+    return "sent"
+
+@function_tool
+def search_docs(query: str) -> str:
+    """Search the product documentation."""
+    return "docs"
+
+tools = [get_user, get_weather, get_date, get_time, word_count, translate, convert_currency,
+         create_invoice, refund_order, track_order, send_email, search_docs]
+
+
+support_agent = Agent(
+    name="support_agent",
+    instructions="You are a customer support agent. Use tools.",
+    model=model,
+    tools=tools,
+)
+
+# tool_choice names a tool -> that tool is always sent, even if the prompt doesn't match it
+forced_agent = Agent(
+    name="forced_agent",
+    instructions="You are a customer support agent.",
+    model=model,
+    tools=tools,
+    model_settings=ModelSettings(tool_choice="send_email"),
+)
+
+
+async def main():
+    prompts = [
+        "Where is my order 42? Please track it.",
+        "What's the weather in Karachi and how many words is 'hello world'?",
+        "Convert 100 dollars to euros.",
+    ]
+    for prompt in prompts:
+        preview = ToolPruningModel(model.model, top_k=3, pinned=["get_user"])
+        sent = preview.select(tools, prompt, ModelSettings())
+        print(f"{prompt!r:70} -> {[t.name for t in sent]}")
+
+    result = await Runner.run(support_agent, prompts[0], run_config=config)
+    print("\nFinal Output:\n", result.final_output)
+
+    result = await Runner.run(forced_agent, "Refund order 7.", run_config=config)
+    print("\nForced tool Output:\n", result.final_output)
+
+    print(model.stats, f"kept {model.stats.kept_ratio:.0%} of the tools")
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - Pruning only changes what is SENT to the model. All tools still run when called,
+#   the runner finds them by name in the agent's tools.
+# - If nothing in the input matches any tool, every tool is sent (no guessing).
@@ -0,0 +1,97 @@
+from dotenv import load_dotenv
+import asyncio, time
+from agents import (
+    Agent,
+    RunContextWrapper,
+    Runner,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.tool_registry import RegistryAgent, ToolRegistry
+
+load_dotenv()
+
+model = get_model("gemini-2.0-flash")
+
+config = RunConfig(
+    model=model
+)
+
+start = time.perf_counter()
+
+# schemas are stored in .cache/tool_schemas.json: run this file twice, the second start
+# creates the tools from the stored schemas (schema_hits) instead of compiling them
+registry = ToolRegistry(".cache/tool_schemas.json")
+
+
+@registry.function_tool
+def get_date() -> str:
+    """Get today's date."""
+    return "date"
+
+@registry.function_tool
+def get_user() -> str:
+    """Get the current user's name."""
+    return "user"
+
+@registry.function_tool
+def get_weather(city: str) -> str:
+    """Get the weather for a city."""
+    return f"It is sunny in {city}."
+
+@registry.function_tool
+def get_time() -> str:
+    """Get the current time."""
+    return "time"
+
+@registry.function_tool
+def word_count(text: str) -> str:
+    """Count the number of words in the given text."""
+    count = len(text.split())
+    return f"The text contains {count} words."
+
+print(f"{len(registry)} tools registered in {(time.perf_counter() - start) * 1000:.1f} ms", registry.stats)
+
+
+# tools by name: the agent's tool list comes from an immutable snapshot, built once
+support_agent = RegistryAgent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. You help customers with their questions.",
+    model=model,
+    registry=registry,
+    tool_names=["get_date", "get_user", "get_weather"],
+)
+
+# same tools, the normal way (for comparison)
+plain_agent = Agent(
+    name="Customer support agent",
+    instructions="You are a customer support agent. You help customers with their questions.",
+    model=model,
+    tools=[registry.get("get_date"), registry.get("get_user"), registry.get("get_weather")],
+)
+
+
+async def main():
+    ctx = RunContextWrapper(context=None)
+    for agent in [plain_agent, support_agent]:
+        t = time.perf_counter()
+        for _ in range(10_000):
+            tools = await agent.get_all_tools(ctx)
+        print(f"{type(agent).__name__}: 10,000 x get_all_tools in {time.perf_counter() - t:.3f}s -> {[t.name for t in tools]}")
+
+    print(registry.get("get_weather"))  # O(1) lookup by name
+
+    result = await Runner.run(support_agent, "What is the weather in Karachi?", run_config=config)
+    print("\nFinal Output:\n", result.final_output)
+    print(registry.stats)
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - Edit this file and run again: its tools are compiled again (schema_misses), because the
+#   cache key includes a hash of the module's source.
+# - registry.register(tool) / registry.unregister(name) -> new snapshots on the next turn.
+# - A tool created from a stored schema builds its argument parser on its FIRST call (lazy_compiles).
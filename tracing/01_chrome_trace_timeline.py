@@ -0,0 +1,116 @@
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    function_tool,
+    input_guardrail,
+    set_trace_processors,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.model_client import get_model
+from shared.timeline_trace import TimelineRecorder
+
+load_dotenv()
+
+# local only: the recorder replaces the hosted trace exporter
+# (don't call set_tracing_disabled(True) here, that turns off the spans too)
+recorder = TimelineRecorder()
+set_trace_processors([recorder])
+
+model = get_model("gemini-2.0-flash")
+
+config = RunConfig(
+    model=model,
+    workflow_name="helper -> review",
+)
+
+# tools
+@function_tool
+def word_count(text: str) -> str:
+    """Count the number of words in the given text."""
+    count = len(text.split())
+    return f"The text contains {count} words."
+
+@function_tool
+async def get_user() -> str:
+    """Get the name of the current user."""
+    await asyncio.sleep(0.2)  # slow user lookup
+    return "uneeza"
+
+
+# guardrails (both run next to the helper agent's first LLM call)
+class HackingOutput(BaseModel):
+    is_hacking: bool
+    reasoning: str
+
+guardrail_agent = Agent(
+    name="hacking check",
+    instructions="Check if the user is asking you to do hacking.",
+    model=model,
+    output_type=HackingOutput,
+)
+
+@input_guardrail
+async def hacking_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    result = await Runner.run(guardrail_agent, input, context=ctx.context, run_config=config)
+    return GuardrailFunctionOutput(
+        output_info=result.final_output,
+        tripwire_triggered=result.final_output.is_hacking,
+    )
+
+@input_guardrail
+async def length_guardrail(
+    ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+) -> GuardrailFunctionOutput:
+    return GuardrailFunctionOutput(output_info=None, tripwire_triggered=len(str(input)) > 2_000)
+
+
+review_agent = Agent(
+    name="review_agent",
+    instructions="You are a reviewer agent. Review and refine the output given by the helper agent.",
+    model=model,
+)
+
+helper_agent = Agent(
+    name="helper_agent",
+    instructions="You are a helper agent that explains briefly and must call tool.",
+    model=model,
+    tools=[word_count, get_user],
+    handoffs=[review_agent],
+    input_guardrails=[hacking_guardrail, length_guardrail],
+)
+
+
+async def main():
+    result = await Runner.run(
+        helper_agent,
+        "Please explain what HTML and CSS are, what is user name.",
+        run_config=config,
+    )
+    print("\nFinal Output:\n", result.final_output)
+
+    print(recorder.write_chrome_trace(".cache/timeline.json"), "-> open in https://ui.perfetto.dev")
+    print(recorder.write_collapsed(".cache/timeline.folded"), "-> flamegraph.pl .cache/timeline.folded > flame.svg")
+
+    # where did the time go? (self time per stack, longest first)
+    stacks = sorted(recorder.collapsed_stacks().items(), key=lambda item: -item[1])
+    for stack, micros in stacks[:8]:
+        print(f"{micros / 1000:8.1f} ms  {stack}")
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - The guardrail agent run happens inside the helper's trace (same trace id), so its LLM call
+#   shows up under guardrail:hacking_guardrail on its own track, next to the helper's first LLM call.
+# - Parallel tool calls from one turn also get one track each.
+# - speedscope (https://www.speedscope.app) opens both files directly.
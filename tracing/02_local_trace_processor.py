@@ -0,0 +1,74 @@
+from dotenv import load_dotenv
+import asyncio
+from agents import (
+    Agent,
+    Runner,
+    function_tool,
+    set_trace_processors,
+    trace,
+)
+from agents.run import RunConfig
+from rich import print
+from shared.local_tracing import LocalTraceProcessor, SqliteSpanSink, load_spans, report
+from shared.model_client import get_model
+
+load_dotenv()
+
+# offline tracing: spans go to a local SQLite file instead of the hosted dashboard
+processor = LocalTraceProcessor(SqliteSpanSink(".cache/traces.sqlite"), max_queue=8192, max_batch=256)
+set_trace_processors([processor])
+# or rotating JSON lines:
+# processor = LocalTraceProcessor(JsonlSpanSink(".cache/traces/spans.jsonl", max_bytes=10_000_000, backups=5))
+
+model = get_model("gemini-2.0-flash")
+
+config = RunConfig(
+    model=model
+)
+
+# tool
+@function_tool
+def word_count(text: str) -> str:
+    """Count the number of words in the given text."""
+    count = len(text.split())
+    return f"The text contains {count} words."
+
+
+review_agent = Agent(
+    name="review_agent",
+    instructions="You are a reviewer agent. Review and refine the output given by the helper agent.",
+    model=model,
+)
+
+helper_agent = Agent(
+    name="helper_agent",
+    instructions="You are a helper agent that explains briefly and must call tool.",
+    model=model,
+    tools=[word_count],
+    handoffs=[review_agent]
+)
+
+
+async def one_run(i: int):
+    with trace(f"helper run {i}"):
+        await Runner.run(helper_agent, "Please explain what HTML and CSS are, then count the words.", run_config=config)
+
+
+async def main():
+    # 20 runs at the same time: ending a span never waits for the disk
+    await asyncio.gather(*(one_run(i) for i in range(20)))
+
+    processor.force_flush()
+    print(processor.stats)
+
+    # same as: python -m shared.local_tracing report .cache/traces.sqlite --slowest 5
+    print(report(load_spans(".cache/traces.sqlite"), slowest=5))
+
+
+asyncio.run(main())
+
+
+# NOTE:
+# - If the queue fills up, spans first lose their "data" payload (inputs / outputs), then they
+#   are dropped. processor.stats shows how many - the runs themselves are never slowed down.
+# - The SDK calls processor.shutdown() at exit, which writes whatever is still queued.